@@ -1,6 +1,36 @@
-import tkinter as tk
-from loginWindow import create_main_window
-from database import init_db
+import time
+
+_PROCESS_START = time.perf_counter()  # Taken before any app imports, for --profile-startup
+
+import argparse
+import sys
+
+
+class StartupProfile:
+    """
+    Records how long each startup phase takes and prints a report once the login window is interactive.
+    Only created with --profile-startup; without it main() does no timing at all.
+    """
+
+    def __init__(self):
+        self.phases = []
+        self._last = _PROCESS_START
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self._last) * 1000))
+        self._last = now
+
+    def report(self):
+        total = (time.perf_counter() - _PROCESS_START) * 1000
+        print("Startup profile:")
+        for phase, ms in self.phases:
+            print(f"  {phase:<24} {ms:>8.1f} ms")
+        print(f"  {'time to interactive':<24} {total:>8.1f} ms")
+        # Confirms the dashboard and panels were not loaded before the login screen appeared
+        deferred = [name for name in ("dashboardWindow", "activity", "calendar_panel", "bulletin_board",
+                                      "emergency_contact") if name not in sys.modules]
+        print(f"  modules loaded: {len(sys.modules)}; deferred: {', '.join(deferred) or 'none'}")
 
 
 def main():
@@ -8,15 +38,45 @@ def main():
     The main function to run the application.
     It initializes the database and starts the Tkinter event loop.
     """
+    parser = argparse.ArgumentParser(description="The Vaquero Network")
+    parser.add_argument("--profile-startup", action="store_true",
+                        help="print time spent in imports, init_db, window construction and time to interactive")
+    parser.add_argument("--instrument", action="store_true",
+                        help="record latency histograms for database calls and UI callbacks (see Ctrl+Shift+D)")
+    args = parser.parse_args()
+    profile = StartupProfile() if args.profile_startup else None
+
+    if args.instrument:
+        # Must be set before the app modules are imported: that is when their functions get wrapped
+        import config
+        config.INSTRUMENT = True
+
+    # Imported here so --profile-startup can time them
+    from loginWindow import create_main_window
+    from backend import init_db
+    if profile:
+        profile.mark("imports")
+
     # Initialize the SQLite database (creates file and tables if they don't exist)
     init_db()
+    if profile:
+        profile.mark("init_db")
 
     # Create the initial login window
     main_window = create_main_window()
+    if profile:
+        profile.mark("window construction")
+
+        # Interactive = the window has been mapped and the event loop has gone idle for the first time
+        def on_first_map(event):
+            if event.widget is main_window:
+                main_window.unbind("<Map>")
+                main_window.after_idle(profile.report)
+        main_window.bind("<Map>", on_first_map)
 
     # Start the Tkinter event loop to display the window and handle interactions
     main_window.mainloop()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
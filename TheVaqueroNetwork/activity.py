@@ -1,10 +1,35 @@
 import tkinter as tk
 from tkinter import ttk
 from tkinter import messagebox as VaquerosMessager
-from database import add_task, get_tasks  # Import database functions for tasks
+from tkinter import filedialog
+import config
+from backend import add_task, delete_task, get_tasks, search_tasks, update_task  # Import database functions for tasks
+from task_import import import_tasks
+from db_executor import run_async  # Runs database calls off the Tk main thread
+from instrumentation import instrument_callbacks
+from virtual_list import VirtualList
 
 
+def format_task(task):
+    """
+    Formats a task tuple (id, title, description, due_date, status) as the text of one list row.
+    """
+    task_id, title, description, due_date, status = task
+    lines = [f"Title: {title}"]
+    if description:
+        lines.append(f"Description: {description}")
+    if due_date:
+        lines.append(f"Due Date: {due_date}")
+    lines.append(f"Status: {status}")
+    return "\n".join(lines)
+
+
+@instrument_callbacks("_add_task", "_toggle_status", "_delete_task", "_import_tasks", "_refresh_list", "_display_tasks",
+                      "_render_tasks", "_show_tasks", "_show_search_results", "_on_*")
 class ActivitiesPanel(ttk.Frame):
+    # Cache namespaces this panel displays; the dashboard calls refresh() on a revisit if they changed
+    data_namespaces = ("tasks",)
+
     def __init__(self, parent, username):
         """
         Initializes the ActivitiesPanel.
@@ -45,26 +70,40 @@ class ActivitiesPanel(ttk.Frame):
             style='Content.TButton'
         ).pack(pady=10)
 
+        # Button to bulk import tasks from a CSV or .ics file
+        ttk.Button(
+            task_input_frame,
+            text="Import Tasks...",
+            command=self._import_tasks,
+            style='Content.TButton'
+        ).pack(pady=(0, 10))
+
         # Label for the tasks list
         tk.Label(self, text="Your Tasks:", font=("Inter", 14, "bold"), fg="#333333", bg="white").pack(pady=(20, 10),anchor="w", padx=20)
 
-        # Text widget to display tasks, with scrollbar
-        self.tasks_text_widget = tk.Text(
-            self,
-            font=("Inter", 12),
-            bg="#f8f8f8",
-            fg="#333333",
-            relief="flat",
-            borderwidth=1,
-            height=15,
-            wrap="word"
-        )
-        self.tasks_text_widget.pack(fill="both", expand=True, padx=20, pady=10)
+        # Search-as-you-type box (debounced, see _on_search_changed)
+        search_frame = ttk.Frame(self)
+        search_frame.pack(fill="x", padx=20)
+        ttk.Label(search_frame, text="Search:").pack(side="left")
+        self.search_var = tk.StringVar()
+        ttk.Entry(search_frame, textvariable=self.search_var, width=40).pack(side="left", fill="x", expand=True, padx=(5, 0))
+        self.search_var.trace_add("write", self._on_search_changed)
+        self._search_after_id = None
+        self._generation = 0  # Bumped for every listing or search, so a slow earlier one can't overwrite a newer one
 
-        # Scrollbar for the tasks text widget
-        scrollbar = ttk.Scrollbar(self.tasks_text_widget, command=self.tasks_text_widget.yview)
-        self.tasks_text_widget.config(yscrollcommand=scrollbar.set)
-        scrollbar.pack(side="right", fill="y")
+        # Virtualized list of tasks: only the rows in view are drawn, however many tasks there are
+        self.tasks_list = VirtualList(self, formatter=format_task, height=300)
+        self.tasks_list.pack(fill="both", expand=True, padx=20, pady=10)
+        tk.Label(self, text="Double-click a task to mark it done or pending; right-click for more options.",
+                 font=("Inter", 10), bg="white", fg="#777777").pack(anchor="w", padx=20)
+
+        # Edits patch the affected row in place rather than reloading the whole list
+        self.tasks_list.canvas.bind("<Double-Button-1>", self._on_task_double_click)
+        self.tasks_list.canvas.bind("<Button-3>", self._on_task_right_click)
+        self.task_menu = tk.Menu(self, tearoff=0)
+        self._menu_task = None  # The task row the context menu was opened on
+        self.task_menu.add_command(label="Toggle Done/Pending", command=lambda: self._toggle_status(self._menu_task))
+        self.task_menu.add_command(label="Delete Task", command=lambda: self._delete_task(self._menu_task))
 
         # Load and display tasks when the panel is initialized
         self._display_tasks()
@@ -72,7 +111,7 @@ class ActivitiesPanel(ttk.Frame):
     def _add_task(self):
         """
         Handles adding a new task.
-        Saves the task to the database and refreshes the displayed list.
+        Saves the task to the database on the worker thread, then adds it to the end of the displayed list.
         """
         title = self.task_title_entry.get().strip()
         description = self.task_description_entry.get().strip()
@@ -80,38 +119,183 @@ class ActivitiesPanel(ttk.Frame):
 
         if title:
             # Call the database function to add the task
-            task_id = add_task(self.username, title, description if description else None,
-                               due_date if due_date else None)
-            if task_id:
-                VaquerosMessager.showinfo("Task Added", f"Task '{title}' added successfully!")
-                self.task_title_entry.delete(0, tk.END)  # Clear input fields
-                self.task_description_entry.delete(0, tk.END)
-                self.task_due_date_entry.delete(0, tk.END)
-                self._display_tasks()  # Refresh the displayed list of tasks
-            else:
-                VaquerosMessager.showerror("Error", "Failed to add task to database.")
+            run_async(self, add_task, self.username, title, description if description else None,
+                      due_date if due_date else None,
+                      on_success=lambda task_id: self._on_task_added(
+                          (task_id, title, description or None, due_date or None, "pending")),
+                      on_error=self._on_db_error)
         else:
             VaquerosMessager.showwarning("Input Error", "Please enter a title for the task.")
 
-    def _display_tasks(self):
+    def _on_task_added(self, task):
+        """
+        Handles the result of add_task once the worker thread has finished.
+        `task` is the new row built from the values that were inserted; its ID is None if the insert failed.
+        """
+        task_id, title = task[0], task[1]
+        if task_id:
+            VaquerosMessager.showinfo("Task Added", f"Task '{title}' added successfully!")
+            self.task_title_entry.delete(0, tk.END)  # Clear input fields
+            self.task_description_entry.delete(0, tk.END)
+            self.task_due_date_entry.delete(0, tk.END)
+            if self.search_var.get().strip():
+                self._refresh_list()  # The new task may or may not match the search, so rerun it
+            else:
+                # get_tasks returns tasks in insertion order, so the new one belongs at the end
+                self.tasks_list.insert_row(len(self.tasks_list), task)
+        else:
+            VaquerosMessager.showerror("Error", "Failed to add task to database.")
+
+    def _task_at(self, event):
         """
-        Retrieves tasks from the database for the current user and displays them in the UI.
+        Returns the task row under the mouse pointer, or None.
         """
-        self.tasks_text_widget.config(state="normal")  # Enable editing to clear/insert
-        self.tasks_text_widget.delete(1.0, tk.END)  # Clear existing content
+        index = self.tasks_list.row_at(event.y)
+        return self.tasks_list[index] if index is not None else None
 
-        tasks = get_tasks(self.username)  # Fetch tasks for the current user
+    def _on_task_double_click(self, event):
+        self._toggle_status(self._task_at(event))
 
-        if tasks:
-            for task_id, title, description, due_date, status in tasks:
-                self.tasks_text_widget.insert(tk.END, f"Title: {title}\n")
-                if description:
-                    self.tasks_text_widget.insert(tk.END, f"Description: {description}\n")
-                if due_date:
-                    self.tasks_text_widget.insert(tk.END, f"Due Date: {due_date}\n")
-                self.tasks_text_widget.insert(tk.END, f"Status: {status}\n")
-                self.tasks_text_widget.insert(tk.END, "-" * 50 + "\n\n")  # Separator
-        else:
-            self.tasks_text_widget.insert(tk.END, "No tasks added yet.")
+    def _on_task_right_click(self, event):
+        self._menu_task = self._task_at(event)
+        if self._menu_task is not None:
+            self.task_menu.tk_popup(event.x_root, event.y_root)
+
+    def _toggle_status(self, task):
+        """
+        Flips a task between pending and done, then updates just that row.
+        """
+        if task is None:
+            return
+        task_id, title, description, due_date, status = task
+        new_status = "pending" if status == "done" else "done"
+        run_async(self, update_task, task_id, status=new_status,
+                  on_success=lambda updated: self._on_task_updated(task_id, new_status, updated),
+                  on_error=self._on_db_error)
+
+    def _on_task_updated(self, task_id, status, updated):
+        index = self.tasks_list.find_index(lambda row: row[0] == task_id)
+        if not updated or index is None:
+            return  # The task is gone, or the list was reloaded while the update ran
+        self.tasks_list.update_row(index, (*self.tasks_list[index][:4], status))
+
+    def _delete_task(self, task):
+        """
+        Deletes a task after confirmation, then removes just that row.
+        """
+        if task is None:
+            return
+        if VaquerosMessager.askyesno("Delete Task", f"Delete task '{task[1]}'?"):
+            task_id = task[0]
+            run_async(self, delete_task, task_id,
+                      on_success=lambda deleted: self._on_task_deleted(task_id, deleted),
+                      on_error=self._on_db_error)
+
+    def _on_task_deleted(self, task_id, deleted):
+        index = self.tasks_list.find_index(lambda row: row[0] == task_id)
+        if deleted and index is not None:
+            self.tasks_list.remove_row(index)
+
+    def _import_tasks(self):
+        """
+        Handles bulk importing tasks for the current user from a CSV or iCalendar (.ics) file.
+        The import runs on the worker thread so the window stays responsive for large files.
+        """
+        path = filedialog.askopenfilename(
+            title="Import Tasks",
+            filetypes=[("Task files", "*.csv *.ics"), ("CSV files", "*.csv"), ("iCalendar files", "*.ics")]
+        )
+        if not path:
+            return  # User cancelled the dialog
+
+        self._show_message("Importing tasks...")
+        # Every imported task belongs to the signed-in user, whatever the file's username column says
+        run_async(self, import_tasks, path, username=self.username, force_username=True,
+                  on_success=self._on_tasks_imported, on_error=self._on_import_error)
 
-        self.tasks_text_widget.config(state="disabled")  # Disable editing after displaying
+    def _on_tasks_imported(self, report):
+        """
+        Shows the import summary and refreshes the displayed list of tasks.
+        """
+        message = str(report)
+        if report.errors:
+            line, reason = report.errors[0]
+            message += f"\n\nFirst rejected row (line {line}): {reason}"
+        VaquerosMessager.showinfo("Import Complete", message)
+        self._refresh_list()  # Refresh the displayed list of tasks
+
+    def _on_import_error(self, error):
+        VaquerosMessager.showerror("Import Failed", f"Could not import tasks: {error}")
+        self._refresh_list()
+
+    def _on_db_error(self, error):
+        VaquerosMessager.showerror("Error", f"Database error: {error}")
+
+    def _show_message(self, message):
+        """
+        Replaces the contents of the tasks list with a single status message (e.g. a loading indicator).
+        """
+        self.tasks_list.show_message(message)
+
+    def _on_search_changed(self, *args):
+        """
+        Called on every edit of the search box. Restarts the debounce timer so the query only runs
+        once the user pauses typing.
+        """
+        if self._search_after_id is not None:
+            self.after_cancel(self._search_after_id)
+        self._search_after_id = self.after(config.SEARCH_DEBOUNCE_MS, self._refresh_list)
+
+    def refresh(self):
+        """
+        Reloads the list (or reruns the current search) after the tasks changed elsewhere.
+        """
+        self._refresh_list()
+
+    def _refresh_list(self):
+        """
+        Shows the tasks matching the search box when it has text, otherwise all of the user's tasks.
+        """
+        self._search_after_id = None
+        text = self.search_var.get().strip()
+        if not text:
+            self._display_tasks()
+            return
+        self._generation += 1
+        if len(text) < config.SEARCH_MIN_CHARS:
+            self._show_message(f"Type at least {config.SEARCH_MIN_CHARS} characters to search.")
+            return
+        generation = self._generation
+        run_async(self, search_tasks, self.username, text,
+                  on_success=lambda tasks: self._show_search_results(generation, tasks), on_error=self._on_db_error)
+
+    def _show_search_results(self, generation, tasks):
+        """
+        Displays search results, unless a newer search or listing has started since.
+        """
+        if generation != self._generation:
+            return
+        self._render_tasks(tasks, empty_message="No tasks match your search.")
+
+    def _display_tasks(self):
+        """
+        Retrieves tasks for the current user on the worker thread, showing a loading state until they arrive.
+        """
+        self._generation += 1
+        generation = self._generation
+        self._show_message("Loading tasks...")
+        run_async(self, get_tasks, self.username, on_success=lambda tasks: self._show_tasks(generation, tasks),
+                  on_error=self._on_db_error)
+
+    def _show_tasks(self, generation, tasks):
+        """
+        Displays the user's tasks, unless a newer search or listing has started since.
+        """
+        if generation == self._generation:
+            self._render_tasks(tasks)
+
+    def _render_tasks(self, tasks, empty_message="No tasks added yet."):
+        """
+        Displays the fetched tasks in the UI.
+        """
+        self.tasks_list.set_rows(tasks, empty_text=empty_message)
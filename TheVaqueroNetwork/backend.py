@@ -0,0 +1,45 @@
+"""
+The database API the panels use, from either backend selected by config.BACKEND:
+"direct" (database.py, the SQLite file in this process) or "service" (service_client.py, the local data service).
+Both provide the same functions with the same arguments and results.
+"""
+import config
+
+if config.BACKEND == "service":
+    import service_client as _backend
+elif config.BACKEND == "direct":
+    import database as _backend
+else:
+    raise ValueError(f"Unknown VAQUERO_BACKEND {config.BACKEND!r}; expected 'direct' or 'service'")
+
+# Backup, restore and export copy the SQLite file itself, which only this process's database.py knows the
+# location of. With the service backend the file belongs to the service (possibly another --db), so they're off
+LOCAL_DATABASE = config.BACKEND == "direct"
+
+init_db = _backend.init_db
+add_user = _backend.add_user
+validate_user = _backend.validate_user
+add_task = _backend.add_task
+add_tasks_bulk = _backend.add_tasks_bulk
+get_tasks = _backend.get_tasks
+get_task = _backend.get_task
+get_task_days = _backend.get_task_days
+update_task = _backend.update_task
+update_task_status_many = _backend.update_task_status_many
+delete_task = _backend.delete_task
+delete_tasks = _backend.delete_tasks
+add_emergency_contact = _backend.add_emergency_contact
+get_emergency_contacts = _backend.get_emergency_contacts
+add_announcement = _backend.add_announcement
+get_announcements = _backend.get_announcements
+get_announcements_page = _backend.get_announcements_page
+get_announcements_since = _backend.get_announcements_since
+search_announcements = _backend.search_announcements
+archive_announcements = _backend.archive_announcements
+enable_incremental_vacuum = _backend.enable_incremental_vacuum
+incremental_vacuum = _backend.incremental_vacuum
+search_tasks = _backend.search_tasks
+data_version = _backend.data_version
+commit_version = _backend.commit_version
+cache_stats = _backend.cache_stats
+clear_cache = _backend.clear_cache
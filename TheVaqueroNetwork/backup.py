@@ -0,0 +1,254 @@
+"""
+Online backup and restore of the app database with SQLite's backup API.
+
+Unlike copying the file, Connection.backup produces a consistent snapshot of everything committed
+(including what is still in the WAL) while other instances keep working. Pages are copied in batches
+of BACKUP_PAGES_PER_STEP from one WAL read snapshot, so writers are never held up, and commits made meanwhile
+don't restart the copy (they are simply not part of it).
+
+Run from the TheVaqueroNetwork directory:
+    python backup.py backup [DEST]        # one backup (default: a timestamped snapshot in BACKUP_DIR)
+    python backup.py restore SOURCE       # replace the database with a backup (a safety copy is taken first)
+    python backup.py snapshots [--every MINUTES] [--keep N]   # rolling snapshots until interrupted
+"""
+import argparse
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+import config
+import db_connection
+from backend import LOCAL_DATABASE
+from failure_log import report_failure
+
+# Rolling snapshots are named vaquero_network-YYYYmmdd-HHMMSS.db; only files matching this are rotated
+SNAPSHOT_PREFIX = "vaquero_network-"
+SNAPSHOT_NAME = re.compile(re.escape(SNAPSHOT_PREFIX) + r"\d{8}-\d{6}\.db$")
+
+
+def _connect(path):
+    return sqlite3.connect(path, timeout=config.BUSY_TIMEOUT_MS / 1000)
+
+
+def _copy(source, target, progress=None):
+    """
+    Copies the source connection's database into target in page batches. progress(remaining, total), if
+    given, is called after every batch. Returns (pages copied, seconds taken).
+    """
+    pages = 0
+    pause = config.BACKUP_STEP_SLEEP_MS / 1000
+
+    def on_step(status, remaining, total):
+        nonlocal pages
+        pages = total
+        if progress is not None:
+            progress(remaining, total)
+        if pause and remaining:
+            time.sleep(pause)  # Each step runs without the GIL; pausing between them also lets the Tk thread run
+
+    started = time.perf_counter()
+    # One read transaction for the whole copy: in WAL mode it pins a snapshot without blocking writers, so a
+    # commit by another connection between batches doesn't make SQLite restart the backup from the beginning
+    source.execute("BEGIN")
+    source.execute("SELECT count(*) FROM sqlite_master").fetchone()
+    try:
+        source.backup(target, pages=config.BACKUP_PAGES_PER_STEP, progress=on_step)
+    finally:
+        source.rollback()
+    return pages, time.perf_counter() - started
+
+
+def _report(path, pages, seconds):
+    size = os.path.getsize(path)
+    return {"path": path, "pages": pages, "bytes": size, "seconds": seconds,
+            "mb_per_second": size / 1e6 / seconds if seconds else 0.0}
+
+
+def backup_database(destination=None, progress=None):
+    """
+    Writes a consistent copy of the live database to `destination` (default: a new snapshot in BACKUP_DIR).
+    The copy is written to a .partial file and renamed when complete (or removed if the copy fails), so a
+    failed backup never leaves a truncated file behind. Safe to call from any thread; it uses its own connections.
+    Returns a dict with the path, pages, bytes, seconds and throughput in MB/s.
+    """
+    destination = destination or snapshot_path()
+    os.makedirs(os.path.dirname(os.path.abspath(destination)), exist_ok=True)
+    partial = destination + ".partial"
+    if os.path.exists(partial):
+        os.remove(partial)
+
+    source = _connect(db_connection.DB_PATH)
+    target = _connect(partial)
+    try:
+        pages, seconds = _copy(source, target, progress)
+    except BaseException:
+        target.close()
+        os.remove(partial)
+        raise
+    finally:
+        target.close()
+        source.close()
+    os.replace(partial, destination)
+    return _report(destination, pages, seconds)
+
+
+def restore_database(source_path, progress=None):
+    """
+    Replaces the live database's contents with the backup at source_path, after checking the backup's
+    integrity and taking a safety backup of the current data. Other instances see the restored data on their
+    next read (their caches are dropped through PRAGMA data_version). Schema migrations are applied if the
+    backup is older than the app. Returns the report dict, with the safety copy's path as "safety_copy".
+    """
+    check = _connect(source_path)
+    try:
+        result = check.execute("PRAGMA quick_check").fetchone()[0]
+    finally:
+        check.close()
+    if result != "ok":
+        raise ValueError(f"{source_path} is not a usable backup: {result}")
+
+    safety = backup_database(os.path.join(
+        config.BACKUP_DIR, f"before-restore-{datetime.now():%Y%m%d-%H%M%S}.db"))
+
+    source = _connect(source_path)
+    target = _connect(db_connection.DB_PATH)
+    try:
+        pages, seconds = _copy(source, target, progress)
+    finally:
+        target.close()
+        source.close()
+
+    import database  # Imported here so plain backups don't load the whole data layer
+    database.init_db()
+    database.clear_cache()
+    report = _report(db_connection.DB_PATH, pages, seconds)
+    report["safety_copy"] = safety["path"]
+    return report
+
+
+def snapshot_path(directory=None):
+    return os.path.join(directory or config.BACKUP_DIR, f"{SNAPSHOT_PREFIX}{datetime.now():%Y%m%d-%H%M%S}.db")
+
+
+def rotate_snapshots(directory=None, keep=None):
+    """
+    Deletes all but the `keep` newest rolling snapshots in `directory`. Returns the paths removed.
+    Other backups (manual ones, safety copies) are left alone.
+    """
+    directory = directory or config.BACKUP_DIR
+    keep = config.SNAPSHOT_KEEP if keep is None else keep
+    if not os.path.isdir(directory):
+        return []
+    snapshots = sorted(name for name in os.listdir(directory) if SNAPSHOT_NAME.match(name))
+    removed = []
+    for name in snapshots[:max(len(snapshots) - keep, 0)]:
+        path = os.path.join(directory, name)
+        os.remove(path)
+        removed.append(path)
+    return removed
+
+
+def take_snapshot(directory=None, keep=None):
+    """
+    Takes one rolling snapshot and rotates old ones out. Returns the backup report plus "removed".
+    """
+    report = backup_database(snapshot_path(directory))
+    report["removed"] = rotate_snapshots(directory, keep)
+    return report
+
+
+class SnapshotScheduler(threading.Thread):
+    """
+    Takes a rolling snapshot every `interval_minutes` on its own daemon thread (not the db_executor
+    worker, so panel queries never wait behind a backup). The first snapshot is taken one interval after
+    start. The latest report is kept in `last_report`; failures go to failure_log.
+    """
+
+    def __init__(self, interval_minutes=None, directory=None, keep=None):
+        super().__init__(name="vaquero-snapshots", daemon=True)
+        self.interval = (interval_minutes if interval_minutes is not None else config.SNAPSHOT_INTERVAL_MINUTES) * 60
+        self.directory = directory
+        self.keep = keep
+        self.last_report = None
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            try:
+                self.last_report = take_snapshot(self.directory, self.keep)
+            except Exception as e:
+                report_failure("snapshot", e, directory=self.directory or config.BACKUP_DIR)
+
+    def stop(self):
+        self._stop_event.set()
+
+
+_scheduler = None
+
+
+def start_snapshots():
+    """
+    Starts the rolling snapshot thread once per process if SNAPSHOT_INTERVAL_MINUTES is set and this process
+    uses the database file directly (with the data service, run `python backup.py snapshots --db ...` next to
+    the service instead). Returns it, or None.
+    """
+    global _scheduler
+    if _scheduler is None and config.SNAPSHOT_INTERVAL_MINUTES > 0 and LOCAL_DATABASE:
+        _scheduler = SnapshotScheduler()
+        _scheduler.start()
+    return _scheduler
+
+
+def describe(report):
+    """
+    One-line summary of a backup or restore report.
+    """
+    return (f"{report['bytes'] / 1e6:.1f} MB ({report['pages']} pages) in {report['seconds']:.2f} s, "
+            f"{report['mb_per_second']:.0f} MB/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db", help="database file (defaults to the app's database)")
+    commands = parser.add_subparsers(dest="command", required=True)
+    backup_command = commands.add_parser("backup", help="write one backup")
+    backup_command.add_argument("destination", nargs="?")
+    restore_command = commands.add_parser("restore", help="replace the database with a backup")
+    restore_command.add_argument("source")
+    snapshots_command = commands.add_parser("snapshots", help="take rolling snapshots until interrupted")
+    snapshots_command.add_argument("--every", type=float, default=config.SNAPSHOT_INTERVAL_MINUTES or 60,
+                                   help="minutes between snapshots")
+    snapshots_command.add_argument("--keep", type=int, default=config.SNAPSHOT_KEEP)
+    args = parser.parse_args()
+
+    if args.db:
+        db_connection.set_database_path(args.db)
+    elif not LOCAL_DATABASE:
+        parser.error("the data service (VAQUERO_BACKEND=service) owns the database; pass --db with the file it serves")
+
+    def show_progress(remaining, total):
+        print(f"\r  {total - remaining}/{total} pages", end="", flush=True)
+
+    if args.command == "backup":
+        report = backup_database(args.destination, progress=show_progress)
+        print(f"\nBacked up {describe(report)} -> {report['path']}")
+    elif args.command == "restore":
+        report = restore_database(args.source, progress=show_progress)
+        print(f"\nRestored {describe(report)}; previous data saved to {report['safety_copy']}")
+    else:
+        print(f"Taking a snapshot every {args.every:g} minutes into {config.BACKUP_DIR}, keeping {args.keep}")
+        try:
+            while True:
+                report = take_snapshot(keep=args.keep)
+                print(f"{datetime.now():%H:%M:%S} {describe(report)} -> {report['path']}"
+                      + (f", removed {len(report['removed'])} old" if report["removed"] else ""))
+                time.sleep(args.every * 60)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import threading
+import time
+import tkinter as tk
+from tkinter import ttk
+from tkinter import messagebox as VaquerosMessager
+
+from backup import describe
+from failure_log import report_failure
+
+# How often (ms) the window checks on the copy. How late these checks run is the UI stall it reports.
+POLL_MS = 20
+
+
+class BackupWindow(tk.Toplevel):
+    """
+    Runs a backup or restore (backup.backup_database / backup.restore_database) on its own thread and shows
+    its progress. The copy never touches the Tk thread or the shared db_executor worker, so the dashboard stays
+    usable meanwhile. When it finishes, the window reports the throughput and the longest UI stall seen while
+    copying, and calls on_done(report) with the report (including "ui_stall_ms").
+    """
+
+    def __init__(self, master, title, func, *args, on_done=None):
+        super().__init__(master)
+        self.title(title)
+        self.resizable(False, False)
+        self.configure(bg="white")
+        self.transient(master)
+        self.verb = title
+        self.on_done = on_done
+
+        self.status_label = ttk.Label(self, text="Starting...", width=60, wraplength=420)
+        self.status_label.pack(padx=20, pady=(20, 10), anchor="w")
+        self.progress_bar = ttk.Progressbar(self, length=420, maximum=1.0)
+        self.progress_bar.pack(padx=20, pady=(0, 10))
+        self.close_button = ttk.Button(self, text="Close", command=self.destroy, state="disabled")
+        self.close_button.pack(pady=(0, 20))
+        self.protocol("WM_DELETE_WINDOW", self._on_close_request)
+
+        # Written by the copy thread, read by _poll on the Tk thread
+        self._progress = (0, 0)  # (pages copied, total pages)
+        self._finished = False
+        self._result = None
+        self._error = None
+
+        self._max_stall_ms = 0.0
+        self._expected = time.perf_counter() + POLL_MS / 1000
+        threading.Thread(target=self._run, args=(func, args), name="vaquero-backup", daemon=True).start()
+        self.after(POLL_MS, self._poll)
+
+    def _run(self, func, args):
+        try:
+            self._result = func(*args, progress=self._on_progress)
+        except Exception as e:
+            self._error = e
+        finally:
+            self._finished = True
+
+    def _on_progress(self, remaining, total):
+        self._progress = (total - remaining, total)
+
+    def _poll(self):
+        self._max_stall_ms = max(self._max_stall_ms, (time.perf_counter() - self._expected) * 1000)
+        copied, total = self._progress
+        if total:
+            self.progress_bar["value"] = copied / total
+            self.status_label.config(text=f"{self.verb}: copied {copied:,} of {total:,} pages...")
+        if self._finished:
+            self._show_outcome()
+            return
+        self._expected = time.perf_counter() + POLL_MS / 1000
+        self.after(POLL_MS, self._poll)
+
+    def _show_outcome(self):
+        self.close_button.config(state="normal")
+        if self._error is not None:
+            report_failure(self.verb.lower(), self._error)
+            self.status_label.config(text=f"{self.verb} failed: {self._error}")
+            VaquerosMessager.showerror(f"{self.verb} Failed", str(self._error), parent=self)
+            return
+
+        report = self._result
+        report["ui_stall_ms"] = round(self._max_stall_ms, 1)
+        self.progress_bar["value"] = 1.0
+        text = f"{self.verb} complete: {describe(report)}.\nLongest UI stall while copying: {self._max_stall_ms:.0f} ms."
+        if "safety_copy" in report:
+            text += f"\nThe previous data was saved to {report['safety_copy']}."
+        else:
+            text += f"\nSaved to {report['path']}."
+        self.status_label.config(text=text)
+        if self.on_done is not None:
+            self.on_done(report)
+
+    def _on_close_request(self):
+        if self._finished:
+            self.destroy()
+        else:
+            VaquerosMessager.showinfo(self.verb, "Please wait for the copy to finish.", parent=self)
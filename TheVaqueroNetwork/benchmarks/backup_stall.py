@@ -0,0 +1,107 @@
+"""
+Backup throughput and UI stall: runs backup.backup_database on a worker thread while the main thread ticks
+like the Tk event loop, for several page-batch sizes, and compares it with copying the file on the UI thread.
+
+Run from the TheVaqueroNetwork directory (no display needed):
+    python -m benchmarks.backup_stall [--users 500] [--tasks-per-user 200] [--announcements 50000] [--writer]
+"Stall" is how late each tick ran past its TICK_MS schedule; the copy stalls the UI for its whole duration.
+--writer adds a thread committing a task every few milliseconds during each backup, as another app instance would.
+"""
+import argparse
+import os
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+
+import backup
+import config
+from benchmarks import datagen
+
+TICK_MS = 20
+
+# (label, pages per step, sleep ms between steps); -1 copies everything in one step
+SETTINGS = (
+    ("one step", -1, 0),
+    ("256 pages", 256, 0),
+    ("1024 pages", 1024, 0),
+    ("1024 pages + 1 ms", 1024, 1),
+    ("4096 pages + 1 ms", 4096, 1),
+)
+
+
+def tick_while(running):
+    """
+    Ticks every TICK_MS on the calling thread until running() is false. Returns each tick's lateness in ms.
+    """
+    lateness = []
+    expected = time.perf_counter() + TICK_MS / 1000
+    while running():
+        time.sleep(max(expected - time.perf_counter(), 0))
+        now = time.perf_counter()
+        lateness.append((now - expected) * 1000)
+        expected = now + TICK_MS / 1000
+    return lateness or [0.0]
+
+
+def writer(stop):
+    import database
+    while not stop.is_set():
+        database.add_task(datagen.usernames(1)[0], "Backup stall", "written during a backup")
+        time.sleep(0.002)
+
+
+def run_backup(destination, with_writer):
+    result = {}
+    stop = threading.Event()
+    threads = [threading.Thread(target=lambda: result.update(backup.backup_database(destination)))]
+    if with_writer:
+        threads.append(threading.Thread(target=writer, args=(stop,), daemon=True))
+    for thread in threads:
+        thread.start()
+    lateness = tick_while(threads[0].is_alive)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    return result["seconds"], result["bytes"], lateness
+
+
+def copy_on_ui_thread(source, destination):
+    # The old way: the copy runs where the UI would, so the stall is the copy itself
+    started = time.perf_counter()
+    shutil.copyfile(source, destination)
+    seconds = time.perf_counter() - started
+    return seconds, os.path.getsize(destination), [seconds * 1000]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--tasks-per-user", type=int, default=200)
+    parser.add_argument("--announcements", type=int, default=50000)
+    parser.add_argument("--writer", action="store_true", help="commit tasks from another thread during each backup")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "backup_stall.db")
+        datagen.generate(path, users=args.users, tasks_per_user=args.tasks_per_user,
+                         announcements=args.announcements)
+
+        print(f"{'method':<22} {'seconds':>8} {'MB/s':>7} {'max stall':>10} {'p99 stall':>10}")
+        runs = [("file copy on UI thread", lambda dest: copy_on_ui_thread(path, dest))]
+        for label, pages, sleep_ms in SETTINGS:
+            def run(dest, pages=pages, sleep_ms=sleep_ms):
+                config.BACKUP_PAGES_PER_STEP = pages
+                config.BACKUP_STEP_SLEEP_MS = sleep_ms
+                return run_backup(dest, args.writer)
+            runs.append((label, run))
+
+        for index, (label, run) in enumerate(runs):
+            seconds, size, lateness = run(os.path.join(tmp, f"copy{index}.db"))
+            p99 = statistics.quantiles(lateness, n=100)[98] if len(lateness) > 1 else lateness[0]
+            print(f"{label:<22} {seconds:>8.2f} {size / 1e6 / seconds:>7.0f} {max(lateness):>8.1f}ms {p99:>8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
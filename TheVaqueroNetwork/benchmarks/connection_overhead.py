@@ -0,0 +1,76 @@
+"""
+Compares ops/sec of the shared per-thread connection against the old connect-per-call pattern.
+
+Run from the TheVaqueroNetwork directory:
+    python -m benchmarks.connection_overhead [--ops 2000]
+"""
+import argparse
+import os
+import sqlite3
+import tempfile
+import time
+
+import database
+from db_connection import close_connection, set_database_path
+
+
+def _legacy_get_tasks(path, username):
+    # Mirrors the original database.py behaviour: open, query, close on every call
+    conn = sqlite3.connect(path)
+    cursor = conn.cursor()
+    cursor.execute("SELECT id, title, description, due_date, status FROM tasks WHERE username = ?", (username,))
+    tasks = cursor.fetchall()
+    conn.close()
+    return tasks
+
+
+def _legacy_add_task(path, username, title):
+    conn = sqlite3.connect(path)
+    try:
+        cursor = conn.cursor()
+        cursor.execute(
+            "INSERT INTO tasks (username, title, description, due_date) VALUES (?, ?, ?, ?)",
+            (username, title, None, None)
+        )
+        conn.commit()
+        return cursor.lastrowid
+    finally:
+        conn.close()
+
+
+def _ops_per_sec(func, ops):
+    start = time.perf_counter()
+    for i in range(ops):
+        func(i)
+    return ops / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--ops", type=int, default=2000, help="operations per measurement")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        set_database_path(path)
+        database.init_db()
+        database.add_user("bench", "bench")
+        for i in range(50):
+            database.add_task("bench", f"seed {i}")
+        # The query itself, without the LRU cache in front of it, so both get_tasks rows run the same SELECT
+        uncached_get_tasks = database.get_tasks.__wrapped__
+
+        results = [
+            ("get_tasks (connect per call)", _ops_per_sec(lambda i: _legacy_get_tasks(path, "bench"), args.ops)),
+            ("get_tasks (shared connection)", _ops_per_sec(lambda i: uncached_get_tasks("bench"), args.ops)),
+            ("add_task (connect per call)", _ops_per_sec(lambda i: _legacy_add_task(path, "bench", f"t{i}"), args.ops)),
+            ("add_task (shared connection)", _ops_per_sec(lambda i: database.add_task("bench", f"t{i}"), args.ops)),
+        ]
+        close_connection()
+
+    for name, rate in results:
+        print(f"{name:<32} {rate:>12,.0f} ops/sec")
+
+
+if __name__ == "__main__":
+    main()
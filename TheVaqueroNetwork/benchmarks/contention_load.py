@@ -0,0 +1,194 @@
+"""
+Multi-instance load test: N processes share one vaquero_network.db, each running a mixed workload of
+add_task, update_task, add_announcement and get_* calls, the way several copies of the app would.
+
+Run from the TheVaqueroNetwork directory:
+    python -m benchmarks.contention_load [--processes 16] [--seconds 10]
+By default it runs twice: once with no busy timeout and no retries (how the app used to behave) and once
+with the configured busy timeout and retry settings. Use --busy-timeout/--retries to test one setting.
+
+After each run every acknowledged write is checked against the database. "failed" counts writes that
+returned a failure result (and were reported through failure_log) plus any call that raised, such as a read
+that hit "database is locked"; "lost" writes were acknowledged but are missing.
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import queue
+import random
+import sqlite3
+import tempfile
+import time
+
+import config
+from benchmarks import datagen
+from benchmarks.suite import summarize
+
+OPERATIONS = ("add_task", "update_task", "add_announcement", "get_tasks", "get_announcements_page")
+
+
+def _worker(path, index, seconds, busy_timeout_ms, retries, start, results):
+    """
+    One simulated app instance. Puts a dict of per-operation latencies and write outcomes on `results`.
+    """
+    config.BUSY_TIMEOUT_MS = busy_timeout_ms
+    config.WRITE_RETRIES = retries
+    logging.getLogger("vaquero.db").disabled = True  # Failures are counted below; one log line each would swamp the run
+    import database
+    from db_connection import retry_stats, set_database_path
+    set_database_path(path)
+
+    rng = random.Random(index)
+    username = datagen.usernames(index + 1)[index]
+    latencies = {name: [] for name in OPERATIONS}
+    task_ids, updated_ids, announcement_titles, task_titles = [], [], [], []
+    failed = 0
+    sequence = 0
+
+    start.wait()
+    deadline = time.perf_counter() + seconds
+    try:
+        while time.perf_counter() < deadline:
+            roll = rng.random()
+            sequence += 1
+            began = time.perf_counter()
+            try:
+                if roll < 0.35:
+                    operation = "add_task"
+                    title = f"load-{index}-{sequence}"
+                    task_id = database.add_task(username, title, "contention test", "2025-09-15")
+                    if task_id:
+                        task_ids.append(task_id)
+                        task_titles.append(title)
+                    else:
+                        failed += 1
+                elif roll < 0.55 and task_ids:
+                    operation = "update_task"
+                    task_id = rng.choice(task_ids)
+                    if database.update_task(task_id, status="done"):
+                        updated_ids.append(task_id)
+                    else:
+                        failed += 1
+                elif roll < 0.75:
+                    operation = "add_announcement"
+                    title = f"load-{index}-{sequence}"
+                    if database.add_announcement(username, title, "contention test"):
+                        announcement_titles.append(title)
+                    else:
+                        failed += 1
+                elif roll < 0.9:
+                    operation = "get_tasks"
+                    database.get_tasks(username)
+                else:
+                    operation = "get_announcements_page"
+                    database.get_announcements_page(25)
+            except Exception:
+                # Reads (and opening the connection) raise instead of returning a failure result
+                failed += 1
+                continue
+            latencies[operation].append((time.perf_counter() - began) * 1000)
+    finally:
+        # Always report, so the parent never waits for a worker that died
+        results.put({
+            "latencies": latencies,
+            "failed": failed,
+            "task_titles": task_titles,
+            "updated_ids": updated_ids,
+            "announcement_titles": announcement_titles,
+            "retries": retry_stats["retries"],
+        })
+
+
+def _count_lost(path, outcomes):
+    """
+    Returns how many acknowledged writes are not in the database.
+    """
+    conn = sqlite3.connect(path)
+    task_titles = {row[0] for row in conn.execute("SELECT title FROM tasks WHERE title LIKE 'load-%'")}
+    announcement_titles = {row[0] for row in conn.execute("SELECT title FROM announcements WHERE title LIKE 'load-%'")}
+    done_ids = {row[0] for row in conn.execute("SELECT id FROM tasks WHERE status = 'done'")}
+    conn.close()
+
+    lost = 0
+    for outcome in outcomes:
+        lost += sum(title not in task_titles for title in outcome["task_titles"])
+        lost += sum(title not in announcement_titles for title in outcome["announcement_titles"])
+        lost += sum(task_id not in done_ids for task_id in outcome["updated_ids"])
+    return lost
+
+
+def run(path, processes, seconds, busy_timeout_ms, retries):
+    ctx = multiprocessing.get_context("spawn")  # Fresh interpreters: no SQLite handles inherited across fork
+    start = ctx.Event()
+    results = ctx.Queue()
+    workers = [ctx.Process(target=_worker, args=(path, i, seconds, busy_timeout_ms, retries, start, results))
+               for i in range(processes)]
+    for worker in workers:
+        worker.start()
+    time.sleep(1.0)  # Let every worker finish importing before the clock starts
+    began = time.perf_counter()
+    start.set()
+    outcomes = []
+    while len(outcomes) < len(workers):
+        try:
+            outcomes.append(results.get(timeout=1.0))
+        except queue.Empty:
+            if all(worker.exitcode is not None for worker in workers):
+                break  # Everyone has exited; a worker that died before reporting (e.g. on import) never will
+    elapsed = time.perf_counter() - began
+    for worker in workers:
+        worker.join()
+    crashed = sum(1 for worker in workers if worker.exitcode)
+
+    per_operation = {}
+    for name in OPERATIONS:
+        timings = [ms for outcome in outcomes for ms in outcome["latencies"][name]]
+        if timings:
+            per_operation[name] = summarize(timings)
+    ops = sum(stats["iterations"] for stats in per_operation.values())
+    writes = sum(len(o["task_titles"]) + len(o["updated_ids"]) + len(o["announcement_titles"]) for o in outcomes)
+    return {
+        "throughput": ops / elapsed,
+        "acknowledged_writes": writes,
+        "failed_writes": sum(o["failed"] for o in outcomes),
+        "lost_writes": _count_lost(path, outcomes),
+        "retries": sum(o["retries"] for o in outcomes),
+        "crashed_workers": crashed,
+        "operations": per_operation,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--processes", type=int, default=16)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--busy-timeout", type=int, help="busy timeout in ms (default: compare 0 with the config)")
+    parser.add_argument("--retries", type=int, help="write retries (default: compare 0 with the config)")
+    args = parser.parse_args()
+
+    if args.busy_timeout is None and args.retries is None:
+        settings = [(0, 0), (config.BUSY_TIMEOUT_MS, config.WRITE_RETRIES)]
+    else:
+        settings = [(args.busy_timeout if args.busy_timeout is not None else config.BUSY_TIMEOUT_MS,
+                     args.retries if args.retries is not None else config.WRITE_RETRIES)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for busy_timeout_ms, retries in settings:
+            path = os.path.join(tmp, f"load-{busy_timeout_ms}-{retries}.db")
+            datagen.generate(path, users=args.processes, tasks_per_user=20, announcements=1000)
+            report = run(path, args.processes, args.seconds, busy_timeout_ms, retries)
+
+            print(f"\nbusy_timeout={busy_timeout_ms}ms retries={retries}: {args.processes} processes, "
+                  f"{report['throughput']:,.0f} ops/sec")
+            print(f"  writes acknowledged {report['acknowledged_writes']}, failed {report['failed_writes']}, "
+                  f"lost {report['lost_writes']}, retries {report['retries']}")
+            if report["crashed_workers"]:
+                print(f"  {report['crashed_workers']} of {args.processes} workers crashed before reporting")
+            for name, stats in report["operations"].items():
+                print(f"  {name:<24} p50 {stats['p50_ms']:>8.2f}ms  p95 {stats['p95_ms']:>8.2f}ms  "
+                      f"p99 {stats['p99_ms']:>8.2f}ms  ({stats['iterations']} calls)")
+
+
+if __name__ == "__main__":
+    main()
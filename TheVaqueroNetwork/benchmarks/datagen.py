@@ -0,0 +1,128 @@
+"""
+Builds a synthetic vaquero_network.db at a configurable scale for benchmarking.
+
+Run from the TheVaqueroNetwork directory:
+    python -m benchmarks.datagen bench.db --users 500 --tasks-per-user 100 --announcements 50000
+Every generated user has the password "password".
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from itertools import islice
+
+import database
+from db_connection import set_database_path, transaction
+from passwords import hash_password
+
+WORDS = (
+    "exam homework project lab quiz essay reading lecture midterm final review group meeting club "
+    "volunteer library study career fair tutoring advising registration deadline scholarship campus "
+    "event concert game practice workshop seminar internship research presentation report draft"
+).split()
+
+# Pseudo-words so search terms match a realistic fraction of rows instead of nearly all of them
+SYLLABLES = "ba co di fe ga lo mi nu ra si te vo".split()
+VOCABULARY = WORDS + [a + b + c for a in SYLLABLES for b in SYLLABLES for c in SYLLABLES]
+
+BENCH_PASSWORD = "password"
+
+
+def _sentence(rng, words):
+    return " ".join(rng.choice(VOCABULARY) for _ in range(words)).capitalize()
+
+
+def _chunked(rows, size=5000):
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def usernames(users):
+    return [f"student{i:05d}" for i in range(users)]
+
+
+def generate(path, users=100, tasks_per_user=50, announcements=10000, contacts_per_user=3, seed=0):
+    """
+    Creates (or extends) the database at `path` with synthetic users, tasks, emergency contacts and announcements.
+    Leaves the app pointed at `path`. Returns a dict describing the generated scale.
+    """
+    rng = random.Random(seed)
+    set_database_path(path)
+    database.init_db()
+
+    names = usernames(users)
+    start = datetime(2025, 8, 25)
+    # Hashing is deliberately slow, so every synthetic user shares one hash of the same password
+    password_hash = hash_password(BENCH_PASSWORD)
+
+    with transaction() as conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO users (username, password) VALUES (?, ?)",
+            ((name, password_hash) for name in names)
+        )
+
+    def task_rows():
+        for name in names:
+            for _ in range(tasks_per_user):
+                due = start + timedelta(days=rng.randrange(120))
+                status = "done" if rng.random() < 0.3 else "pending"
+                yield name, _sentence(rng, 3), _sentence(rng, 12), due.strftime("%Y-%m-%d"), status
+
+    def contact_rows():
+        for name in names:
+            for _ in range(contacts_per_user):
+                yield name, _sentence(rng, 2), f"956-{rng.randrange(1000):03d}-{rng.randrange(10000):04d}"
+
+    def announcement_rows():
+        for i in range(announcements):
+            posted = start + timedelta(seconds=int(i * 120 * 24 * 3600 / max(announcements, 1)))
+            yield rng.choice(names), _sentence(rng, 5), _sentence(rng, 40), posted.strftime("%Y-%m-%d %H:%M:%S")
+
+    inserts = [
+        ("INSERT INTO tasks (username, title, description, due_date, status) VALUES (?, ?, ?, ?, ?)", task_rows()),
+        ("INSERT INTO emergency_contacts (username, contact_name, contact_number) VALUES (?, ?, ?)", contact_rows()),
+        ("INSERT INTO announcements (username, title, content, timestamp) VALUES (?, ?, ?, ?)", announcement_rows()),
+    ]
+    for sql, rows in inserts:
+        for chunk in _chunked(rows):
+            with transaction() as conn:
+                conn.executemany(sql, chunk)
+
+    with transaction() as conn:
+        conn.execute("ANALYZE")
+    database.clear_cache()
+
+    return {
+        "users": users,
+        "tasks_per_user": tasks_per_user,
+        "announcements": announcements,
+        "contacts_per_user": contacts_per_user,
+        "seed": seed,
+    }
+
+
+def add_scale_arguments(parser):
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--tasks-per-user", type=int, default=50)
+    parser.add_argument("--announcements", type=int, default=10000)
+    parser.add_argument("--contacts-per-user", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("path", help="database file to create")
+    add_scale_arguments(parser)
+    args = parser.parse_args()
+
+    began = time.perf_counter()
+    scale = generate(args.path, args.users, args.tasks_per_user, args.announcements, args.contacts_per_user, args.seed)
+    print(f"Generated {scale} in {time.perf_counter() - began:.1f}s -> {args.path}")
+
+
+if __name__ == "__main__":
+    main()
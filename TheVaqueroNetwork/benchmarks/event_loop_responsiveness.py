@@ -0,0 +1,68 @@
+"""
+Checks that the Tk event loop keeps ticking while a slow query runs through db_executor.run_async.
+
+Run from the TheVaqueroNetwork directory (needs a display; on a headless machine, prefix it with xvfb-run):
+    python -m benchmarks.event_loop_responsiveness [--rows 3000000] [--max-gap-ms 100]
+Exits with status 1 if the longest gap between timer ticks exceeds --max-gap-ms.
+"""
+import argparse
+import sys
+import time
+import tkinter as tk
+
+from db_connection import get_connection
+from db_executor import run_async
+
+TICK_MS = 10
+
+
+def slow_query(rows):
+    # A recursive CTE keeps SQLite busy without needing a large database file
+    return get_connection().execute(
+        "WITH RECURSIVE c(x) AS (SELECT 1 UNION ALL SELECT x + 1 FROM c WHERE x < ?) SELECT count(*) FROM c",
+        (rows,)
+    ).fetchone()[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=3_000_000, help="rows generated by the slow query")
+    parser.add_argument("--max-gap-ms", type=float, default=100.0, help="largest acceptable gap between ticks")
+    args = parser.parse_args()
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        sys.exit(f"Can't open a Tk window ({e}); run it under a display or xvfb-run.")
+    root.withdraw()
+    ticks = []
+    state = {"done": False, "query_seconds": 0.0}
+
+    def tick():
+        ticks.append(time.perf_counter())
+        if not state["done"]:
+            root.after(TICK_MS, tick)
+
+    def finished(result):
+        state["done"] = True
+        state["query_seconds"] = time.perf_counter() - start
+        root.after(TICK_MS * 2, root.quit)
+
+    start = time.perf_counter()
+    run_async(root, slow_query, args.rows, on_success=finished)
+    root.after(TICK_MS, tick)
+    root.mainloop()
+    root.destroy()
+
+    gaps = [(b - a) * 1000 for a, b in zip(ticks, ticks[1:])]
+    max_gap = max(gaps) if gaps else float("inf")
+    print(f"query took {state['query_seconds']:.2f}s; event loop ticked {len(ticks)} times, "
+          f"longest gap {max_gap:.1f} ms")
+    if max_gap > args.max_gap_ms:
+        print(f"FAIL: event loop stalled for more than {args.max_gap_ms:.0f} ms")
+        sys.exit(1)
+    print("OK: event loop stayed responsive")
+
+
+if __name__ == "__main__":
+    main()
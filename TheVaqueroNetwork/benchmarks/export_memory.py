@@ -0,0 +1,71 @@
+"""
+Peak memory and throughput of data_export at two table sizes, against exporting from fetchall().
+
+Run from the TheVaqueroNetwork directory:
+    python -m benchmarks.export_memory [--announcements 20000 200000]
+Peak memory is measured with tracemalloc around each export. The streaming exporters should show the same
+peak at both sizes; the fetchall() baseline grows with the table. tracemalloc slows everything down, so
+compare the rows/s column between methods rather than with data_export's own report.
+"""
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+import data_export
+from benchmarks import datagen
+
+
+def fetchall_export(path):
+    # What an export built on get_announcements() would do: every row in memory before the first write
+    conn = data_export._connect_read_only()
+    try:
+        rows = conn.execute(data_export.QUERIES["announcements"].format(table="announcements")).fetchall()
+    finally:
+        conn.close()
+    columns = data_export.COLUMNS["announcements"]
+    with open(path, "w", encoding="utf-8") as f:
+        for row in rows:
+            f.write(json.dumps(dict(zip(columns, row)), ensure_ascii=False) + "\n")
+    return len(rows)
+
+
+def peak(func):
+    """
+    Runs func() and returns (its result, seconds, peak traced memory in MB).
+    """
+    tracemalloc.start()
+    started = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - started
+    peak_bytes = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, seconds, peak_bytes / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--announcements", type=int, nargs="+", default=[20000, 200000])
+    args = parser.parse_args()
+
+    print(f"{'announcements':>13} {'method':<26} {'seconds':>8} {'rows/s':>9} {'peak MB':>8}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for count in args.announcements:
+            datagen.generate(os.path.join(tmp, f"export_{count}.db"), users=100, tasks_per_user=count // 100,
+                             announcements=count)
+            runs = [
+                ("fetchall() to .jsonl", lambda: fetchall_export(os.path.join(tmp, "fetchall.jsonl"))),
+                ("announcements .jsonl", lambda: data_export.export("announcements", os.path.join(tmp, "a.jsonl"))),
+                ("announcements .csv", lambda: data_export.export("announcements", os.path.join(tmp, "a.csv"))),
+                ("tasks .ics", lambda: data_export.export("tasks", os.path.join(tmp, "t.ics"))),
+            ]
+            for label, run in runs:
+                result, seconds, peak_mb = peak(run)
+                rows = getattr(result, "rows", result)
+                print(f"{count:>13} {label:<26} {seconds:>8.2f} {rows / seconds:>9,.0f} {peak_mb:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Measures time-to-first-frame of the login and dashboard windows: from the start of window construction
+until the window is mapped and Tk has no layout work left.
+
+"per-window theming" reproduces the old behaviour, where every window (and every calendar panel build)
+called theme_use('clam') and re-configured its styles; "theme registry" is the current code, where
+theme.apply_theme() registers the styles once per Tk interpreter.
+
+Run from the TheVaqueroNetwork directory (needs a display; on a headless machine, prefix it with xvfb-run):
+    python -m benchmarks.first_frame [--repeat 10]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tkinter as tk
+
+import theme
+from benchmarks import datagen
+from dashboardWindow import DashboardWindow
+from loginWindow import create_main_window
+
+TIMEOUT_SECONDS = 30
+
+
+def _wait_for_first_frame(window, start):
+    deadline = time.perf_counter() + TIMEOUT_SECONDS
+    while not window.winfo_viewable():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("window was never mapped")
+        window.update()
+    window.update_idletasks()
+    return (time.perf_counter() - start) * 1000
+
+
+def login_first_frame(per_window_theming):
+    start = time.perf_counter()
+    window = create_main_window()
+    if per_window_theming:
+        theme.apply_theme(window, force=True)  # The login window configured its own styles too
+    elapsed = _wait_for_first_frame(window, start)
+    return window, elapsed
+
+
+def dashboard_first_frame(root, username, per_window_theming):
+    start = time.perf_counter()
+    if per_window_theming:
+        theme.apply_theme(root, force=True)  # The dashboard re-ran theme_use and its style setup
+    dash = DashboardWindow(master=root, username=username)
+    if per_window_theming:
+        theme.apply_theme(root, force=True)  # ...and so did the calendar panel every time it was built
+    dash.show_event_calendar()
+    elapsed = _wait_for_first_frame(dash, start)
+    dash.destroy()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10, help="windows opened per variant")
+    args = parser.parse_args()
+
+    # Fail before building the fixture if there is no display; this also keeps Tcl's one-time startup out of
+    # the first sample
+    try:
+        tk.Tk().destroy()
+    except tk.TclError as e:
+        sys.exit(f"Can't open a Tk window ({e}); run it under a display or xvfb-run.")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        datagen.generate(os.path.join(tmp, "bench.db"), users=5, tasks_per_user=100, announcements=1000)
+        username = datagen.usernames(1)[0]
+
+        print(f"{'variant':<22} {'login p50':>11} {'dashboard p50':>15}")
+        for label, per_window in (("per-window theming", True), ("theme registry", False)):
+            login_times, dashboard_times = [], []
+            for _ in range(args.repeat):
+                root, elapsed = login_first_frame(per_window)
+                login_times.append(elapsed)
+                root.withdraw()
+                dashboard_times.append(dashboard_first_frame(root, username, per_window))
+                root.destroy()
+            print(f"{label:<22} {statistics.median(login_times):>9.1f}ms "
+                  f"{statistics.median(dashboard_times):>13.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Reports validate_user (login) latency at each scrypt cost setting.
+
+Run from the TheVaqueroNetwork directory:
+    python -m benchmarks.login_latency [--logins 20] [--costs 12 13 14 15 16]
+Costs are given as log2(N), so 14 means SCRYPT_N = 16384 (the default).
+"""
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+import config
+import database
+from db_connection import close_connection, set_database_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logins", type=int, default=20, help="logins timed per cost setting")
+    parser.add_argument("--costs", type=int, nargs="+", default=[12, 13, 14, 15, 16], help="log2(N) values to try")
+    args = parser.parse_args()
+
+    print(f"{'N':>8} {'p50 ms':>9} {'max ms':>9} {'logins/sec':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        set_database_path(os.path.join(tmp, "bench.db"))
+        database.init_db()
+
+        for cost in args.costs:
+            config.SCRYPT_N = 2 ** cost
+            username = f"bench{cost}"
+            database.add_user(username, "correct horse")
+
+            timings = []
+            for _ in range(args.logins):
+                start = time.perf_counter()
+                assert database.validate_user(username, "correct horse")
+                timings.append((time.perf_counter() - start) * 1000)
+
+            p50 = statistics.median(timings)
+            print(f"{config.SCRYPT_N:>8} {p50:>9.1f} {max(timings):>9.1f} {1000 / p50:>11.1f}")
+
+        close_connection()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Measures how long the Activities panel takes to open with 10k and 100k tasks, comparing the virtualized
+list against the old approach of inserting every row into a tk.Text.
+
+Run from the TheVaqueroNetwork directory (needs a display; on a headless machine, prefix it with xvfb-run):
+    python -m benchmarks.panel_open [--rows 10000 100000]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tkinter as tk
+
+import database
+from activity import ActivitiesPanel
+from db_connection import set_database_path
+
+TIMEOUT_SECONDS = 120
+
+
+def _pump_until(root, condition):
+    deadline = time.perf_counter() + TIMEOUT_SECONDS
+    while not condition():
+        if time.perf_counter() > deadline:
+            raise TimeoutError("panel did not finish loading")
+        root.update()
+
+
+def open_virtualized(root, username, rows):
+    """
+    Builds an ActivitiesPanel and waits until its task list has been populated and drawn.
+    """
+    start = time.perf_counter()
+    panel = ActivitiesPanel(root, username)
+    _pump_until(root, lambda: len(panel.tasks_list) == rows)
+    root.update_idletasks()
+    elapsed = time.perf_counter() - start
+    panel.destroy()
+    return elapsed
+
+
+def open_text_dump(root, username):
+    """
+    Reproduces the previous rendering: one tk.Text with several insert() calls per task.
+    """
+    start = time.perf_counter()
+    text = tk.Text(root, font=("Inter", 12), height=15, wrap="word")
+    text.pack(fill="both", expand=True)
+    for task_id, title, description, due_date, status in database.get_tasks(username):
+        text.insert(tk.END, f"Title: {title}\n")
+        if description:
+            text.insert(tk.END, f"Description: {description}\n")
+        if due_date:
+            text.insert(tk.END, f"Due Date: {due_date}\n")
+        text.insert(tk.END, f"Status: {status}\n")
+        text.insert(tk.END, "-" * 50 + "\n\n")
+    text.config(state="disabled")
+    root.update_idletasks()
+    elapsed = time.perf_counter() - start
+    text.destroy()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000], help="task counts to test")
+    args = parser.parse_args()
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        sys.exit(f"Can't open a Tk window ({e}); run it under a display or xvfb-run.")
+    root.geometry("900x700")
+    with tempfile.TemporaryDirectory() as tmp:
+        set_database_path(os.path.join(tmp, "bench.db"))
+        database.init_db()
+
+        print(f"{'rows':>8} {'tk.Text dump':>14} {'virtualized':>13}")
+        for rows in args.rows:
+            username = f"bench{rows}"
+            database.add_tasks_bulk(
+                (username, f"Task {i}", f"Description for task {i}", "2025-12-01") for i in range(rows)
+            )
+            database.clear_cache()
+            legacy = open_text_dump(root, username)
+            database.clear_cache()
+            virtual = open_virtualized(root, username, rows)
+            print(f"{rows:>8} {legacy * 1000:>12.0f}ms {virtual * 1000:>11.0f}ms")
+
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
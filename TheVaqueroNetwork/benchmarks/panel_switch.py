@@ -0,0 +1,111 @@
+"""
+Measures how long a sidebar click takes to switch dashboard panels, comparing the old approach of destroying
+and rebuilding the panel on every click against the PanelManager, which keeps visited panels alive.
+
+Run from the TheVaqueroNetwork directory (needs a display; on a headless machine, prefix it with xvfb-run):
+    python -m benchmarks.panel_switch [--rounds 20] [--max-resident 4]
+Each switch is timed from the click handler until Tk has finished laying out the new panel.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tkinter as tk
+
+from activity import ActivitiesPanel
+from bulletin_board import BulletinBoardPanel
+from calendar_panel import CalendarPanel
+from emergency_contact import EmergencyContactsPanel
+from panel_manager import PanelManager
+from benchmarks import datagen
+
+PANELS = {
+    "activities": ActivitiesPanel,
+    "calendar": CalendarPanel,
+    "bulletin_board": BulletinBoardPanel,
+    "emergency_contacts": EmergencyContactsPanel,
+}
+
+
+def _settle(root, seconds=0.3):
+    """
+    Processes events for a moment so background loads started by a switch finish before the next one.
+    """
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        root.update()
+
+
+def rebuild_switches(root, container, username, rounds):
+    """
+    Reproduces the previous navigation: destroy the content area's children and construct a new panel.
+    """
+    timings = []
+    for _ in range(rounds):
+        for panel_class in PANELS.values():
+            start = time.perf_counter()
+            for widget in container.winfo_children():
+                widget.destroy()
+            panel_class(container, username)
+            root.update_idletasks()
+            timings.append((time.perf_counter() - start) * 1000)
+            _settle(root)
+    for widget in container.winfo_children():
+        widget.destroy()
+    return timings
+
+
+def managed_switches(root, container, username, rounds, max_resident):
+    """
+    Navigates with a PanelManager. The first visit to each panel builds it; later visits only re-pack it.
+    """
+    manager = PanelManager(container, {
+        name: lambda parent, panel_class=panel_class: panel_class(parent, username)
+        for name, panel_class in PANELS.items()
+    }, max_resident=max_resident)
+    timings = []
+    for _ in range(rounds):
+        for name in PANELS:
+            start = time.perf_counter()
+            manager.show(name)
+            root.update_idletasks()
+            timings.append((time.perf_counter() - start) * 1000)
+            _settle(root)
+    return timings[len(PANELS):], manager  # The first round only builds the panels
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20, help="times to cycle through every panel")
+    parser.add_argument("--max-resident", type=int, default=len(PANELS), help="PanelManager resident cap")
+    args = parser.parse_args()
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        sys.exit(f"Can't open a Tk window ({e}); run it under a display or xvfb-run.")
+    root.geometry("1000x700")
+    container = tk.Frame(root, bg="white")
+    container.pack(fill="both", expand=True)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        datagen.generate(os.path.join(tmp, "bench.db"), users=10, tasks_per_user=500, announcements=5000)
+        username = datagen.usernames(1)[0]
+
+        rebuilt = rebuild_switches(root, container, username, args.rounds)
+        managed, manager = managed_switches(root, container, username, args.rounds, args.max_resident)
+
+        print(f"{'navigation':<22} {'p50':>9} {'p95':>9} {'max':>9}")
+        for label, timings in (("destroy + rebuild", rebuilt), ("PanelManager", managed)):
+            p95 = statistics.quantiles(timings, n=20)[18] if len(timings) > 1 else timings[0]
+            print(f"{label:<22} {statistics.median(timings):>7.2f}ms {p95:>7.2f}ms {max(timings):>7.2f}ms")
+        for action, (count, mean) in sorted(manager.timing_summary().items()):
+            print(f"  {action:<10} {count:>4} switches, mean {mean:.2f}ms inside PanelManager.show()")
+
+    root.destroy()
+
+
+if __name__ == "__main__":
+    main()
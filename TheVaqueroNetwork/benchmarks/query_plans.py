@@ -0,0 +1,191 @@
+"""
+Query-plan and latency regression checks for every public database.py function.
+
+Run from the TheVaqueroNetwork directory (exits with status 1 if any check fails):
+    python -m benchmarks.query_plans [--users 200] [--tasks-per-user 100] [--announcements 20000]
+Builds a fixture database with datagen, calls every function in CALLS while recording the SQL it issues
+(through the connection's trace callback), and runs each statement under EXPLAIN QUERY PLAN. A run fails when:
+  - a statement reads a whole table ("SCAN <table>", with or without an index) outside ALLOWED_SCANS,
+    or reads all of tasks at all;
+  - a statement on the announcement tables sorts in a temp B-tree instead of reading an index in order;
+  - a public database.py function has no entry in CALLS, so a new query can't skip these checks;
+  - a function's median time exceeds its threshold. Thresholds are set for the default fixture;
+    --time-factor scales them for slower machines and --no-timing skips them.
+"""
+import argparse
+import inspect
+import itertools
+import os
+import re
+import statistics
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+import database
+from benchmarks import datagen
+from benchmarks.suite import measure
+from db_connection import get_connection
+
+# Functions whose whole point is to read every row, as {function: reason}. Anything else that reads a table
+# from start to end, with or without an index, fails
+ALLOWED_SCANS = {
+    "get_announcements": "returns the whole board, in index order",
+}
+
+# Tables that must never be read in full, even by a function in ALLOWED_SCANS
+NEVER_SCAN = {"tasks"}
+
+# Tables whose queries must read rows in index order rather than sorting them
+NO_TEMP_SORT = {"announcements", "announcements_archive"}
+
+# Plan lines for table reads: "SCAN tasks", "SCAN a USING INDEX ...", "SEARCH ...", "SCAN f VIRTUAL TABLE ..."
+SCAN_LINE = re.compile(r"^SCAN (\w+)(.*)$")
+
+
+def build_calls(names, ids):
+    """
+    Returns [(function name, call, threshold_ms)]: one representative call of every public function.
+    `ids` collects row ids created along the way for the calls that update or delete.
+    """
+    user = names[len(names) // 2]
+    latest = database.get_announcements_page(1)[0]
+    cursor = (latest[4], latest[0])
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    new_users = itertools.count()
+
+    def add_task():
+        ids["task"] = database.add_task(user, "Plan check", "query plan check", today)
+
+    def delete_tasks():
+        database.delete_tasks([database.add_task(user, f"Delete {n}") for n in range(10)])
+
+    return [
+        ("init_db", lambda: database.init_db(), 5),
+        ("cache_stats", lambda: database.cache_stats(), 1),
+        ("data_version", lambda: database.data_version("tasks"), 1),
+        ("commit_version", lambda: database.commit_version(), 1),
+        ("clear_cache", lambda: database.clear_cache(), 1),
+        ("clear_cache_if_written_elsewhere", lambda: database.clear_cache_if_written_elsewhere(), 1),
+        ("use_single_writer", lambda: (database.use_single_writer(), database.use_single_writer(False)), 1),
+        ("add_user", lambda: database.add_user(f"plan_user_{next(new_users)}", "secret"), 500),
+        ("validate_user", lambda: database.validate_user(user, datagen.BENCH_PASSWORD), 500),
+        ("get_tasks", lambda: database.get_tasks(user), 5),
+        ("get_task_days", lambda: database.get_task_days(user, "2025-08-01", "2025-11-30"), 10),
+        ("add_task", add_task, 20),
+        ("get_task", lambda: database.get_task(ids["task"]), 2),
+        ("update_task", lambda: database.update_task(ids["task"], status="done"), 20),
+        ("update_task_status_many", lambda: database.update_task_status_many([ids["task"]], "pending"), 20),
+        ("delete_task", lambda: database.delete_task(database.add_task(user, "Delete me")), 20),
+        ("delete_tasks", delete_tasks, 40),
+        ("add_tasks_bulk", lambda: database.add_tasks_bulk([(user, f"Bulk {n}", None, today) for n in range(100)]), 50),
+        ("search_tasks", lambda: database.search_tasks(user, "exam"), 20),
+        ("add_emergency_contact", lambda: database.add_emergency_contact(user, "Campus police", "956-665-7151"), 20),
+        ("get_emergency_contacts", lambda: database.get_emergency_contacts(user), 5),
+        ("add_announcement", lambda: database.add_announcement(user, "Plan check", "query plan check"), 20),
+        ("get_announcements_page", lambda: database.get_announcements_page(25, before=cursor), 5),
+        ("get_announcements_page", lambda: database.get_announcements_page(25, before=cursor, include_archived=True), 5),
+        ("get_announcements_since", lambda: database.get_announcements_since(latest[0] - 50), 5),
+        ("search_announcements", lambda: database.search_announcements("exam review"), 20),
+        ("search_announcements", lambda: database.search_announcements("exam review", include_archived=True), 40),
+        ("archive_announcements", lambda: database.archive_announcements(older_than_days=60, max_batches=1), 200),
+        ("incremental_vacuum", lambda: database.incremental_vacuum(), 50),
+        ("enable_incremental_vacuum", lambda: database.enable_incremental_vacuum(), 5),
+        # Last: the full read is the slowest call and reads everything the others wrote
+        ("get_announcements", lambda: database.get_announcements(), 400),
+        ("get_announcements", lambda: database.get_announcements(include_archived=True), 400),
+    ]
+
+
+def capture_sql(call):
+    """
+    Runs call() and returns the distinct data-reading and -writing statements it sent to SQLite, in order and
+    with parameters filled in. Statements run inside triggers and FTS shadow tables are left out (the trace
+    reports them as comments), as are the repeats of the outer statement the trace adds around them.
+    """
+    statements = []
+    conn = get_connection()
+    conn.set_trace_callback(statements.append)
+    try:
+        call()
+    finally:
+        conn.set_trace_callback(None)
+    return [sql for sql in dict.fromkeys(statements)
+            if re.match(r"\s*(SELECT|INSERT|UPDATE|DELETE|WITH)\b", sql, re.IGNORECASE)]
+
+
+def check_plan(function, sql):
+    """
+    Returns the plan lines for sql and a list of problems found in them.
+    """
+    plan = [row[3] for row in get_connection().execute(f"EXPLAIN QUERY PLAN {sql}")]
+    problems = []
+    touches = {table for table in NO_TEMP_SORT if re.search(rf"\b{table}\b", sql)}
+    for line in plan:
+        scan = SCAN_LINE.match(line)
+        if scan and not scan.group(1).startswith("(") and "VIRTUAL TABLE" not in scan.group(2):
+            table = scan.group(1)
+            if table in NEVER_SCAN or function not in ALLOWED_SCANS:
+                problems.append(f"reads all of {table}: {line}")
+        if "TEMP B-TREE" in line and touches:
+            problems.append(f"sorts {', '.join(sorted(touches))} rows in a temp B-tree: {line}")
+    return plan, problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--tasks-per-user", type=int, default=100)
+    parser.add_argument("--announcements", type=int, default=20000)
+    parser.add_argument("--iterations", type=int, default=20, help="timed calls per function")
+    parser.add_argument("--time-factor", type=float, default=1.0, help="multiply every time threshold")
+    parser.add_argument("--no-timing", action="store_true", help="check query plans only")
+    parser.add_argument("--verbose", action="store_true", help="print every statement and its plan")
+    args = parser.parse_args()
+
+    failures = []
+    with tempfile.TemporaryDirectory() as tmp:
+        datagen.generate(os.path.join(tmp, "plans.db"), users=args.users, tasks_per_user=args.tasks_per_user,
+                         announcements=args.announcements)
+        # Give the archive table rows too, so its plans are checked against real data
+        database.archive_announcements(older_than_days=(datetime.now() - datetime(2025, 10, 1)).days)
+
+        ids = {}
+        calls = build_calls(datagen.usernames(args.users), ids)
+        public = {name for name, func in vars(database).items()
+                  if not name.startswith("_") and inspect.isfunction(func) and func.__module__ == "database"}
+        for name in sorted(public - {name for name, call, threshold in calls}):
+            failures.append(f"{name}: no entry in CALLS; add a representative call so its queries are checked")
+
+        print(f"{'function':<28} {'statements':>10} {'median':>10} {'limit':>9}  result")
+        for name, call, threshold_ms in calls:
+            statements = capture_sql(call)
+            problems = []
+            for sql in statements:
+                plan, found = check_plan(name, sql)
+                problems += found
+                if args.verbose:
+                    print(f"    {sql}\n" + "".join(f"      {line}\n" for line in plan), end="")
+
+            median = limit = None
+            if not args.no_timing:
+                limit = threshold_ms * args.time_factor
+                median = statistics.median(measure(lambda i: call(), args.iterations,
+                                                   setup=lambda i: database.clear_cache()))
+                if median > limit:
+                    problems.append(f"median {median:.2f} ms exceeds the {limit:g} ms threshold")
+
+            failures += [f"{name}: {problem}" for problem in problems]
+            timing = f"{median:>8.2f}ms {limit:>7g}ms" if median is not None else f"{'-':>10} {'-':>9}"
+            print(f"{name:<28} {len(statements):>10} {timing}  {'FAIL' if problems else 'ok'}")
+
+    if failures:
+        print(f"\n{len(failures)} problem(s):")
+        for failure in failures:
+            print(f"  {failure}")
+        sys.exit(1)
+    print("\nAll query plans use indexes and all timings are within their thresholds.")
+
+
+if __name__ == "__main__":
+    main()
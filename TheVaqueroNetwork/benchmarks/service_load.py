@@ -0,0 +1,142 @@
+"""
+Load test: dozens of simulated clients hammering one database, first writing to the SQLite file directly
+(every client its own process and connection, as desktop clients do today) and then through the local
+data service, which group-commits their writes.
+
+Run from the TheVaqueroNetwork directory:
+    python -m benchmarks.service_load [--clients 40] [--seconds 10] [--write-ratio 0.7]
+Each client is a separate process running a sign-up-rush mix: adding tasks and announcements, ticking
+tasks off, and re-reading its task list. A call that raises or reports failure counts as an error.
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import config
+from benchmarks import datagen
+from benchmarks.suite import summarize
+
+
+def _client(backend, path, port, index, seconds, write_ratio, start, results):
+    """
+    One simulated desktop client. Puts (ops, errors, latencies_ms) on the results queue when done.
+    """
+    if backend == "service":
+        config.SERVICE_PORT = port
+        import service_client as api
+    else:
+        from db_connection import set_database_path
+        set_database_path(path)
+        import database as api
+
+    rng = random.Random(index)
+    username = datagen.usernames(index + 1)[index]
+    task_ids = []
+    latencies = []
+    errors = 0
+    start.wait()
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        roll = rng.random()
+        began = time.perf_counter()
+        try:
+            if roll < write_ratio * 0.5:
+                result = api.add_task(username, f"Sign up for section {rng.randrange(100)}", None, "2025-09-01")
+                if result:
+                    task_ids.append(result)
+            elif roll < write_ratio * 0.8:
+                result = api.add_announcement(username, "Section open", f"Seats left: {rng.randrange(30)}")
+            elif roll < write_ratio:
+                result = api.update_task(rng.choice(task_ids), status="done") if task_ids else True
+            else:
+                api.get_tasks(username)
+                result = True
+            if not result:
+                errors += 1
+        except Exception:
+            errors += 1
+        latencies.append((time.perf_counter() - began) * 1000)
+    results.put((len(latencies), errors, latencies))
+
+
+def run_clients(backend, path, port, clients, seconds, write_ratio):
+    ctx = multiprocessing.get_context("spawn")  # Fresh interpreters: no SQLite handles inherited across fork
+    start = ctx.Event()
+    results = ctx.Queue()
+    processes = [ctx.Process(target=_client, args=(backend, path, port, i, seconds, write_ratio, start, results))
+                 for i in range(clients)]
+    for process in processes:
+        process.start()
+    time.sleep(1.0)  # Let every client finish importing before the clock starts
+    began = time.perf_counter()
+    start.set()
+    outcomes = [results.get() for _ in processes]
+    elapsed = time.perf_counter() - began
+    for process in processes:
+        process.join()
+
+    ops = sum(count for count, errors, latencies in outcomes)
+    latencies = [ms for count, errors, client_latencies in outcomes for ms in client_latencies]
+    report = summarize(latencies) if latencies else {}
+    report.update({"ops": ops, "errors": sum(errors for count, errors, latencies in outcomes),
+                   "throughput": ops / elapsed})
+    return report
+
+
+def _wait_for_service(port, timeout=10):
+    import service_client
+    config.SERVICE_PORT = port
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            return service_client.call("init_db")
+        except service_client.ServiceError:
+            if time.perf_counter() > deadline:
+                raise
+            time.sleep(0.1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=40)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--write-ratio", type=float, default=0.7, help="fraction of calls that write")
+    parser.add_argument("--port", type=int, default=8766)
+    args = parser.parse_args()
+
+    print(f"{args.clients} clients for {args.seconds:.0f}s each, {args.write_ratio:.0%} writes\n")
+    print(f"{'backend':<10} {'ops/sec':>10} {'errors':>8} {'p50':>9} {'p95':>9} {'p99':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for backend in ("direct", "service"):
+            path = os.path.join(tmp, f"{backend}.db")
+            datagen.generate(path, users=args.clients, tasks_per_user=20, announcements=1000)
+
+            service = None
+            if backend == "service":
+                service = subprocess.Popen([sys.executable, "data_service.py", "--db", path, "--port", str(args.port)],
+                                           stdout=subprocess.DEVNULL)
+                _wait_for_service(args.port)
+            try:
+                report = run_clients(backend, path, args.port, args.clients, args.seconds, args.write_ratio)
+                if service is not None:
+                    import service_client
+                    stats = service_client.call("service_stats")
+            finally:
+                if service is not None:
+                    service.terminate()
+                    service.wait()
+
+            print(f"{backend:<10} {report['throughput']:>10,.0f} {report['errors']:>8} {report['p50_ms']:>7.2f}ms "
+                  f"{report['p95_ms']:>7.2f}ms {report['p99_ms']:>7.2f}ms")
+            if service is not None:
+                print(f"{'':<10} group commit: {stats['writes']} writes in {stats['batches']} commits "
+                      f"(mean {stats['mean_batch']:.1f} per commit)")
+
+
+if __name__ == "__main__":
+    main()
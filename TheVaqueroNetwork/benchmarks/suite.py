@@ -0,0 +1,237 @@
+"""
+Times every public database.py function against a synthetic database and saves the results as JSON.
+
+Run from the TheVaqueroNetwork directory:
+    python -m benchmarks.suite --users 500 --announcements 50000 --output before.json
+    python -m benchmarks.suite --users 500 --announcements 50000 --output after.json --compare before.json
+The database is generated in a temporary directory. With --db, a copy of that file is taken into the temporary
+directory first and the synthetic data is added to the copy, so the original is never written to.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+import config
+import database
+from benchmarks import datagen
+from db_connection import close_connection, transaction
+
+# Password hashing dominates these calls, so they get fewer iterations
+SLOW_CALLS = {"add_user", "validate_user"}
+SLOW_ITERATIONS = 10
+
+
+def summarize(timings_ms):
+    """
+    Returns latency percentiles and throughput for a list of per-call timings in milliseconds.
+    """
+    if len(timings_ms) > 1:
+        cuts = statistics.quantiles(timings_ms, n=100, method="inclusive")
+        p50, p95, p99 = cuts[49], cuts[94], cuts[98]
+    else:
+        p50 = p95 = p99 = timings_ms[0]
+    mean = statistics.fmean(timings_ms)
+    return {
+        "iterations": len(timings_ms),
+        "mean_ms": round(mean, 4),
+        "p50_ms": round(p50, 4),
+        "p95_ms": round(p95, 4),
+        "p99_ms": round(p99, 4),
+        "ops_per_sec": round(1000 / mean, 1) if mean else None,
+    }
+
+
+def measure(func, iterations, setup=None):
+    """
+    Calls func(i) `iterations` times and returns the per-call timings in milliseconds.
+    setup(i), if given, runs before each call and is not timed.
+    """
+    timings = []
+    for i in range(iterations):
+        if setup is not None:
+            setup(i)
+        start = time.perf_counter()
+        func(i)
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+
+def build_benchmarks(names, rng):
+    """
+    Returns an ordered list of (name, func, setup). Reads come first and writes last so the writes don't
+    skew the reads. Untimed setups give each write the same work every call: the delete benchmarks create the
+    rows they remove, archive_announcements gets the previous call's batch back, and incremental_vacuum gets
+    freshly freed pages.
+    """
+    created_task_ids = []
+    user = lambda: rng.choice(names)
+    uncached = lambda i: database.clear_cache()
+    search_words = rng.sample(datagen.VOCABULARY, 200)
+    to_delete = []  # Rows created (untimed) by the delete benchmarks' setup
+    latest_id = max((row[0] for row in database.get_announcements_page(1)), default=0)
+    # datagen posts span 2025-08-25 to late December 2025; this cutoff puts about the first half up for archiving
+    archive_days = (datetime.now() - datetime(2025, 10, 25)).days
+
+    def page_through(i):
+        cursor = None
+        for _ in range(4):  # First four pages, as a user scrolling the board would
+            page = database.get_announcements_page(25, before=cursor)
+            if not page:
+                break
+            cursor = (page[-1][4], page[-1][0])
+
+    def add_task(i):
+        created_task_ids.append(database.add_task(user(), f"Bench task {i}", "benchmark", "2025-10-01"))
+
+    def create_for_delete(count):
+        def setup(i):
+            to_delete[:] = [database.add_task(user(), f"Delete me {i}") for _ in range(count)]
+        return setup
+
+    def unarchive(i):
+        with transaction() as conn:
+            conn.execute("INSERT INTO announcements (id, username, title, content, timestamp) "
+                         "SELECT id, username, title, content, timestamp FROM announcements_archive")
+            conn.execute("DELETE FROM announcements_archive")
+
+    def free_pages(i):
+        # Grow the file by about VACUUM_STEP_PAGES pages and free them again, so each call has pages to return
+        with transaction() as conn:
+            conn.execute("CREATE TABLE bench_filler (data BLOB)")
+            conn.executemany("INSERT INTO bench_filler VALUES (zeroblob(3000))",
+                             (() for _ in range(config.VACUUM_STEP_PAGES)))
+            conn.execute("DROP TABLE bench_filler")
+
+    return [
+        ("validate_user", lambda i: database.validate_user(user(), datagen.BENCH_PASSWORD), None),
+        ("get_tasks", lambda i: database.get_tasks(user()), uncached),
+        ("get_tasks (cached)", lambda i: database.get_tasks(names[0]), None),
+        ("get_task", lambda i: database.get_task(rng.randrange(1, len(names) * 10)), None),
+        ("get_task_days (one month)", lambda i: database.get_task_days(user(), "2025-09-01", "2025-09-30"), uncached),
+        ("get_emergency_contacts", lambda i: database.get_emergency_contacts(user()), uncached),
+        ("get_announcements_page", lambda i: database.get_announcements_page(25), uncached),
+        ("get_announcements_page x4 (scroll)", page_through, uncached),
+        ("get_announcements_since (25 new)", lambda i: database.get_announcements_since(latest_id - 25), None),
+        ("get_announcements_page (include archived)",
+         lambda i: database.get_announcements_page(25, include_archived=True), uncached),
+        ("search_announcements", lambda i: database.search_announcements(rng.choice(search_words)), None),
+        ("search_tasks", lambda i: database.search_tasks(user(), rng.choice(search_words)), None),
+        ("add_user", lambda i: database.add_user(f"bench_user_{time.perf_counter_ns()}", "secret"), None),
+        ("add_task", add_task, None),
+        ("add_tasks_bulk (1000 rows)", lambda i: database.add_tasks_bulk(
+            [(user(), f"Bulk {i}-{n}", None, "2025-11-01") for n in range(1000)]), None),
+        ("update_task", lambda i: database.update_task(rng.choice(created_task_ids), status="done"), None),
+        ("update_task_status_many (10)", lambda i: database.update_task_status_many(
+            rng.sample(created_task_ids, min(10, len(created_task_ids))), "pending"), None),
+        ("add_emergency_contact", lambda i: database.add_emergency_contact(user(), "Bench", "956-000-0000"), None),
+        ("add_announcement", lambda i: database.add_announcement(user(), f"Bench {i}", "benchmark post"), None),
+        ("delete_task", lambda i: database.delete_task(to_delete[0]), create_for_delete(1)),
+        ("delete_tasks (10)", lambda i: database.delete_tasks(to_delete), create_for_delete(10)),
+        # The full-table read is uncached: it is the slowest call at scale
+        ("get_announcements (full table)", lambda i: database.get_announcements(), uncached),
+        # Retention steps, after everything that reads announcements: archiving changes which table rows are in
+        ("archive_announcements (one batch)",
+         lambda i: database.archive_announcements(older_than_days=archive_days, max_batches=1), unarchive),
+        ("incremental_vacuum", lambda i: database.incremental_vacuum(), free_pages),
+    ]
+
+
+def copy_database(source, destination):
+    """
+    Copies the database at `source` to `destination` with SQLite's backup API, so the copy is consistent
+    even if the app is using the file (a plain file copy could miss what is still in the WAL).
+    """
+    if not os.path.exists(source):
+        raise SystemExit(f"No database at {source}")
+    source_conn = sqlite3.connect(f"file:{os.path.abspath(source)}?mode=ro", uri=True)
+    target_conn = sqlite3.connect(destination)
+    try:
+        source_conn.backup(target_conn)
+    finally:
+        target_conn.close()
+        source_conn.close()
+
+
+def run(args):
+    rng = random.Random(args.seed)
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "bench.db")
+        if args.db:
+            copy_database(args.db, path)
+        scale = datagen.generate(path, args.users, args.tasks_per_user, args.announcements,
+                                 args.contacts_per_user, args.seed)
+        names = datagen.usernames(args.users)
+
+        for name, func, setup in build_benchmarks(names, rng):
+            if args.only and not any(part in name for part in args.only):
+                continue
+            iterations = min(args.iterations, SLOW_ITERATIONS) if name in SLOW_CALLS else args.iterations
+            if name.startswith("get_announcements (full"):
+                iterations = min(iterations, 20)
+            results[name] = summarize(measure(func, iterations, setup))
+            print(f"{name:<38} p50 {results[name]['p50_ms']:>9.3f} ms  p95 {results[name]['p95_ms']:>9.3f} ms  "
+                  f"p99 {results[name]['p99_ms']:>9.3f} ms  {results[name]['ops_per_sec']:>11,.1f} ops/sec")
+
+        close_connection()
+
+    return {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "scale": scale,
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "scrypt_n": config.SCRYPT_N,
+        },
+        "results": results,
+    }
+
+
+def compare(current, baseline_path):
+    """
+    Prints the change in p50 latency for every benchmark present in both runs.
+    """
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    if baseline["meta"].get("scale") != current["meta"]["scale"]:
+        print("Warning: the baseline was run at a different scale.")
+
+    print(f"\n{'benchmark':<38} {'p50 before':>11} {'p50 after':>11} {'change':>8}")
+    for name, after in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None:
+            continue
+        change = (after["p50_ms"] - before["p50_ms"]) / before["p50_ms"] * 100 if before["p50_ms"] else 0.0
+        print(f"{name:<38} {before['p50_ms']:>9.3f}ms {after['p50_ms']:>9.3f}ms {change:>+7.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    datagen.add_scale_arguments(parser)
+    parser.add_argument("--iterations", type=int, default=200, help="calls timed per benchmark")
+    parser.add_argument("--db", help="benchmark against a copy of this database file (the file itself is untouched)")
+    parser.add_argument("--only", nargs="+", help="run only benchmarks whose name contains one of these strings")
+    parser.add_argument("--output", help="write results as JSON to this file")
+    parser.add_argument("--compare", help="baseline JSON file to diff the results against")
+    args = parser.parse_args()
+
+    report = run(args)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,38 @@
 import tkinter as tk
 from tkinter import ttk
 from tkinter import messagebox as VaquerosMessager  # Used for showing messages
-from database import add_announcement, get_announcements  # Import database functions for announcements
+import config
+from change_feed import get_feed  # Notices posts made by other instances of the app
+from backend import add_announcement, get_announcements_page, get_announcements_since, search_announcements  # Import database functions for announcements
+from db_executor import run_async  # Runs database calls off the Tk main thread
+from failure_log import report_failure
+from instrumentation import instrument_callbacks
+from virtual_list import VirtualList
 
+# Number of announcements fetched per page while scrolling
+PAGE_SIZE = 25
 
+# How many rows from the end of the loaded list the view gets before the next page is fetched
+LOAD_MORE_ROWS = 10
+
+# Most new announcements fetched per live update; more are fetched in further batches
+LIVE_BATCH_SIZE = 100
+
+
+def format_announcement(announcement):
+    """
+    Formats an announcement tuple (id, username, title, content, timestamp) as the text of one list row.
+    """
+    ann_id, username, title, content, timestamp = announcement
+    return f"Title: {title}\nPosted by: {username} on {timestamp}\nContent: {content}"
+
+
+@instrument_callbacks("_post_announcement", "_refresh_list", "_display_announcements", "_append_page", "_show_*",
+                      "_on_*")
 class BulletinBoardPanel(ttk.Frame):
+    # Cache namespaces this panel displays; the dashboard calls refresh() on a revisit if they changed
+    data_namespaces = ("announcements",)
+
     def __init__(self, parent, username):
         """
         Initializes the BulletinBoardPanel.
@@ -45,22 +73,38 @@ class BulletinBoardPanel(ttk.Frame):
         # --- Display Announcements Section ---
         tk.Label(self, text="Recent Announcements:", font=("Inter", 14, "bold"), fg="#333333", bg="white").pack(pady=(20, 10), anchor="w", padx=20)
 
-        # Text widget to display announcements, with scrollbar
-        self.announcements_text_widget = tk.Text(
-            self,
-            font=("Inter", 12),
-            bg="#f8f8f8",
-            fg="#333333",
-            relief="flat",
-            borderwidth=1,
-            height=15,
-            wrap="word"
-        )
-        self.announcements_text_widget.pack(fill="both", expand=True, padx=20, pady=10)
-
-        scrollbar = ttk.Scrollbar(self.announcements_text_widget, command=self.announcements_text_widget.yview)
-        self.announcements_text_widget.config(yscrollcommand=scrollbar.set)
-        scrollbar.pack(side="right", fill="y")
+        # Search-as-you-type box (debounced, see _on_search_changed)
+        search_frame = ttk.Frame(self)
+        search_frame.pack(fill="x", padx=20)
+        ttk.Label(search_frame, text="Search:").pack(side="left")
+        self.search_var = tk.StringVar()
+        ttk.Entry(search_frame, textvariable=self.search_var, width=40).pack(side="left", fill="x", expand=True, padx=(5, 0))
+        self.search_var.trace_add("write", self._on_search_changed)
+        self._search_after_id = None
+
+        # Announcements past the retention period live in the archive table; list and search them only on request
+        self.include_archived_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(search_frame, text="Include archived", variable=self.include_archived_var,
+                        command=self._refresh_list).pack(side="left", padx=(10, 0))
+
+        # Virtualized list of announcements: only the rows in view are drawn, and scrolling near the end
+        # of the loaded rows requests the next page
+        self.announcements_list = VirtualList(self, formatter=format_announcement, height=300,
+                                              on_near_end=self._on_near_end, near_end_rows=LOAD_MORE_ROWS)
+        self.announcements_list.pack(fill="both", expand=True, padx=20, pady=10)
+
+        # Keyset pagination state: (timestamp, id) of the last row shown, and whether older rows remain
+        self._page_cursor = None
+        self._has_more = True
+        self._load_pending = False
+        self._generation = 0  # Bumped on every full reload so late pages from an older listing are ignored
+
+        # Live updates: when the change feed reports a commit, only announcements newer than _newest_id are fetched
+        self._newest_id = None  # Highest announcement id shown; None until the first page arrives
+        self._live_pending = False
+        self._live_dirty = False  # A change came in while a fetch or the first page was loading; fetch again after it
+        get_feed(self).subscribe(self._on_database_changed)
+        self.bind("<Destroy>", self._on_destroy)
 
         # Load and display announcements when the panel is initialized
         self._display_announcements()
@@ -68,38 +112,180 @@ class BulletinBoardPanel(ttk.Frame):
     def _post_announcement(self):
         """
         Handles posting a new announcement.
-        Saves the announcement to the database and refreshes the displayed list.
+        Saves the announcement to the database on the worker thread, then adds it to the top of the displayed list.
         """
         title = self.announcement_title_entry.get().strip()
         content = self.announcement_content_text.get("1.0", tk.END).strip()
 
         if title and content:
-            if add_announcement(self.username, title, content):
-                VaquerosMessager.showinfo("Announcement Posted", "Your announcement has been posted!")
-                self.announcement_title_entry.delete(0, tk.END)  # Clear title field
-                self.announcement_content_text.delete("1.0", tk.END)  # Clear content field
-                self._display_announcements()  # Refresh the displayed list
-            else:
-                VaquerosMessager.showerror("Error", "Failed to post announcement to database.")
+            run_async(self, add_announcement, self.username, title, content,
+                      on_success=self._on_announcement_posted, on_error=self._on_db_error)
         else:
             VaquerosMessager.showwarning("Input Error", "Please enter both a title and content for the announcement.")
 
+    def _on_announcement_posted(self, announcement):
+        """
+        Handles the result of add_announcement once the worker thread has finished.
+        The new row is added at the top of the loaded list by a live update instead of reloading it; the
+        pagination cursor points at the oldest loaded row, so it is unaffected.
+        """
+        if announcement:
+            VaquerosMessager.showinfo("Announcement Posted", "Your announcement has been posted!")
+            self.announcement_title_entry.delete(0, tk.END)  # Clear title field
+            self.announcement_content_text.delete("1.0", tk.END)  # Clear content field
+            if self.search_var.get().strip():
+                self._refresh_list()  # The new post may or may not match the search, so rerun it
+            else:
+                # Fetch everything newer than the newest row shown rather than inserting just this post: posts
+                # from other instances with lower ids may not have been fetched yet, and would be skipped for good
+                self._on_database_changed()
+        else:
+            VaquerosMessager.showerror("Error", "Failed to post announcement to database.")
+
+    def _on_db_error(self, error):
+        self._load_pending = False
+        VaquerosMessager.showerror("Error", f"Database error: {error}")
+
     def _display_announcements(self):
         """
-        Retrieves announcements from the database and displays them in the UI.
+        Clears the list and requests the first page of announcements, showing a loading state until it arrives.
+        Older announcements are loaded page by page as the user scrolls down.
         """
-        self.announcements_text_widget.config(state="normal")  # Enable editing to clear/insert
-        self.announcements_text_widget.delete(1.0, tk.END)  # Clear existing content
+        self.announcements_list.show_message("Loading announcements...")
 
-        announcements = get_announcements()  # Fetch all announcements
+        self._generation += 1
+        self._page_cursor = None
+        self._has_more = True
+        self._newest_id = None  # Live updates wait for the first page
+        self._request_next_page()
 
-        if announcements:
-            for ann_id, username, title, content, timestamp in announcements:
-                self.announcements_text_widget.insert(tk.END, f"Title: {title}\n")
-                self.announcements_text_widget.insert(tk.END, f"Posted by: {username} on {timestamp}\n")
-                self.announcements_text_widget.insert(tk.END, f"Content: {content}\n")
-                self.announcements_text_widget.insert(tk.END, "-" * 50 + "\n\n")  # Separator
+    def _request_next_page(self):
+        """
+        Fetches the next page of announcements on the worker thread.
+        """
+        self._load_pending = True
+        generation = self._generation
+        run_async(self, get_announcements_page, PAGE_SIZE, before=self._page_cursor,
+                  include_archived=self.include_archived_var.get(),
+                  on_success=lambda page: self._append_page(generation, page), on_error=self._on_db_error)
+
+    def _append_page(self, generation, announcements):
+        """
+        Appends a fetched page of announcements to the end of the list.
+        """
+        if generation != self._generation:
+            return  # A newer reload has started since this page was requested
+        self._load_pending = False
+        self._has_more = len(announcements) == PAGE_SIZE
+
+        if self._page_cursor is None:
+            self.announcements_list.set_rows(announcements, empty_text="No announcements posted yet.")
+            self._newest_id = max((row[0] for row in announcements), default=0)
+            if self._live_dirty and not self._live_pending:
+                self._on_database_changed()  # Something was committed while the first page loaded
         else:
-            self.announcements_text_widget.insert(tk.END, "No announcements posted yet.")
+            self.announcements_list.append_rows(announcements)
+
+        if announcements:
+            last_id, _, _, _, last_timestamp = announcements[-1]
+            self._page_cursor = (last_timestamp, last_id)
+
+    def _on_database_changed(self):
+        """
+        Called by the change feed after any commit to the database. Fetches only announcements newer than
+        the newest one shown, so a change elsewhere (e.g. a task edit) costs a single indexed lookup.
+        """
+        if self._live_pending or self._newest_id is None:
+            self._live_dirty = True  # The running fetch or first page may have been read before this commit
+            return
+        if self.search_var.get().strip():
+            return  # Search results are shown
+        self._live_pending = True
+        self._live_dirty = False
+        generation = self._generation
+        run_async(self, get_announcements_since, self._newest_id, LIVE_BATCH_SIZE,
+                  on_success=lambda rows: self._on_live_rows(generation, rows), on_error=self._on_live_error)
+
+    def _on_live_rows(self, generation, rows):
+        self._live_pending = False
+        if generation != self._generation:
+            # The list was reloaded meanwhile, so these rows are stale; fetch again if another commit came in
+            if self._live_dirty:
+                self._on_database_changed()
+            return
+        self._show_new_announcements(rows)
+        if len(rows) == LIVE_BATCH_SIZE or self._live_dirty:
+            self._on_database_changed()  # More arrived than one batch, or another commit landed meanwhile
+
+    def _on_live_error(self, error):
+        self._live_pending = False
+        report_failure("get_announcements_since", error, after_id=self._newest_id)
+        if self._live_dirty:
+            self._on_database_changed()
+
+    def _show_new_announcements(self, announcements):
+        """
+        Inserts announcements (oldest first) at the top of the list, skipping any already shown (e.g. rows a
+        reload's first page already included).
+        """
+        for announcement in announcements:
+            if self._newest_id is not None and announcement[0] <= self._newest_id:
+                continue
+            self.announcements_list.insert_row(0, announcement)
+            self._newest_id = announcement[0]
+
+    def _on_destroy(self, event):
+        if event.widget is self:
+            get_feed(self).unsubscribe(self._on_database_changed)
+
+    def _on_search_changed(self, *args):
+        """
+        Called on every edit of the search box. Restarts the debounce timer so the query only runs
+        once the user pauses typing.
+        """
+        if self._search_after_id is not None:
+            self.after_cancel(self._search_after_id)
+        self._search_after_id = self.after(config.SEARCH_DEBOUNCE_MS, self._refresh_list)
 
-        self.announcements_text_widget.config(state="disabled")  # Disable editing after displaying
+    def refresh(self):
+        """
+        Reloads the first page (or reruns the current search) after announcements changed elsewhere.
+        """
+        self._refresh_list()
+
+    def _refresh_list(self):
+        """
+        Shows search results when the search box has text, otherwise the normal paginated list.
+        """
+        self._search_after_id = None
+        text = self.search_var.get().strip()
+        if not text:
+            self._display_announcements()
+            return
+
+        # Searching replaces the paginated listing, so stop scroll loading and ignore any page in flight
+        self._generation += 1
+        self._has_more = False
+        self._load_pending = False
+        if len(text) < config.SEARCH_MIN_CHARS:
+            self.announcements_list.show_message(f"Type at least {config.SEARCH_MIN_CHARS} characters to search.")
+            return
+        generation = self._generation
+        run_async(self, search_announcements, text, include_archived=self.include_archived_var.get(),
+                  on_success=lambda results: self._show_search_results(generation, results),
+                  on_error=self._on_db_error)
+
+    def _show_search_results(self, generation, results):
+        """
+        Displays ranked search results in place of the paginated list.
+        """
+        if generation != self._generation:
+            return  # The user kept typing; a newer search or reload has started
+        self.announcements_list.set_rows(results, empty_text="No announcements match your search.")
+
+    def _on_near_end(self):
+        """
+        Called by the list when the view nears the last loaded row; requests the next page if there is one.
+        """
+        if self._has_more and not self._load_pending:
+            self._request_next_page()
@@ -0,0 +1,104 @@
+import functools
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    A thread-safe, bounded, least-recently-used cache for query results.
+
+    Entries belong to an invalidation group such as ("tasks", "jdoe") or ("announcements",).
+    invalidate("tasks", "jdoe") drops one user's task queries; invalidate("tasks") drops them for every user.
+    If is_stale is given, it is called before each lookup and the whole cache is cleared when it returns True
+    (used to notice writes made by other processes).
+    """
+
+    def __init__(self, max_entries=256, is_stale=None):
+        self.max_entries = max_entries
+        self.is_stale = is_stale
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # (group, call_key) -> value, least recently used first
+        self._generation = 0  # Bumped on every invalidation so in-flight loads don't store stale results
+        self._versions = {}  # Namespace -> generation of its last invalidation, see version()
+        self._lock = threading.Lock()
+
+    def get_or_load(self, group, call_key, loader):
+        """
+        Returns the cached value for (group, call_key), calling loader() and caching its result on a miss.
+        """
+        key = (group, call_key)
+        if self.is_stale is not None and self.is_stale():
+            self.invalidate()
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key]
+            self.misses += 1
+            generation = self._generation
+
+        value = loader()  # Run the query outside the lock so other threads aren't held up
+
+        with self._lock:
+            if generation == self._generation:  # Skip storing if a write invalidated the cache meanwhile
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return value
+
+    def invalidate(self, *group_prefix):
+        """
+        Drops every entry whose group starts with group_prefix. With no arguments, drops everything.
+        """
+        size = len(group_prefix)
+        with self._lock:
+            self._generation += 1
+            self._versions[group_prefix[0] if group_prefix else None] = self._generation  # None: everything
+            for key in [key for key in self._entries if key[0][:size] == group_prefix]:
+                del self._entries[key]
+
+    def clear(self):
+        self.invalidate()
+
+    def version(self, *namespaces):
+        """
+        Returns a number that changes whenever any of the given namespaces (e.g. "tasks") is invalidated,
+        including by a full clear. Callers compare it with an earlier value to tell if their data is stale.
+        """
+        with self._lock:
+            full_clear = self._versions.get(None, 0)
+            return max([full_clear] + [self._versions.get(namespace, 0) for namespace in namespaces])
+
+    def stats(self):
+        """
+        Returns hit/miss counters and the current size as a dict.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+
+    def cached(self, namespace, per_user=False):
+        """
+        Decorator caching a read function's result. The function's arguments form the cache key.
+        With per_user=True the first argument (the username) scopes the invalidation group.
+        Results are stored as tuples and handed out as fresh lists, so callers can't corrupt the cache.
+        """
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                group = (namespace, args[0]) if per_user else (namespace,)
+                call_key = (func.__name__, args, tuple(sorted(kwargs.items())))
+                return list(self.get_or_load(group, call_key, lambda: tuple(func(*args, **kwargs))))
+            return wrapper
+        return decorator
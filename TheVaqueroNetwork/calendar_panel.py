@@ -1,10 +1,56 @@
 import tkinter as tk
 from tkinter import ttk
-from datetime import datetime, timedelta  # Import timedelta for date calculations
+from datetime import date, datetime, timedelta  # Import timedelta for date calculations
+from functools import lru_cache
 import calendar
+from backend import get_task_days
+from db_executor import run_async  # Runs database calls off the Tk main thread
+from failure_log import report_failure
+from instrumentation import instrument_callbacks
+from theme import apply_theme
 
+WEEKDAYS = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
 
+# The grid always has six week rows, enough for any month
+WEEKS = 6
+
+# Months of task badges kept by the panel (the current month and its neighbours are prefetched)
+MONTH_CACHE_SIZE = 24
+
+_calendar = calendar.Calendar(firstweekday=calendar.MONDAY)
+
+
+@lru_cache(maxsize=240)  # Twenty years of months
+def month_layout(year, month):
+    """
+    Returns the month as six weeks of seven day numbers (0 for days outside the month), as a tuple of tuples.
+    """
+    weeks = [tuple(week) for week in _calendar.monthdayscalendar(year, month)]
+    weeks += [(0,) * 7] * (WEEKS - len(weeks))
+    return tuple(weeks)
+
+
+def _shift_month(year, month, months):
+    index = year * 12 + (month - 1) + months
+    return index // 12, index % 12 + 1
+
+
+def format_day(day, tasks=None):
+    """
+    Returns the text of a day cell: the day number, plus a task count badge and the first title if the day has tasks.
+    """
+    if not tasks:
+        return str(day)
+    count, titles = tasks
+    first = titles[0] if len(titles[0]) <= 14 else titles[0][:13] + "…"
+    return f"{day}\n● {count} task{'s' if count != 1 else ''}\n{first}"
+
+
+@instrument_callbacks("_display_calendar", "_update_grid", "_prev_month", "_next_month", "_shift_year", "_on_*")
 class CalendarPanel(ttk.Frame):
+    # Cache namespaces this panel displays; the dashboard calls refresh() on a revisit if they changed
+    data_namespaces = ("tasks",)
+
     def __init__(self, parent, username):
         """
         Initializes the CalendarPanel with a modern, grid-based calendar.
@@ -14,7 +60,7 @@ class CalendarPanel(ttk.Frame):
         self.pack(fill="both", expand=True)
 
         self.current_date = datetime.now()  # Store current date for navigation
-        self._setup_styles()  # Setup custom styles for calendar elements
+        apply_theme(self)  # Calendar styles live in theme.py; this is a no-op once the app is themed
 
         # --- Panel Title ---
         tk.Label(self, text="Event Calendar", font=("Inter", 16, "bold"), fg="#0056b3", bg="white").pack(pady=20)
@@ -33,84 +79,147 @@ class CalendarPanel(ttk.Frame):
         # --- Calendar Grid Frame ---
         self.calendar_frame = ttk.Frame(self, style='Calendar.TFrame')
         self.calendar_frame.pack(pady=10, padx=20, fill="both", expand=True)
-
+        self._build_grid()
+
+        # Left/Right flip months and Page Up/Down flip years; holding a key scrolls through them
+        self.configure(takefocus=True)
+        self.bind("<Left>", lambda event: self._prev_month())
+        self.bind("<Right>", lambda event: self._next_month())
+        self.bind("<Prior>", lambda event: self._shift_year(-1))
+        self.bind("<Next>", lambda event: self._shift_year(1))
+        self.bind("<Map>", lambda event: self.focus_set())  # Take keyboard focus whenever the panel is shown
+        self.bind("<Button-1>", lambda event: self.focus_set())
+
+        # Task badges by month: (year, month) -> {day: (count, titles)}, filled by one range query per fetch
+        self._month_tasks = {}
+        self._fetching = set()  # Months with a query in flight
+        self._generation = 0  # Bumped by refresh() so results fetched before it are dropped
+
+        self._display_pending = False
         self._display_calendar()  # Initial display of the calendar
 
-    def _setup_styles(self):
-        """
-        Configures custom ttk styles for calendar elements.
-        """
-        style = ttk.Style(self)
-        style.configure('Calendar.TFrame', background='white')
-        style.configure('Calendar.TLabel', background='white', foreground='#333333', font=('Inter', 12))
-        style.configure('Calendar.Weekday.TLabel', background='#f0f0f0', foreground='#0056b3',
-                        font=('Inter', 12, 'bold'), borderwidth=1,
-                        relief='solid')  # UTRGV Blue for weekdays, added border
-        style.configure('Calendar.Day.TLabel', background='white', foreground='#333333', font=('Inter', 12),
-                        borderwidth=1, relief='solid')  # Added border
-        style.configure('Calendar.Today.TLabel', background='#F26722', foreground='white', font=('Inter', 12, 'bold'),
-                        borderwidth=1, relief='solid')  # UTRGV Orange for today, added border
-        style.configure('Calendar.OtherMonth.TLabel', background='white', foreground='#aaaaaa',
-                        font=('Inter', 12, 'italic'), borderwidth=1,
-                        relief='solid')  # Faded for other months, added border
-        style.configure('Calendar.Nav.TButton',
-                        font=('Inter', 10),  # Reduced font size from bold 10 to regular 10
-                        foreground='white',
-                        background='#0056b3',  # UTRGV Blue
-                        padding=[5, 2],  # Reduced vertical padding to 5, horizontal to 2
-                        relief='flat',
-                        borderwidth=0
-                        )
-        style.map('Calendar.Nav.TButton',
-                  background=[('active', '#003d80')],
-                  foreground=[('active', 'white')]
-                  )
-
-    def _clear_calendar_grid(self):
-        """
-        Clears all widgets from the calendar grid frame.
-        """
-        for widget in self.calendar_frame.winfo_children():
-            widget.destroy()
+    def _build_grid(self):
+        """
+        Creates the weekday headers and the 6x7 grid of day labels once. Navigation only reconfigures
+        the existing labels (see _display_calendar), so flipping months allocates no widgets.
+        """
+        for col, day_name in enumerate(WEEKDAYS):
+            ttk.Label(self.calendar_frame, text=day_name, style='Calendar.Weekday.TLabel', anchor="center").grid(
+                row=0, column=col, padx=2, pady=2, sticky="nsew")
+            self.calendar_frame.grid_columnconfigure(col, weight=1)  # Make columns expand
+
+        self.day_labels = []  # day_labels[week][weekday]
+        for week_index in range(WEEKS):
+            row = []
+            for day_index in range(7):
+                day_label = ttk.Label(self.calendar_frame, text="", style='Calendar.OtherMonth.TLabel', anchor="center")
+                day_label.grid(row=1 + week_index, column=day_index, padx=2, pady=2, sticky="nsew")
+                row.append(day_label)
+            self.day_labels.append(row)
+            self.calendar_frame.grid_rowconfigure(1 + week_index, weight=1)  # Make rows expand
+
+        # Shown under the weeks when the month's tasks couldn't be loaded; hidden again once they are
+        self.error_label = ttk.Label(self.calendar_frame, text="", style='Calendar.TLabel', foreground="#b00020",
+                                     anchor="center")
+        self.error_label.grid(row=1 + WEEKS, column=0, columnspan=7, pady=(5, 0), sticky="ew")
+        self.error_label.grid_remove()
 
     def _display_calendar(self):
         """
-        Generates and displays the calendar grid for the current month.
+        Updates the existing grid to show the current month. Repeated calls before Tk is idle (e.g. while
+        an arrow key is held down) are coalesced into one update.
         """
-        self._clear_calendar_grid()
+        if not self._display_pending:
+            self._display_pending = True
+            self.after_idle(self._update_grid)
+
+    def _update_grid(self):
+        self._display_pending = False
+        year, month = self.current_date.year, self.current_date.month
 
         # Update month/year label
         self.month_year_label.config(text=self.current_date.strftime("%B %Y"))
 
-        # Get calendar data for the current month
-        cal_data = calendar.Calendar(firstweekday=calendar.MONDAY).monthdayscalendar(self.current_date.year,
-                                                                                     self.current_date.month)
-
-        # Weekday headers
-        weekdays = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
-        for col, day_name in enumerate(weekdays):
-            ttk.Label(self.calendar_frame, text=day_name, style='Calendar.Weekday.TLabel', anchor="center").grid(row=0,
-                                                                                                                 column=col,
-                                                                                                                 padx=2,
-                                                                                                                 pady=2,
-                                                                                                                 sticky="nsew")
-            self.calendar_frame.grid_columnconfigure(col, weight=1)  # Make columns expand
-
-        # Days of the month
-        row_offset = 1
-        for week_index, week in enumerate(cal_data):
-            for day_index, day in enumerate(week):
-                day_label_text = str(day) if day != 0 else ""
-
-                style_name = 'Calendar.Day.TLabel'
+        today = date.today()
+        today_day = today.day if (today.year, today.month) == (year, month) else None
+        tasks_by_day = self._month_tasks.get((year, month), {})
+        if (year, month) in self._month_tasks:
+            self.error_label.grid_remove()  # An error shown for another month doesn't apply here
+        for week, labels in zip(month_layout(year, month), self.day_labels):
+            for day, day_label in zip(week, labels):
+                tasks = tasks_by_day.get(day)
                 if day == 0:  # Days from previous/next month
                     style_name = 'Calendar.OtherMonth.TLabel'
-                elif day == self.current_date.day and self.current_date.month == datetime.now().month and self.current_date.year == datetime.now().year:
+                elif day == today_day:
                     style_name = 'Calendar.Today.TLabel'  # Highlight today's date
+                elif tasks:
+                    style_name = 'Calendar.Busy.TLabel'
+                else:
+                    style_name = 'Calendar.Day.TLabel'
+                day_label.configure(text=format_day(day, tasks) if day else "", style=style_name)
 
-                day_label = ttk.Label(self.calendar_frame, text=day_label_text, style=style_name, anchor="center")
-                day_label.grid(row=row_offset + week_index, column=day_index, padx=2, pady=2, sticky="nsew")
-                self.calendar_frame.grid_rowconfigure(row_offset + week_index, weight=1)  # Make rows expand
+        self._load_months(year, month)
+
+    def _load_months(self, year, month):
+        """
+        Fetches task badges for the month on screen and the months either side of it, so flipping to a
+        neighbour doesn't wait on the database. Months already cached or in flight are skipped; the rest
+        are fetched with a single date range query on the worker thread.
+        """
+        wanted = [_shift_month(year, month, offset) for offset in (0, -1, 1)]
+        missing = sorted(m for m in wanted if m not in self._month_tasks and m not in self._fetching)
+        if not missing:
+            return
+        self._fetching.update(missing)
+        first_year, first_month = missing[0]
+        last_year, last_month = missing[-1]
+        start = date(first_year, first_month, 1).isoformat()
+        end = date(last_year, last_month, calendar.monthrange(last_year, last_month)[1]).isoformat()
+        generation = self._generation
+        run_async(self, get_task_days, self.username, start, end,
+                  on_success=lambda rows: self._on_task_days(generation, missing, rows),
+                  on_error=lambda error: self._on_task_days_error(generation, missing, error))
+
+    def _on_task_days(self, generation, months, rows):
+        """
+        Stores fetched task badges by month and redraws if the month on screen was among them.
+        """
+        if generation != self._generation:
+            return  # refresh() ran while this was in flight
+        for month_key in months:
+            self._fetching.discard(month_key)
+            self._month_tasks[month_key] = {}
+        for due_date, count, titles in rows:
+            try:
+                year, month, day = (int(part) for part in due_date.split("-"))
+            except ValueError:
+                continue  # Skip due dates that were not entered as YYYY-MM-DD
+            if (year, month) in self._month_tasks:
+                self._month_tasks[(year, month)][day] = (count, titles)
+        while len(self._month_tasks) > MONTH_CACHE_SIZE:
+            del self._month_tasks[next(iter(self._month_tasks))]  # Drop the month fetched longest ago
+
+        if (self.current_date.year, self.current_date.month) in months:
+            self._display_calendar()
+
+    def _on_task_days_error(self, generation, months, error):
+        report_failure("get_task_days", error, username=self.username)
+        if generation != self._generation:
+            return
+        self._fetching.difference_update(months)  # Let the next navigation retry them
+        if (self.current_date.year, self.current_date.month) in months:
+            self.error_label.configure(text=f"Couldn't load tasks for this month ({error}). "
+                                            "Change months or reopen the calendar to try again.")
+            self.error_label.grid()
+
+    def refresh(self):
+        """
+        Drops the cached task badges and refetches them after tasks changed elsewhere.
+        """
+        self._generation += 1
+        self._month_tasks.clear()
+        self._fetching.clear()
+        self._display_calendar()
 
     def _prev_month(self):
         """
@@ -131,3 +240,10 @@ class CalendarPanel(ttk.Frame):
         else:
             self.current_date = self.current_date.replace(month=self.current_date.month + 1)
         self._display_calendar()
+
+    def _shift_year(self, years):
+        """
+        Navigates `years` years forward (or back, if negative).
+        """
+        self.current_date = self.current_date.replace(year=self.current_date.year + years, day=1)
+        self._display_calendar()
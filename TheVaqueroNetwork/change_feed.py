@@ -0,0 +1,104 @@
+import threading
+
+import config
+from backend import commit_version
+from db_connection import close_connection
+from failure_log import report_failure
+
+
+class ChangeFeed:
+    """
+    Notices commits made by other connections (other app instances sharing the database file, or this app's
+    worker thread) and notifies subscribers on the Tk thread.
+
+    A daemon thread reads commit_version() (PRAGMA data_version) every `interval_ms`, through backend, so with
+    the data service it watches the file the service serves. That read touches only the WAL index, so an idle
+    instance does almost no I/O, but it can still wait on the disk or (with the data service) the network, so
+    it never runs on the Tk thread. An after() timer on the Tk thread picks up the latest version the thread
+    has read; subscribers run, and fetch only what is new to them, when it actually changes. The thread and
+    the timer only run while there are subscribers.
+    """
+
+    def __init__(self, root, interval_ms=None):
+        self.root = root
+        self.interval_ms = interval_ms if interval_ms is not None else config.CHANGE_POLL_MS
+        self._subscribers = []
+        self._version = None
+        self._after_id = None
+        self._stop = None  # threading.Event of the running poll thread, if any
+
+        # Written by the poll thread, read by _check on the Tk thread
+        self._latest = None
+        self._failing = False  # Only the first of a run of failed reads is reported, not one every interval
+
+    def subscribe(self, callback):
+        """
+        Calls callback() on the Tk thread after each detected change, until unsubscribe(callback).
+        """
+        self._subscribers.append(callback)
+        if self._after_id is None:
+            self._start()
+
+    def unsubscribe(self, callback):
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+        if not self._subscribers and self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+            self._stop.set()
+            self._stop = None
+
+    def _start(self):
+        # The first version the new thread reads becomes the baseline; later ones are compared with it
+        self._version = self._latest = None
+        self._stop = threading.Event()
+        threading.Thread(target=self._poll, args=(self._stop,), name="vaquero-change-feed", daemon=True).start()
+        self._after_id = self.root.after(self.interval_ms, self._check)
+
+    def _poll(self, stop):
+        try:
+            while not stop.is_set():
+                version = self._read_version()
+                if not stop.is_set() and version is not None:
+                    self._latest = version
+                stop.wait(self.interval_ms / 1000)
+        finally:
+            close_connection()
+
+    def _check(self):
+        self._after_id = None
+        version = self._latest
+        if version is not None and self._version is None:
+            self._version = version
+        elif version is not None and version != self._version:
+            self._version = version
+            for callback in list(self._subscribers):
+                callback()
+        if self._subscribers and self._after_id is None:
+            self._after_id = self.root.after(self.interval_ms, self._check)
+
+    def _read_version(self):
+        """
+        Returns commit_version(), or None if it can't be read (reported through failure_log). Runs on the poll
+        thread.
+        """
+        try:
+            version = commit_version()
+        except Exception as e:
+            if not self._failing:
+                report_failure("change_feed", e)
+            self._failing = True
+            return None
+        self._failing = False
+        return version
+
+
+def get_feed(widget):
+    """
+    Returns the change feed shared by every widget under the same Tk root, creating it on first use.
+    """
+    root = widget.nametowidget(".")
+    feed = getattr(root, "_vaquero_change_feed", None)
+    if feed is None:
+        feed = root._vaquero_change_feed = ChangeFeed(root)
+    return feed
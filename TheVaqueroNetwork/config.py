@@ -0,0 +1,89 @@
+import os
+
+# Application settings. Each one can be overridden with the environment variable named next to it.
+
+# scrypt work factor for password hashing (VAQUERO_SCRYPT_N). Must be a power of two;
+# every doubling doubles login time and memory. Existing hashes are upgraded on the next login.
+SCRYPT_N = int(os.environ.get("VAQUERO_SCRYPT_N", 2 ** 14))
+SCRYPT_R = 8
+SCRYPT_P = 1
+
+# Maximum number of query results kept in the in-process read cache (VAQUERO_CACHE_SIZE)
+CACHE_MAX_ENTRIES = int(os.environ.get("VAQUERO_CACHE_SIZE", 256))
+
+# Delay (ms) after the last keystroke before a search-as-you-type query runs (VAQUERO_SEARCH_DEBOUNCE_MS)
+SEARCH_DEBOUNCE_MS = int(os.environ.get("VAQUERO_SEARCH_DEBOUNCE_MS", 250))
+
+# Search boxes wait for this many characters before querying: shorter words can only match whole words (see
+# database._fts_query), so the first keystrokes would show misleadingly empty results
+SEARCH_MIN_CHARS = 3
+
+# Dashboard panels kept alive (hidden) after being visited; the least recently shown is destroyed
+# beyond this (VAQUERO_MAX_PANELS)
+MAX_RESIDENT_PANELS = int(os.environ.get("VAQUERO_MAX_PANELS", 4))
+
+# How often (ms) open panels check the database for changes made by other app instances (VAQUERO_CHANGE_POLL_MS).
+# Each check is a single PRAGMA data_version read; rows are only fetched when it reports a change.
+CHANGE_POLL_MS = int(os.environ.get("VAQUERO_CHANGE_POLL_MS", 500))
+
+# Where the panels send database calls (VAQUERO_BACKEND): "direct" uses the SQLite file in-process,
+# "service" goes through the local data service (python data_service.py), which group-commits writes
+BACKEND = os.environ.get("VAQUERO_BACKEND", "direct")
+
+# Local data service address (VAQUERO_SERVICE_HOST, VAQUERO_SERVICE_PORT) and client timeout in seconds
+SERVICE_HOST = os.environ.get("VAQUERO_SERVICE_HOST", "127.0.0.1")
+SERVICE_PORT = int(os.environ.get("VAQUERO_SERVICE_PORT", 8765))
+SERVICE_TIMEOUT_SECONDS = float(os.environ.get("VAQUERO_SERVICE_TIMEOUT", 10))
+
+# Group commit: the service commits up to SERVICE_MAX_BATCH queued writes at once (VAQUERO_SERVICE_MAX_BATCH).
+# By default it takes whatever queued up during the previous commit; SERVICE_BATCH_WAIT_MS > 0 also waits
+# that long for more after the first write, trading latency for bigger groups (VAQUERO_SERVICE_BATCH_WAIT_MS)
+SERVICE_MAX_BATCH = int(os.environ.get("VAQUERO_SERVICE_MAX_BATCH", 64))
+SERVICE_BATCH_WAIT_MS = float(os.environ.get("VAQUERO_SERVICE_BATCH_WAIT_MS", 0))
+
+# How long (ms) a connection waits for another process's write lock before giving up (VAQUERO_BUSY_TIMEOUT_MS)
+BUSY_TIMEOUT_MS = int(os.environ.get("VAQUERO_BUSY_TIMEOUT_MS", 2000))
+
+# After a busy timeout, a write is retried up to WRITE_RETRIES times with jittered exponential backoff
+# between RETRY_BASE_DELAY_MS and RETRY_MAX_DELAY_MS (VAQUERO_WRITE_RETRIES, VAQUERO_RETRY_BASE_DELAY_MS,
+# VAQUERO_RETRY_MAX_DELAY_MS)
+WRITE_RETRIES = int(os.environ.get("VAQUERO_WRITE_RETRIES", 3))
+RETRY_BASE_DELAY_MS = float(os.environ.get("VAQUERO_RETRY_BASE_DELAY_MS", 20))
+RETRY_MAX_DELAY_MS = float(os.environ.get("VAQUERO_RETRY_MAX_DELAY_MS", 1000))
+
+# Number of recent database failures kept in memory for diagnostics (VAQUERO_FAILURE_LOG_SIZE)
+FAILURE_LOG_SIZE = int(os.environ.get("VAQUERO_FAILURE_LOG_SIZE", 200))
+
+# Announcements older than this many days are moved to the archive table (VAQUERO_RETENTION_DAYS). Off (0) by
+# default, because archived posts only show on the bulletin board with its "Include archived" option
+ANNOUNCEMENT_RETENTION_DAYS = int(os.environ.get("VAQUERO_RETENTION_DAYS", 0))
+
+# Retention runs in small steps while the app is idle: ARCHIVE_BATCH_SIZE posts moved per transaction, then
+# VACUUM_STEP_PAGES free pages returned to the file system per PRAGMA incremental_vacuum (VAQUERO_ARCHIVE_BATCH,
+# VAQUERO_VACUUM_STEP_PAGES). A step only starts after MAINTENANCE_IDLE_MS without keyboard or mouse input,
+# and the whole pass repeats every MAINTENANCE_INTERVAL_MINUTES (VAQUERO_MAINTENANCE_IDLE_MS,
+# VAQUERO_MAINTENANCE_INTERVAL_MINUTES)
+ARCHIVE_BATCH_SIZE = int(os.environ.get("VAQUERO_ARCHIVE_BATCH", 500))
+VACUUM_STEP_PAGES = int(os.environ.get("VAQUERO_VACUUM_STEP_PAGES", 256))
+MAINTENANCE_IDLE_MS = int(os.environ.get("VAQUERO_MAINTENANCE_IDLE_MS", 3000))
+MAINTENANCE_INTERVAL_MINUTES = float(os.environ.get("VAQUERO_MAINTENANCE_INTERVAL_MINUTES", 360))
+
+# Record latency histograms for every database function and the panels' Tk callbacks (VAQUERO_INSTRUMENT=1,
+# or python SLAMain.py --instrument). Off by default; when off the functions are not wrapped at all
+INSTRUMENT = os.environ.get("VAQUERO_INSTRUMENT", "") not in ("", "0")
+
+# Where backups and rolling snapshots are written (VAQUERO_BACKUP_DIR). Backups copy BACKUP_PAGES_PER_STEP
+# pages at a time and pause BACKUP_STEP_SLEEP_MS between batches so the UI thread gets to run
+# (VAQUERO_BACKUP_PAGES, VAQUERO_BACKUP_SLEEP_MS)
+BACKUP_DIR = os.environ.get("VAQUERO_BACKUP_DIR", "backups")
+BACKUP_PAGES_PER_STEP = int(os.environ.get("VAQUERO_BACKUP_PAGES", 1024))
+BACKUP_STEP_SLEEP_MS = float(os.environ.get("VAQUERO_BACKUP_SLEEP_MS", 1))
+
+# Rolling snapshots: one every SNAPSHOT_INTERVAL_MINUTES while the dashboard is open (0 turns them off),
+# keeping the newest SNAPSHOT_KEEP (VAQUERO_SNAPSHOT_MINUTES, VAQUERO_SNAPSHOT_KEEP)
+SNAPSHOT_INTERVAL_MINUTES = float(os.environ.get("VAQUERO_SNAPSHOT_MINUTES", 0))
+SNAPSHOT_KEEP = int(os.environ.get("VAQUERO_SNAPSHOT_KEEP", 7))
+
+# Exports (data_export.py) read this many rows per fetchmany call (VAQUERO_EXPORT_CHUNK_ROWS); memory use
+# depends on this, not on the size of the table
+EXPORT_CHUNK_ROWS = int(os.environ.get("VAQUERO_EXPORT_CHUNK_ROWS", 500))
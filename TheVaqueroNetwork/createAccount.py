@@ -2,7 +2,10 @@ import tkinter as tk
 from tkinter import ttk  # NEW: Import ttk for themed widgets
 from tkinter import messagebox as VaquerosMessager  # Using VaquerosMessager for consistency
 
-from database import add_user  # Imports the function to add a new user to the database
+from backend import add_user  # Imports the function to add a new user to the database
+from db_executor import run_async  # Runs database calls off the Tk main thread
+from failure_log import report_failure
+from theme import apply_theme
 
 def create_account_window():
     """
@@ -14,27 +17,7 @@ def create_account_window():
     account_window.geometry("400x400")  # Sets the initial size of the window
     account_window.resizable(False, False)  # Prevent resizing for a fixed, clean look
 
-    style = ttk.Style(account_window)  # Pass the Toplevel window to the style
-    style.theme_use('clam')
-
-    # Configure global fonts and colors for ttk widgets within this window
-    style.configure('.', font=('Inter', 10))
-    style.configure('TLabel', font=('Inter', 12), foreground='#333333', background='white')
-    style.configure('TEntry', font=('Inter', 12), fieldbackground='#f0f0f0', foreground='#333333', borderwidth=1, relief='flat')
-
-    # Configure button style for Create Account button
-    style.configure('Purple.TButton',
-                    font=('Inter', 12, 'bold'),
-                    foreground='white',
-                    background='#6202C2',  # Purple background
-                    padding=10,
-                    relief='flat',
-                    borderwidth=0
-                    )
-    style.map('Purple.TButton',
-              background=[('active', '#4a0196')],  # Darken on hover
-              foreground=[('active', 'white')]
-              )
+    apply_theme(account_window)  # No-op once the login window has registered the styles
 
     # Add a main title label for the account creation form
     tk.Label(
@@ -56,17 +39,18 @@ def create_account_window():
     password_entry.pack(pady=(0, 20))
 
     # --- Create Account Button ---
-    ttk.Button(
+    create_button = ttk.Button(
         account_window,
         text="Create Account",
-        command=lambda: create_account(username_entry.get(), password_entry.get(), account_window),
-        # Pass window to close
+        command=lambda: create_account(username_entry.get(), password_entry.get(), account_window, create_button),
+        # Pass window to close, and the button to disable while the account is created
         style='Purple.TButton'
-    ).pack(pady=10)
+    )
+    create_button.pack(pady=10)
 
     account_window.configure(bg='white')
 
-def create_account(username, password, account_window_to_destroy):
+def create_account(username, password, account_window_to_destroy, create_button=None):
     """
     Handles the account creation logic.
     Validates input and attempts to add the new user to the database.
@@ -75,6 +59,7 @@ def create_account(username, password, account_window_to_destroy):
         username (str): The username to be created.
         password (str): The password for the new user.
         account_window_to_destroy: The Tkinter window object to destroy on success.
+        create_button: The form's submit button, disabled while the account is being created.
     """
 
     # Check if both username and password fields are not empty
@@ -82,11 +67,25 @@ def create_account(username, password, account_window_to_destroy):
         VaquerosMessager.showwarning("Input Error", "Please enter both username and password.")
         return  # Stop if input is incomplete
 
-    # Attempt to add the new user to the database
-    if add_user(username, password):
-        VaquerosMessager.showinfo("Success",
-                                  "Account created successfully! You can now log in.")
-        account_window_to_destroy.destroy()  # Close the account creation window on success
-    else:
-        # Show error if account creation fails (e.g., username already exists)
-        VaquerosMessager.showerror("Error", "Failed to create account. Username might already exist.")
+    # Attempt to add the new user to the database (password hashing is slow, so this runs on the worker thread)
+    def set_form_enabled(enabled):
+        if create_button is not None:
+            create_button.config(state="normal" if enabled else "disabled")
+
+    def on_result(created):
+        set_form_enabled(True)
+        if created:
+            VaquerosMessager.showinfo("Success",
+                                      "Account created successfully! You can now log in.")
+            account_window_to_destroy.destroy()  # Close the account creation window on success
+        else:
+            # Show error if account creation fails (e.g., username already exists)
+            VaquerosMessager.showerror("Error", "Failed to create account. Username might already exist.")
+
+    def on_error(error):
+        set_form_enabled(True)
+        report_failure("add_user", error, username=username)
+        VaquerosMessager.showerror("Error", f"Could not create account: {error}", parent=account_window_to_destroy)
+
+    set_form_enabled(False)  # Prevent double submissions while the password is hashed
+    run_async(account_window_to_destroy, add_user, username, password, on_success=on_result, on_error=on_error)
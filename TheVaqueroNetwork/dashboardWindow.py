@@ -1,11 +1,22 @@
+import importlib
+import os
+import threading
 import tkinter as tk
 from tkinter import ttk
-
-# Import panel classes for modular dashboard sections
-from activity import ActivitiesPanel
-from calendar_panel import CalendarPanel
-from bulletin_board import BulletinBoardPanel
-from emergency_contact import EmergencyContactsPanel
+from tkinter import filedialog
+from tkinter import messagebox as VaquerosMessager
+from datetime import datetime
+
+import backup
+import config
+import data_export
+from backend import LOCAL_DATABASE
+from backup_window import BackupWindow
+from failure_log import report_failure
+from instrumentation import instrument_callbacks
+from panel_manager import PanelManager
+from retention import start_retention
+from theme import apply_theme
 
 # Welcome message displayed on the dashboard home screen
 WELCOME_TEXT = (
@@ -15,6 +26,32 @@ WELCOME_TEXT = (
 )
 
 
+# Data menu exports, as (menu label, export kind, file types offered)
+TABLE_FILE_TYPES = [("CSV files", "*.csv"), ("JSON Lines files", "*.jsonl")]
+EXPORTS = (
+    ("Export My Tasks...", "tasks", TABLE_FILE_TYPES),
+    ("Export My Tasks to Calendar (.ics)...", "tasks", [("iCalendar files", "*.ics")]),
+    ("Export My Emergency Contacts...", "contacts", TABLE_FILE_TYPES),
+    ("Export Announcements...", "announcements", TABLE_FILE_TYPES),
+)
+
+# How often (ms) the dashboard checks whether an export has finished
+EXPORT_POLL_MS = 100
+
+
+# Panel classes for the modular dashboard sections, as (module, class name). Each module is imported
+# the first time its panel is opened, so the dashboard doesn't load every panel up front.
+PANELS = {
+    "activities": ("activity", "ActivitiesPanel"),
+    "calendar": ("calendar_panel", "CalendarPanel"),
+    "bulletin_board": ("bulletin_board", "BulletinBoardPanel"),
+    "emergency_contacts": ("emergency_contact", "EmergencyContactsPanel"),
+    # Hidden: no sidebar button, opened with Ctrl+Shift+D
+    "diagnostics": ("diagnostics_panel", "DiagnosticsPanel"),
+}
+
+
+@instrument_callbacks("show_*")
 class DashboardWindow(tk.Toplevel):
     def __init__(self, master=None, username: str = "Guest"):
         super().__init__(master=master)
@@ -22,71 +59,8 @@ class DashboardWindow(tk.Toplevel):
         self.geometry("1000x700")
         self.username = username
 
-        # Configure ttk styles for the dashboard
-        style = ttk.Style(self)
-        style.theme_use('clam')
-
-        # Configure global fonts and colors for ttk widgets within this dashboard
-        style.configure('.', font=('Inter', 10))
-        style.configure('TLabel', font=('Inter', 12), foreground='#333333', background='white')
-        style.configure('TEntry', font=('Inter', 12), fieldbackground='#f0f0f0', foreground='#333333', borderwidth=1,
-                        relief='flat')
-
-        # Configure sidebar button styles (UTRGV Blue)
-        style.configure('Sidebar.TButton',
-                        font=('Inter', 12, 'bold'),
-                        foreground='white',
-                        background='#0056b3',
-                        padding=10,
-                        relief='flat',
-                        borderwidth=0
-                        )
-        style.map('Sidebar.TButton',
-                  background=[('active', '#003d80')],
-                  foreground=[('active', 'white')]
-                  )
-
-        # Configure content area button styles (UTRGV Orange for primary actions)
-        style.configure('Content.TButton',
-                        font=('Inter', 12, 'bold'),
-                        foreground='white',
-                        background='#F26722',
-                        padding=10,
-                        relief='flat',
-                        borderwidth=0
-                        )
-        style.map('Content.TButton',
-                  background=[('active', '#d95d1e')],
-                  foreground=[('active', 'white')]
-                  )
-
-        # Configure style for the Emergency Contact Add button (keeping red for emergency)
-        style.configure('Emergency.TButton',
-                        font=('Inter', 12, 'bold'),
-                        foreground='white',
-                        background='#e74c3c',
-                        padding=10,
-                        relief='flat',
-                        borderwidth=0
-                        )
-        style.map('Emergency.TButton',
-                  background=[('active', '#c0392b')],  # Darken on hover
-                  foreground=[('active', 'white')]
-                  )
-
-        # Configure style for Bulletin Board Post button (UTRGV Blue)
-        style.configure('Post.TButton',
-                        font=('Inter', 12, 'bold'),
-                        foreground='white',
-                        background='#0056b3',  # UTRGV Blue
-                        padding=10,
-                        relief='flat',
-                        borderwidth=0
-                        )
-        style.map('Post.TButton',
-                  background=[('active', '#003d80')],  # Darker UTRGV Blue on hover
-                  foreground=[('active', 'white')]
-                  )
+        # Styles are registered once at startup; this is a no-op unless the dashboard is opened on its own
+        apply_theme(self)
 
         # Configure grid layout for the main window (sidebar and content area)
         self.grid_rowconfigure(0, weight=1)
@@ -94,6 +68,7 @@ class DashboardWindow(tk.Toplevel):
         self.grid_columnconfigure(1, weight=1)
 
         # Build UI sections for the dashboard
+        self._build_menu()
         self._build_sidebar()
         self._build_content()
 
@@ -103,6 +78,34 @@ class DashboardWindow(tk.Toplevel):
         # Set window background explicitly for consistency
         self.configure(bg='white')
 
+        # Diagnostics (instrumentation histograms and database statistics) has no sidebar button
+        self.bind("<Control-Shift-KeyPress-D>", lambda event: self.show_diagnostics())
+
+        # Archive old announcements and shrink the database file in the background while the user is idle
+        start_retention(self)
+
+        # Rolling snapshots on their own thread, if VAQUERO_SNAPSHOT_MINUTES is set
+        backup.start_snapshots()
+
+    def _build_menu(self):
+        menubar = tk.Menu(self)
+        self.data_menu = tk.Menu(menubar, tearoff=False)
+        self.data_menu.add_command(label="Back Up Now...", command=self.back_up_now)
+        self.data_menu.add_command(label="Restore from Backup...", command=self.restore_from_backup)
+        self.data_menu.add_separator()
+        for label, kind, file_types in EXPORTS:
+            self.data_menu.add_command(label=label,
+                                       command=lambda kind=kind, types=file_types: self.export_data(kind, types))
+        if not LOCAL_DATABASE:
+            # These read and write the database file itself, which belongs to the data service in service mode
+            for index in range(self.data_menu.index("end") + 1):
+                if self.data_menu.type(index) == "command":
+                    self.data_menu.entryconfig(index, state="disabled")
+            self.data_menu.add_separator()
+            self.data_menu.add_command(label="Unavailable with the data service", state="disabled")
+        menubar.add_cascade(label="Data", menu=self.data_menu)
+        self.config(menu=menubar)
+
     def _build_sidebar(self):
         self.sidebar_frame = tk.Frame(self, bg="#003366", width=200, relief="raised", bd=2)
         self.sidebar_frame.grid(row=0, column=0, sticky="nswe")
@@ -127,30 +130,101 @@ class DashboardWindow(tk.Toplevel):
         self.content_frame.grid(row=0, column=1, sticky="nswe", padx=10, pady=10)
         self.content_frame.configure(bg='white')
 
-    def _clear_content(self):
-        for widget in self.content_frame.winfo_children():
-            widget.destroy()
+        # Panels are built on first visit and then hidden/shown instead of being destroyed on every click
+        factories = {name: (lambda parent, name=name: self._build_panel(name, parent)) for name in PANELS}
+        factories["home"] = self._build_welcome
+        self.panels = PanelManager(self.content_frame, factories)
 
-    def show_welcome_text(self, text: str | None = None):
-        self._clear_content()
-        message = text if text is not None else WELCOME_TEXT
-        tk.Label(self.content_frame, text="Dashboard Home", font=("Inter", 18, "bold"), fg="#0056b3", bg="white").pack(
+    def _build_panel(self, name, parent):
+        module_name, class_name = PANELS[name]
+        panel_class = getattr(importlib.import_module(module_name), class_name)
+        return panel_class(parent, self.username)
+
+    def _build_welcome(self, parent):
+        frame = tk.Frame(parent, bg="white")
+        frame.pack(fill="both", expand=True)
+        tk.Label(frame, text="Dashboard Home", font=("Inter", 18, "bold"), fg="#0056b3", bg="white").pack(
             pady=(20, 10))
-        tk.Message(self.content_frame, text=message, font=("Inter", 12), width=700, justify="left", bg="white",
-                   fg="#555555").pack(padx=20, pady=(0, 20))
+        self.welcome_message = tk.Message(frame, text=WELCOME_TEXT, font=("Inter", 12), width=700, justify="left",
+                                          bg="white", fg="#555555")
+        self.welcome_message.pack(padx=20, pady=(0, 20))
+        return frame
+
+    def show_welcome_text(self, text: str | None = None):
+        self.panels.show("home")
+        self.welcome_message.config(text=text if text is not None else WELCOME_TEXT)
 
     def show_activities_manager(self):
-        self._clear_content()
-        ActivitiesPanel(self.content_frame, self.username)
+        self.panels.show("activities")
 
     def show_event_calendar(self):
-        self._clear_content()
-        CalendarPanel(self.content_frame, self.username)
+        self.panels.show("calendar")
 
     def show_bulletin_board(self):
-        self._clear_content()
-        BulletinBoardPanel(self.content_frame, self.username)
+        self.panels.show("bulletin_board")
 
     def show_emergency_contacts(self):
-        self._clear_content()
-        EmergencyContactsPanel(self.content_frame, self.username)
\ No newline at end of file
+        self.panels.show("emergency_contacts")
+
+    def show_diagnostics(self):
+        self.panels.show("diagnostics")
+
+    def back_up_now(self):
+        os.makedirs(config.BACKUP_DIR, exist_ok=True)
+        path = filedialog.asksaveasfilename(
+            parent=self, title="Back up the database", initialdir=config.BACKUP_DIR, defaultextension=".db",
+            initialfile=f"vaquero_network-backup-{datetime.now():%Y%m%d-%H%M%S}.db",
+            filetypes=[("SQLite databases", "*.db"), ("All files", "*.*")])
+        if path:
+            BackupWindow(self, "Backup", backup.backup_database, path)
+
+    def restore_from_backup(self):
+        path = filedialog.askopenfilename(
+            parent=self, title="Restore from backup", initialdir=config.BACKUP_DIR,
+            filetypes=[("SQLite databases", "*.db"), ("All files", "*.*")])
+        if not path:
+            return
+        if not VaquerosMessager.askyesno(
+                "Restore from Backup",
+                f"Replace all current data with {os.path.basename(path)}?\n\n"
+                "A copy of the current data is saved first, so this can be undone.", parent=self):
+            return
+        BackupWindow(self, "Restore", backup.restore_database, path,
+                     on_done=lambda report: self.panels.invalidate_all())
+
+    def export_data(self, kind, file_types):
+        """
+        Asks where to save and exports the user's tasks or contacts, or the whole bulletin board (archive
+        included). The export runs on its own thread with its own connection rather than through run_async,
+        so a long export doesn't hold up the panels' queries on the database worker.
+        """
+        extension = file_types[0][1][1:]
+        path = filedialog.asksaveasfilename(
+            parent=self, title="Export", defaultextension=extension, filetypes=file_types + [("All files", "*.*")],
+            initialfile=f"vaquero-{kind}-{datetime.now():%Y%m%d}{extension}")
+        if not path:
+            return
+        username = None if kind == "announcements" else self.username
+        outcome = {}
+
+        def run():
+            try:
+                outcome["report"] = data_export.export(kind, path, username=username,
+                                                       include_archived=kind == "announcements")
+            except Exception as e:
+                outcome["error"] = e
+
+        thread = threading.Thread(target=run, name="vaquero-export", daemon=True)
+        thread.start()
+
+        def poll():
+            if thread.is_alive():
+                self.after(EXPORT_POLL_MS, poll)
+            elif "error" in outcome:
+                report_failure("export", outcome["error"], kind=kind, path=path)
+                VaquerosMessager.showerror("Export Failed", f"Could not export to {path}: {outcome['error']}",
+                                           parent=self)
+            else:
+                VaquerosMessager.showinfo("Export Complete", str(outcome["report"]), parent=self)
+
+        self.after(EXPORT_POLL_MS, poll)
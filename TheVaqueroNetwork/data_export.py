@@ -0,0 +1,274 @@
+"""
+Streaming export of tasks, emergency contacts and announcements to CSV, JSON Lines and iCalendar (.ics).
+
+Rows are read with fetchmany in chunks of EXPORT_CHUNK_ROWS and pass through generators straight to the
+file, so memory use stays the same however large the tables are. Each export reads one consistent snapshot
+on its own read-only connection, so it never waits behind (or holds up) the app's writes. Exports go to a
+.partial file that is renamed when complete, or removed if the export fails.
+
+Command line usage, from the TheVaqueroNetwork directory:
+    python data_export.py tasks tasks.csv --user jdoe
+    python data_export.py tasks deadlines.ics --user jdoe      # tasks with due dates, for calendar apps
+    python data_export.py announcements board.jsonl --include-archived
+    python data_export.py contacts contacts.csv                # every user's contacts
+
+The format is chosen from the file extension (.csv, .jsonl or .ics). Task CSV and .ics files can be read
+back with task_import.py.
+"""
+import argparse
+import csv
+import heapq
+import io
+import json
+import os
+import sqlite3
+import time
+from datetime import date, datetime, timedelta, timezone
+
+import config
+import db_connection
+from backend import LOCAL_DATABASE
+
+# Columns written for each kind of export. Task columns start with the ones task_import.py reads
+COLUMNS = {
+    "tasks": ("username", "title", "description", "due_date", "status", "id"),
+    "contacts": ("username", "contact_name", "contact_number", "id"),
+    "announcements": ("id", "username", "title", "content", "timestamp"),
+}
+
+FORMATS = {".csv": "csv", ".jsonl": "jsonl", ".ics": "ics"}
+
+# Each ORDER BY matches an index, so rows stream out in index order without a sort over the whole table
+QUERIES = {
+    "tasks": "SELECT username, title, description, due_date, status, id FROM tasks {where} "
+             "ORDER BY username, due_date, id",
+    "contacts": "SELECT username, contact_name, contact_number, id FROM emergency_contacts {where} "
+                "ORDER BY username, id",
+    "announcements": "SELECT id, username, title, content, timestamp FROM {table} ORDER BY timestamp, id",
+}
+
+ICS_PRODID = "-//The Vaquero Network//Task Export//EN"
+
+
+class ExportReport:
+    """
+    Summary of an export: rows written, file size and throughput.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.rows = 0
+        self.bytes = 0
+        self.seconds = 0.0
+
+    @property
+    def rows_per_sec(self):
+        return self.rows / self.seconds if self.seconds > 0 else 0.0
+
+    def __str__(self):
+        return (f"Exported {self.rows} rows ({self.bytes / 1e6:.1f} MB) in {self.seconds:.2f}s "
+                f"({self.rows_per_sec:,.0f} rows/sec) -> {self.path}")
+
+
+def iter_rows(cursor, chunk_size=None):
+    """
+    Yields the rows of an executed cursor, fetching chunk_size (default EXPORT_CHUNK_ROWS) at a time.
+    """
+    chunk_size = chunk_size or config.EXPORT_CHUNK_ROWS
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            return
+        yield from rows
+
+
+def iter_records(conn, kind, username=None, include_archived=False, due_only=False):
+    """
+    Streams the rows of one kind of export as tuples in COLUMNS[kind] order. Tasks and contacts can be limited
+    to one user; tasks to the ones with a due date; announcements can include the archive, merged in time order.
+    """
+    if kind == "announcements":
+        rows = iter_rows(conn.execute(QUERIES[kind].format(table="announcements")))
+        if not include_archived:
+            return rows
+        archived = iter_rows(conn.execute(QUERIES[kind].format(table="announcements_archive")))
+        return heapq.merge(archived, rows, key=lambda row: (row[4] or "", row[0]))
+
+    conditions, params = [], []
+    if username:
+        conditions.append("username = ?")
+        params.append(username)
+    if due_only:
+        conditions.append("due_date IS NOT NULL")
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    return iter_rows(conn.execute(QUERIES[kind].format(where=where), params))
+
+
+def csv_lines(records, columns):
+    """
+    Yields a CSV header and then one CSV line per record.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(columns)
+    for record in records:
+        writer.writerow(record)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    yield buffer.getvalue()
+
+
+def jsonl_lines(records, columns):
+    """
+    Yields one JSON object per record, one per line.
+    """
+    for record in records:
+        yield json.dumps(dict(zip(columns, record)), ensure_ascii=False) + "\n"
+
+
+def _escape_ics(value):
+    return (value.replace("\\", "\\\\").replace(";", "\\;").replace(",", "\\,")
+            .replace("\r\n", "\\n").replace("\n", "\\n"))
+
+
+def _fold(line):
+    """
+    Splits a content line into RFC 5545 lines of at most 75 octets, continuation lines starting with a space.
+    """
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line + "\r\n"
+    parts, start, limit = [], 0, 75
+    while start < len(encoded):
+        end = min(start + limit, len(encoded))
+        while end < len(encoded) and (encoded[end] & 0xC0) == 0x80:
+            end -= 1  # Don't split a multi-byte character
+        parts.append(encoded[start:end].decode("utf-8"))
+        start, limit = end, 74
+    return "\r\n ".join(parts) + "\r\n"
+
+
+def ics_lines(records, columns):
+    """
+    Yields an iCalendar file with one all-day VEVENT per task on its due date, which calendar apps show
+    (many ignore VTODO entries). Tasks without a valid due date are skipped.
+    """
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    yield "BEGIN:VCALENDAR\r\nVERSION:2.0\r\n" + _fold(f"PRODID:{ICS_PRODID}") + "CALSCALE:GREGORIAN\r\n"
+    for record in records:
+        task = dict(zip(columns, record))
+        try:
+            due = date.fromisoformat(task["due_date"] or "")
+        except ValueError:
+            continue
+        lines = [
+            "BEGIN:VEVENT",
+            f"UID:task-{task['id']}@vaquero-network",
+            f"DTSTAMP:{stamp}",
+            f"DTSTART;VALUE=DATE:{due:%Y%m%d}",
+            f"DTEND;VALUE=DATE:{due + timedelta(days=1):%Y%m%d}",
+            f"SUMMARY:{_escape_ics(task['title'])}",
+        ]
+        if task["description"]:
+            lines.append(f"DESCRIPTION:{_escape_ics(task['description'])}")
+        if task["status"]:
+            lines.append(f"CATEGORIES:{_escape_ics(task['status'])}")
+        lines += ["TRANSP:TRANSPARENT", "END:VEVENT"]
+        yield "".join(_fold(line) for line in lines)
+    yield "END:VCALENDAR\r\n"
+
+
+FORMATTERS = {"csv": csv_lines, "jsonl": jsonl_lines, "ics": ics_lines}
+
+
+def format_for(path):
+    """
+    Returns the export format ("csv", "jsonl" or "ics") for a file name. Raises ValueError for anything else.
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension not in FORMATS:
+        raise ValueError(f"Unsupported file type: {extension or path} (use .csv, .jsonl or .ics)")
+    return FORMATS[extension]
+
+
+def _connect_read_only():
+    return sqlite3.connect(f"file:{os.path.abspath(db_connection.DB_PATH)}?mode=ro", uri=True,
+                           isolation_level=None, timeout=config.BUSY_TIMEOUT_MS / 1000)
+
+
+def export(kind, path, username=None, include_archived=False, progress=None):
+    """
+    Writes every `kind` ("tasks", "contacts" or "announcements") row to `path` in the format given by its
+    extension, optionally for one user (tasks and contacts). .ics files are only for tasks and hold the ones
+    with a due date. progress(rows), if given, is called every EXPORT_CHUNK_ROWS rows. Safe to call from any
+    thread; it uses its own connection. Returns an ExportReport.
+    """
+    if kind not in COLUMNS:
+        raise ValueError(f"Unknown export {kind!r}; choose from {', '.join(COLUMNS)}")
+    file_format = format_for(path)
+    if file_format == "ics" and kind != "tasks":
+        raise ValueError("Only tasks can be exported to .ics")
+
+    report = ExportReport(path)
+    partial = path + ".partial"
+    start = time.perf_counter()
+    conn = _connect_read_only()
+    try:
+        # One read transaction, so the file reflects a single moment even while others keep writing
+        conn.execute("BEGIN")
+        records = iter_records(conn, kind, username=username, include_archived=include_archived,
+                               due_only=file_format == "ics")
+        with open(partial, "w", encoding="utf-8", newline="") as f:
+            for chunk in FORMATTERS[file_format](_counted(records, report, progress), COLUMNS[kind]):
+                f.write(chunk)
+        conn.rollback()
+        os.replace(partial, path)
+    except BaseException:
+        _remove(partial)  # A failed export leaves nothing behind, not even the partial file
+        raise
+    finally:
+        conn.close()
+
+    report.seconds = time.perf_counter() - start
+    report.bytes = os.path.getsize(path)
+    return report
+
+
+def _remove(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _counted(records, report, progress):
+    every = config.EXPORT_CHUNK_ROWS
+    for record in records:
+        report.rows += 1
+        if progress is not None and report.rows % every == 0:
+            progress(report.rows)
+        yield record
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export tasks, emergency contacts or announcements.")
+    parser.add_argument("kind", choices=COLUMNS, help="what to export")
+    parser.add_argument("path", help="output file (.csv, .jsonl, or .ics for tasks)")
+    parser.add_argument("--user", help="only this user's tasks or contacts (default: everyone's)")
+    parser.add_argument("--include-archived", action="store_true", help="include archived announcements")
+    parser.add_argument("--db", help="database file (defaults to the app's database)")
+    args = parser.parse_args()
+
+    if args.db:
+        db_connection.set_database_path(args.db)
+    elif not LOCAL_DATABASE:
+        parser.error("the data service (VAQUERO_BACKEND=service) owns the database; pass --db with the file it serves")
+    try:
+        print(export(args.kind, args.path, username=args.user, include_archived=args.include_archived))
+    except ValueError as e:
+        parser.error(str(e))
+
+
+if __name__ == "__main__":
+    main()
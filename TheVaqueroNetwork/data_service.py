@@ -0,0 +1,201 @@
+"""
+Local data service: serves the database.py API over localhost HTTP/JSON so many desktop clients share one
+writer instead of contending for the SQLite write lock.
+
+Run from the TheVaqueroNetwork directory:
+    python data_service.py [--db vaquero_network.db] [--port 8765]
+then start the clients with VAQUERO_BACKEND=service. Each request is a POST to /call with a body of
+{"function": name, "args": [...], "kwargs": {...}}; the reply is {"result": ...} or {"error": message}.
+"""
+import argparse
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import config
+import database
+from db_connection import retry_on_busy, set_database_path, transaction
+from service_client import READ_FUNCTIONS, UNBATCHED_WRITE_FUNCTIONS, WRITE_FUNCTIONS
+
+
+def _tuplify(value):
+    """
+    Converts JSON arrays back into tuples, so arguments such as a pagination cursor can be used as cache keys.
+    """
+    if isinstance(value, list):
+        return tuple(_tuplify(item) for item in value)
+    return value
+
+
+class GroupCommitWriter:
+    """
+    Runs every write on one thread and commits them in groups.
+
+    The writer takes the first queued write plus everything that queued up behind it (while the previous
+    group was committing), up to `max_batch`, optionally waiting `max_wait_ms` for more, and runs the whole
+    group inside one transaction(). Each write's own transaction()
+    becomes a savepoint, so a write that fails is rolled back on its own while the rest of the group commits.
+    One commit (and one fsync) then covers the whole group, and the cache entries the group's writes changed
+    are invalidated after it.
+
+    Before each group, and every CHANGE_POLL_MS while idle, the writer also checks for commits made by other
+    processes and empties the query cache if there were any (see database.use_single_writer).
+    """
+
+    def __init__(self, max_batch=None, max_wait_ms=None):
+        self.max_batch = max_batch if max_batch is not None else config.SERVICE_MAX_BATCH
+        self.max_wait = (max_wait_ms if max_wait_ms is not None else config.SERVICE_BATCH_WAIT_MS) / 1000
+        self.batches = 0
+        self.writes = 0
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="vaquero-writer", daemon=True)
+        self._thread.start()
+
+    def submit(self, func, args, kwargs):
+        """
+        Queues func(*args, **kwargs) and returns a Future for its result.
+        """
+        future = Future()
+        self._queue.put((future, func, args, kwargs))
+        return future
+
+    def stop(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def stats(self):
+        return {"batches": self.batches, "writes": self.writes,
+                "mean_batch": self.writes / self.batches if self.batches else 0.0}
+
+    def _run(self):
+        while True:
+            try:
+                first = self._queue.get(timeout=config.CHANGE_POLL_MS / 1000)
+            except queue.Empty:
+                database.clear_cache_if_written_elsewhere()
+                continue
+            if first is None:
+                return
+            batch = [first]
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                try:
+                    item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    self._queue.put(None)  # Finish this group, then stop
+                    break
+                batch.append(item)
+            self._commit(batch)
+
+    def _commit(self, batch):
+        database.clear_cache_if_written_elsewhere()
+        try:
+            outcomes = self._run_group(batch)
+        except Exception as e:
+            # The commit itself failed, so nothing in the group was written
+            for future, func, args, kwargs in batch:
+                future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.writes += len(batch)
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    @retry_on_busy  # Another process (e.g. a direct-mode client) may hold the write lock; rerun the whole group
+    def _run_group(self, batch):
+        outcomes = []
+        with transaction():
+            for future, func, args, kwargs in batch:
+                try:
+                    outcomes.append((future, func(*args, **kwargs), None))
+                except Exception as e:
+                    outcomes.append((future, None, e))
+        return outcomes
+
+
+class DataServiceHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, so each client reuses one connection per thread
+    disable_nagle_algorithm = True  # Headers and body are separate writes; don't let Nagle hold the body back
+
+    def do_POST(self):
+        if self.path != "/call":
+            self.send_error(404)
+            return
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            reply = {"result": self.server.dispatch(request["function"], _tuplify(request.get("args", [])),
+                                                    {key: _tuplify(value)
+                                                     for key, value in request.get("kwargs", {}).items()})}
+        except Exception as e:
+            reply = {"error": f"{type(e).__name__}: {e}"}
+
+        body = json.dumps(reply).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # One line per request would swamp the console under load
+
+
+class DataService(ThreadingHTTPServer):
+    """
+    HTTP server exposing the database.py functions listed in service_client. Reads run on the request
+    threads (each has its own SQLite connection); batched writes go through the GroupCommitWriter.
+    """
+    daemon_threads = True
+
+    def __init__(self, host=None, port=None, writer=None):
+        super().__init__((host or config.SERVICE_HOST, port if port is not None else config.SERVICE_PORT),
+                         DataServiceHandler)
+        database.use_single_writer()
+        self.writer = writer or GroupCommitWriter()
+
+    def dispatch(self, function, args, kwargs):
+        if function == "service_stats":
+            return self.writer.stats()
+        if function in WRITE_FUNCTIONS:
+            return self.writer.submit(getattr(database, function), args, kwargs).result()
+        if function in READ_FUNCTIONS or function in UNBATCHED_WRITE_FUNCTIONS:
+            return getattr(database, function)(*args, **kwargs)
+        raise ValueError(f"Unknown function {function!r}")
+
+    def server_close(self):
+        super().server_close()
+        self.writer.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db", help="database file to serve (defaults to the app's database)")
+    parser.add_argument("--host", default=config.SERVICE_HOST)
+    parser.add_argument("--port", type=int, default=config.SERVICE_PORT)
+    args = parser.parse_args()
+
+    if args.db:
+        set_database_path(args.db)
+    database.init_db()
+    service = DataService(args.host, args.port)
+    print(f"Data service listening on http://{args.host}:{args.port}")
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        service.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,238 +1,549 @@
+import functools
+import heapq
+import re
 import sqlite3
+from datetime import datetime, timedelta, timezone
+from itertools import islice
 
-def init_db():
+import config
+from cache import LRUCache
+from db_connection import (after_commit, data_version_changed, get_connection, read_data_version, retry_on_busy,
+                           transaction)
+from failure_log import report_failure
+from instrumentation import instrument_module
+from migrations import migrate
+from passwords import dummy_hash, hash_password, needs_rehash, verify_password
+
+# Read-through cache for the per-user and bulletin board queries. Writes below invalidate the affected groups;
+# commits from other processes are noticed through PRAGMA data_version and clear the whole cache.
+_query_cache = LRUCache(config.CACHE_MAX_ENTRIES, is_stale=data_version_changed)
+
+def _invalidate(*group):
+    # Inside a larger transaction (a data service write group) this waits for the commit; invalidating earlier
+    # would let a reader cache the old rows again before the new ones are visible
+    after_commit(lambda: _query_cache.invalidate(*group))
+
+def _write_operation(failure_result):
     """
-    Initializes the SQLite database and creates the users, tasks, emergency_contacts, and announcements tables if they don't exist.
+    Decorator for the write functions. Retries the whole call while the database is locked by another
+    instance (see retry_on_busy); if it still fails, the failure is reported through failure_log and
+    failure_result is returned, so callers keep their simple success/failure checks.
     """
+    def decorator(func):
+        retrying = retry_on_busy(func)
 
-    conn = sqlite3.connect('vaquero_network.db')
-    cursor = conn.cursor()
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            try:
+                return retrying(*args, **kwargs)
+            except Exception as e:
+                report_failure(func.__name__, e, attempts=getattr(e, "attempts", 1), args=repr(args)[:200])
+                return failure_result
+        return wrapper
+    return decorator
 
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            username TEXT NOT NULL UNIQUE,
-            password TEXT NOT NULL
-        )
-    ''')
-
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS tasks (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT NOT NULL,
-            title TEXT NOT NULL,
-            description TEXT,
-            due_date TEXT,
-            status TEXT DEFAULT 'pending',
-            FOREIGN KEY (username) REFERENCES users(username)
-        )
-    ''')
-
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS emergency_contacts (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT NOT NULL,
-            contact_name TEXT NOT NULL,
-            contact_number TEXT NOT NULL,
-            FOREIGN KEY (username) REFERENCES users(username)
-        )
-    ''')
-
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS announcements (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT NOT NULL,
-            title TEXT NOT NULL,
-            content TEXT NOT NULL,
-            timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (username) REFERENCES users(username)
-        )
-    ''')
+def cache_stats():
+    """
+    Returns the query cache's hit/miss counters and size as a dict.
+    """
+    return _query_cache.stats()
+
+def data_version(*namespaces):
+    """
+    Returns a number that changes whenever data in the given cache namespaces ("tasks", "contacts",
+    "announcements") is written by this process. Panels compare it to decide whether to reload.
+    """
+    return _query_cache.version(*namespaces)
 
-    conn.commit()
-    conn.close()
+def commit_version():
+    """
+    Returns a number that changes whenever another connection (another thread, instance or the data service's
+    writer) commits to the database. The change feed polls it to notice posts made elsewhere.
+    """
+    return read_data_version()
 
+def clear_cache():
+    """
+    Empties the query cache (used by benchmarks to measure uncached reads).
+    """
+    _query_cache.clear()
+
+def use_single_writer(single=True):
+    """
+    For the data service, whose writes all run on its writer thread and invalidate what they change once their
+    group commits. Reads stop checking PRAGMA data_version before each lookup, since every group commit would
+    change it and empty the whole cache; the writer calls clear_cache_if_written_elsewhere() instead.
+    use_single_writer(False) goes back to checking on every read.
+    """
+    _query_cache.is_stale = None if single else data_version_changed
+
+def clear_cache_if_written_elsewhere():
+    """
+    Empties the query cache if another connection has committed since the calling thread last checked. On the
+    data service's writer thread that means another process (or an unbatched write), since a connection's own
+    commits don't change its PRAGMA data_version. If the check itself fails, the cache is emptied anyway.
+    """
+    try:
+        changed = data_version_changed()
+    except Exception as e:
+        report_failure("clear_cache_if_written_elsewhere", e)
+        changed = True
+    if changed:
+        _query_cache.clear()
+
+def init_db():
+    """
+    Initializes the SQLite database, creating the tables on first run and applying any pending schema migrations.
+    Safe to call on every startup: it is a no-op when the schema is already current.
+    """
+
+    migrate()
+
+@retry_on_busy
 def add_user(username, password):
     """
-    Adds a new user to the database. Returns True on success, False on failure (e.g., username already exists).
+    Adds a new user to the database, storing a salted scrypt hash of the password.
+    Returns True on success, False on failure (e.g., username already exists).
+    Hashing is deliberately CPU-heavy, so call this off the Tk main thread.
     """
 
     try:
-        conn = sqlite3.connect('vaquero_network.db')
-        cursor = conn.cursor()
-        cursor.execute("INSERT INTO users (username, password) VALUES (?, ?)", (username, password))
-        conn.commit()
+        with transaction() as conn:
+            cursor = conn.cursor()
+            cursor.execute("INSERT INTO users (username, password) VALUES (?, ?)", (username, hash_password(password)))
         return True
     except sqlite3.IntegrityError:
         return False
-    finally:
-        conn.close()
 
 def validate_user(username, password):
     """
-    Checks if a username and password combination exists in the database. Returns True if a match is found, otherwise False.
+    Checks a username and password against the stored hash. Returns True if they match, otherwise False.
+    Plaintext passwords from older databases, and hashes made with an outdated cost, are re-hashed on a successful login.
+    Hashing is deliberately CPU-heavy, so call this off the Tk main thread.
     """
 
-    conn = sqlite3.connect('vaquero_network.db')
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM users WHERE username = ? AND password = ?", (username, password))
-    user = cursor.fetchone()
-    conn.close()
-    return user is not None
+    cursor = get_connection().cursor()
+    cursor.execute("SELECT password FROM users WHERE username = ?", (username,))
+    row = cursor.fetchone()
+    if row is None:
+        verify_password(password, dummy_hash())  # Take as long as a wrong password would
+        return False
+    if not verify_password(password, row[0]):
+        return False
+
+    stored = row[0]
+    if needs_rehash(stored):
+        try:
+            with transaction() as conn:
+                # Only replace the value we verified, in case another login upgraded it meanwhile
+                conn.execute(
+                    "UPDATE users SET password = ? WHERE username = ? AND password = ?",
+                    (hash_password(password), username, stored)
+                )
+        except Exception as e:
+            report_failure("upgrade_password_hash", e, username=username)  # The login itself still succeeds
+    return True
 
+@_write_operation(failure_result=None)
 def add_task(username, title, description=None, due_date=None):
     """
     Adds a new task for a user. Returns the ID of the new task on success, None on failure.
     """
 
-    try:
-        conn = sqlite3.connect('vaquero_network.db')
+    with transaction() as conn:
         cursor = conn.cursor()
         cursor.execute(
             "INSERT INTO tasks (username, title, description, due_date) VALUES (?, ?, ?, ?)",
             (username, title, description, due_date)
         )
         task_id = cursor.lastrowid
-        conn.commit()
-        return task_id
-    except Exception as e:
-        print(f"Error adding task: {e}")
-        return None
-    finally:
-        conn.close()
+    _invalidate("tasks", username)
+    return task_id
+
+def add_tasks_bulk(rows, chunk_size=1000):
+    """
+    Inserts many tasks at once. `rows` is any iterable of (username, title, description, due_date) tuples;
+    it is consumed lazily and written with executemany, one transaction per chunk of `chunk_size` rows.
+    Returns the number of tasks inserted. Raises if a chunk can't be written; earlier chunks stay committed.
+    """
+
+    rows = iter(rows)
+    inserted = 0
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        _insert_task_chunk(chunk)  # Each chunk is retried on its own if the database is busy
+        _invalidate("tasks")
+        inserted += len(chunk)
+    return inserted
 
+@retry_on_busy
+def _insert_task_chunk(chunk):
+    with transaction() as conn:
+        conn.executemany(
+            "INSERT INTO tasks (username, title, description, due_date) VALUES (?, ?, ?, ?)",
+            chunk
+        )
+
+@_query_cache.cached("tasks", per_user=True)
 def get_tasks(username):
     """
-    Retrieves all tasks for a specific user. Returns a list of task tuples.
+    Retrieves all tasks for a specific user, oldest first. Returns a list of task tuples.
     """
 
-    conn = sqlite3.connect('vaquero_network.db')
-    cursor = conn.cursor()
-    cursor.execute("SELECT id, title, description, due_date, status FROM tasks WHERE username = ?", (username,))
+    cursor = get_connection().cursor()
+    cursor.execute(
+        "SELECT id, title, description, due_date, status FROM tasks WHERE username = ? ORDER BY id",
+        (username,)
+    )
     tasks = cursor.fetchall()
-    conn.close()
     return tasks
 
+@_query_cache.cached("tasks", per_user=True)
+def get_task_days(username, start_date, end_date):
+    """
+    Summarizes a user's tasks due between start_date and end_date (inclusive, "YYYY-MM-DD") in one query.
+    Returns a list of (due_date, task_count, titles) tuples, one per day that has tasks, in date order;
+    titles is a tuple of that day's task titles.
+    """
+
+    cursor = get_connection().cursor()
+    # Served by idx_tasks_username_due_date: a range scan that is already in GROUP BY order
+    cursor.execute(
+        "SELECT due_date, COUNT(*), group_concat(title, char(31)) FROM tasks "
+        "WHERE username = ? AND due_date BETWEEN ? AND ? GROUP BY due_date",
+        (username, start_date, end_date)
+    )
+    return [(due_date, count, tuple(titles.split("\x1f"))) for due_date, count, titles in cursor]
+
 def get_task(task_id):
     """
     Retrieves a specific task by ID. Returns a task tuple or None if not found.
     """
 
-    conn = sqlite3.connect('vaquero_network.db')
-    cursor = conn.cursor()
+    cursor = get_connection().cursor()
     cursor.execute("SELECT id, username, title, description, due_date, status FROM tasks WHERE id = ?", (task_id,))
     task = cursor.fetchone()
-    conn.close()
     return task
 
+@_write_operation(failure_result=False)
 def update_task(task_id, title=None, description=None, due_date=None, status=None):
     """
-    Updates an existing task. Returns True on success, False on failure.
+    Updates an existing task in a single UPDATE statement that only touches the fields that were supplied.
+    Returns True on success, False on failure (including when the task does not exist).
     """
 
-    try:
-        conn = sqlite3.connect('vaquero_network.db')
-        cursor = conn.cursor()
+    fields = {"title": title, "description": description, "due_date": due_date, "status": status}
+    changes = {column: value for column, value in fields.items() if value is not None}
+    if not changes:
+        return get_task(task_id) is not None  # Nothing to change; report whether the task exists
 
-        cursor.execute("SELECT title, description, due_date, status FROM tasks WHERE id = ?", (task_id,))
-        current = cursor.fetchone()
-
-        if not current:
-            return False
+    # Column names come from the fixed dict above, never from the caller
+    assignments = ", ".join(f"{column} = ?" for column in changes)
+    with transaction() as conn:
+        cursor = conn.cursor()
+        cursor.execute(f"UPDATE tasks SET {assignments} WHERE id = ?", (*changes.values(), task_id))
+    _invalidate("tasks")
+    return cursor.rowcount > 0
 
-        new_title = title if title is not None else current[0]
-        new_description = description if description is not None else current[1]
-        new_due_date = due_date if due_date is not None else current[2]
-        new_status = status if status is not None else current[3]
+@_write_operation(failure_result=0)
+def update_task_status_many(task_ids, status):
+    """
+    Sets the status of several tasks in one transaction. Returns the number of tasks updated (0 on failure).
+    """
 
-        cursor.execute(
-            "UPDATE tasks SET title = ?, description = ?, due_date = ?, status = ? WHERE id = ?",
-            (new_title, new_description, new_due_date, new_status, task_id)
-        )
-        conn.commit()
-        return cursor.rowcount > 0
-    except Exception as e:
-        print(f"Error updating task: {e}")
-        return False
-    finally:
-        conn.close()
+    with transaction() as conn:
+        cursor = conn.cursor()
+        cursor.executemany("UPDATE tasks SET status = ? WHERE id = ?", ((status, task_id) for task_id in task_ids))
+    _invalidate("tasks")
+    return cursor.rowcount
 
+@_write_operation(failure_result=False)
 def delete_task(task_id):
     """
     Deletes a task by ID. Returns True on success, False on failure.
     """
-    try:
-        conn = sqlite3.connect('vaquero_network.db')
+    with transaction() as conn:
         cursor = conn.cursor()
         cursor.execute("DELETE FROM tasks WHERE id = ?", (task_id,))
-        conn.commit()
-        return cursor.rowcount > 0
-    except Exception as e:
-        print(f"Error deleting task: {e}")
-        return False
-    finally:
-        conn.close()
+    _invalidate("tasks")
+    return cursor.rowcount > 0
 
+@_write_operation(failure_result=0)
+def delete_tasks(task_ids):
+    """
+    Deletes several tasks by ID in one transaction. Returns the number of tasks deleted (0 on failure).
+    """
+    with transaction() as conn:
+        cursor = conn.cursor()
+        cursor.executemany("DELETE FROM tasks WHERE id = ?", ((task_id,) for task_id in task_ids))
+    _invalidate("tasks")
+    return cursor.rowcount
+
+@_write_operation(failure_result=None)
 def add_emergency_contact(username, contact_name, contact_number):
     """
-    Adds a new emergency contact for a specific user. Returns True on success, False on failure.
+    Adds a new emergency contact for a specific user.
+    Returns the new contact tuple (id, contact_name, contact_number) on success, None on failure.
     """
-    try:
-        conn = sqlite3.connect('vaquero_network.db')
+    with transaction() as conn:
         cursor = conn.cursor()
         cursor.execute(
             "INSERT INTO emergency_contacts (username, contact_name, contact_number) VALUES (?, ?, ?)",
             (username, contact_name, contact_number)
         )
-        conn.commit()
-        return True
-    except Exception as e:
-        print(f"Error adding emergency contact: {e}")
-        return False
-    finally:
-        conn.close()
+    _invalidate("contacts", username)
+    return (cursor.lastrowid, contact_name, contact_number)
 
+@_query_cache.cached("contacts", per_user=True)
 def get_emergency_contacts(username):
     """
     Retrieves all emergency contacts for a specific user. Returns a list of contact tuples (id, contact_name, contact_number).
     """
 
-    conn = sqlite3.connect('vaquero_network.db')
-    cursor = conn.cursor()
+    cursor = get_connection().cursor()
     cursor.execute(
         "SELECT id, contact_name, contact_number FROM emergency_contacts WHERE username = ?",
         (username,)
     )
     contacts = cursor.fetchall()
-    conn.close()
     return contacts
 
+@_write_operation(failure_result=None)
 def add_announcement(username, title, content):
     """
-    Adds a new announcement to the bulletin board. Returns True on success, False on failure.
+    Adds a new announcement to the bulletin board.
+    Returns the new announcement tuple (id, username, title, content, timestamp) on success, None on failure.
     """
 
-    try:
-        conn = sqlite3.connect('vaquero_network.db')
+    with transaction() as conn:
         cursor = conn.cursor()
         cursor.execute(
             "INSERT INTO announcements (username, title, content) VALUES (?, ?, ?)",
             (username, title, content)
         )
-        conn.commit()
-        return True
-    except Exception as e:
-        print(f"Error adding announcement: {e}")
-        return False
-    finally:
-        conn.close()
+        # Read back the row so callers get the database-assigned timestamp without re-querying the board
+        cursor.execute(
+            "SELECT id, username, title, content, timestamp FROM announcements WHERE id = ?",
+            (cursor.lastrowid,)
+        )
+        announcement = cursor.fetchone()
+    _invalidate("announcements")
+    return announcement
 
-def get_announcements():
+@_query_cache.cached("announcements")
+def get_announcements(include_archived=False):
     """
     Retrieves all announcements from the bulletin board, ordered by timestamp (newest first). Returns a list of announcement tuples (id, username, title, content, timestamp).
+    With include_archived=True, posts moved to the archive by archive_announcements are included.
     """
-    conn = sqlite3.connect('vaquero_network.db')
-    cursor = conn.cursor()
-    cursor.execute("SELECT id, username, title, content, timestamp FROM announcements ORDER BY timestamp DESC")
+    cursor = get_connection().cursor()
+    cursor.execute("SELECT id, username, title, content, timestamp FROM announcements ORDER BY timestamp DESC, id DESC")
     announcements = cursor.fetchall()
-    conn.close()
+    if include_archived:
+        cursor.execute("SELECT id, username, title, content, timestamp FROM announcements_archive "
+                       "ORDER BY timestamp DESC, id DESC")
+        announcements = _merge_newest_first(announcements, cursor.fetchall())
     return announcements
+
+def _merge_newest_first(rows, archived_rows, limit=None):
+    """
+    Merges two lists of announcement tuples that are each newest first, keeping at most `limit` rows.
+    Merging here lets both queries read their (timestamp, id) index in order instead of sorting a UNION.
+    """
+    merged = heapq.merge(rows, archived_rows, key=lambda row: (row[4], row[0]), reverse=True)
+    return list(islice(merged, limit))
+
+@_query_cache.cached("announcements")
+def get_announcements_page(limit=25, before=None, include_archived=False):
+    """
+    Retrieves one page of announcements, newest first, using keyset pagination on (timestamp, id).
+    Pass the (timestamp, id) of the last row of the previous page as `before` to get the next page.
+    With include_archived=True the page is merged from the main and archive tables.
+    Returns a list of announcement tuples (id, username, title, content, timestamp); fewer than `limit` rows means the end was reached.
+    """
+    if before is None:
+        where, params = "", (limit,)
+    else:
+        where, params = "WHERE (timestamp, id) < (?, ?) ", (*before, limit)
+
+    page_query = ("SELECT id, username, title, content, timestamp FROM {table} "
+                  + where + "ORDER BY timestamp DESC, id DESC LIMIT ?")
+    cursor = get_connection().cursor()
+    cursor.execute(page_query.format(table="announcements"), params)
+    page = cursor.fetchall()
+    if include_archived:
+        # Up to `limit` rows from each table; the newest `limit` of them form the page
+        cursor.execute(page_query.format(table="announcements_archive"), params)
+        page = _merge_newest_first(page, cursor.fetchall(), limit)
+    return page
+
+def get_announcements_since(after_id, limit=100):
+    """
+    Retrieves announcements with an id greater than after_id, oldest first, at most `limit` of them.
+    Used by the live bulletin board to fetch only posts it hasn't seen. Not cached, since it is called
+    right after a change is detected.
+    """
+
+    cursor = get_connection().cursor()
+    cursor.execute(
+        "SELECT id, username, title, content, timestamp FROM announcements WHERE id > ? ORDER BY id LIMIT ?",
+        (after_id, limit)
+    )
+    return cursor.fetchall()
+
+def _retention_cutoff(older_than_days):
+    """
+    Returns the timestamp older_than_days ago, in the UTC 'YYYY-MM-DD HH:MM:SS' form CURRENT_TIMESTAMP stores.
+    """
+    return (datetime.now(timezone.utc) - timedelta(days=older_than_days)).strftime("%Y-%m-%d %H:%M:%S")
+
+@retry_on_busy
+def _archive_announcement_batch(cutoff, batch_size):
+    """
+    Moves the oldest announcements posted before cutoff, at most batch_size of them, into announcements_archive
+    in one transaction. Returns the number moved.
+    """
+    with transaction() as conn:
+        # The batch ends at its newest (timestamp, id); copy and delete are then both range reads on the index
+        last = conn.execute(
+            "SELECT timestamp, id FROM announcements WHERE timestamp < ? ORDER BY timestamp, id LIMIT 1 OFFSET ?",
+            (cutoff, batch_size - 1)
+        ).fetchone()
+        if last is None:
+            condition, params = "timestamp < ?", (cutoff,)  # Fewer than batch_size left: take them all
+        else:
+            condition, params = "(timestamp, id) <= (?, ?)", last
+        conn.execute(
+            "INSERT INTO announcements_archive (id, username, title, content, timestamp) "
+            f"SELECT id, username, title, content, timestamp FROM announcements WHERE {condition}",
+            params
+        )
+        moved = conn.execute(f"DELETE FROM announcements WHERE {condition}", params).rowcount
+    return moved
+
+def archive_announcements(older_than_days=None, batch_size=None, max_batches=None):
+    """
+    Moves announcements older than older_than_days (default config.ANNOUNCEMENT_RETENTION_DAYS; 0 or less
+    disables archiving) into the archive table, batch_size rows (default config.ARCHIVE_BATCH_SIZE) per
+    transaction, so other writers get the lock between batches. Stops after max_batches if given.
+    Returns the number of announcements moved. Raises on a database error; batches already moved stay moved.
+    """
+    days = config.ANNOUNCEMENT_RETENTION_DAYS if older_than_days is None else older_than_days
+    if days <= 0:
+        return 0
+    batch_size = batch_size or config.ARCHIVE_BATCH_SIZE
+    cutoff = _retention_cutoff(days)
+
+    moved = 0
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        count = _archive_announcement_batch(cutoff, batch_size)
+        batches += 1
+        moved += count
+        if count:
+            _invalidate("announcements")
+        if count < batch_size:
+            break
+    return moved
+
+@retry_on_busy
+def enable_incremental_vacuum():
+    """
+    Switches an existing database file to auto_vacuum=INCREMENTAL, which needs one full VACUUM. New files get
+    it when they are created (see db_connection). Returns True if the file was converted, False if it already was.
+    The VACUUM rewrites the whole file and locks out other writers meanwhile, so this is a one-off step run from
+    the command line (python retention.py enable-incremental-vacuum), never from the idle scheduler.
+    """
+    conn = get_connection()
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] == 2:  # 2 = INCREMENTAL
+        return False
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute("VACUUM")
+    return True
+
+@retry_on_busy
+def incremental_vacuum(pages=None):
+    """
+    Returns up to `pages` (default config.VACUUM_STEP_PAGES) free pages at the end of the file to the file
+    system, so the file shrinks after archiving without a full VACUUM. Returns the number of free pages left,
+    or 0 if the file hasn't been converted with enable_incremental_vacuum (nothing can be freed until it is).
+    """
+    conn = get_connection()
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:  # 2 = INCREMENTAL
+        return 0
+    # The pragma frees one page per step; execute() steps it only once, executescript() runs it to completion
+    conn.executescript(f"PRAGMA incremental_vacuum({int(pages or config.VACUUM_STEP_PAGES)});")
+    return conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+def _fts_query(text):
+    """
+    Turns free text typed by a user into a safe FTS5 query: every word must match, and words are treated
+    as prefixes so results update while the user is still typing. Returns None if there are no words.
+    """
+    words = re.findall(r"\w+", text)
+    if not words:
+        return None
+    # Quoting keeps FTS5 operators out of user input. Prefixes shorter than three letters match so many
+    # rows that ranking them blows the ~20 ms budget on large boards, so those words must match exactly
+    # (the search boxes wait for config.SEARCH_MIN_CHARS characters, so a lone short word isn't searched).
+    return " ".join(f'"{word}"*' if len(word) >= 3 else f'"{word}"' for word in words)
+
+def search_announcements(text, limit=50, include_archived=False):
+    """
+    Full-text search over announcement titles and content, best matches first.
+    With include_archived=True archived announcements are searched too.
+    Returns a list of announcement tuples (id, username, title, content, timestamp).
+    """
+    query = _fts_query(text)
+    if query is None:
+        return []
+    cursor = get_connection().cursor()
+    if not include_archived:
+        cursor.execute(
+            "SELECT a.id, a.username, a.title, a.content, a.timestamp "
+            "FROM announcements_fts f JOIN announcements a ON a.id = f.rowid "
+            "WHERE announcements_fts MATCH ? ORDER BY f.rank LIMIT ?",
+            (query, limit)
+        )
+        return cursor.fetchall()
+
+    # Best matches from each index, merged by rank (both use the same bm25 weights)
+    ranked = []
+    for table in ("announcements", "announcements_archive"):
+        cursor.execute(
+            "SELECT a.id, a.username, a.title, a.content, a.timestamp, f.rank "
+            f"FROM {table}_fts f JOIN {table} a ON a.id = f.rowid "
+            f"WHERE {table}_fts MATCH ? ORDER BY f.rank LIMIT ?",
+            (query, limit)
+        )
+        ranked.append(cursor.fetchall())
+    return [row[:5] for row in heapq.merge(*ranked, key=lambda row: row[5])][:limit]
+
+def search_tasks(username, text, limit=50):
+    """
+    Full-text search over a user's task titles and descriptions, best matches first.
+    Returns a list of task tuples (id, title, description, due_date, status).
+    """
+    query = _fts_query(text)
+    if query is None:
+        return []
+    # Matching the username column first limits ranking to this user's rows; the join re-checks the exact name,
+    # since the tokenizer splits usernames with punctuation into several words. A name with no letters or digits
+    # (e.g. "@@") has no tokens and would match nothing, so it is left to the join alone.
+    match = query
+    if re.search(r"[^\W_]", username):
+        owner = '"' + username.replace('"', '""') + '"'
+        match = f"username:{owner} AND ({query})"
+    cursor = get_connection().cursor()
+    cursor.execute(
+        "SELECT t.id, t.title, t.description, t.due_date, t.status "
+        "FROM tasks_fts f JOIN tasks t ON t.id = f.rowid "
+        "WHERE tasks_fts MATCH ? AND t.username = ? ORDER BY f.rank LIMIT ?",
+        (match, username, limit)
+    )
+    return cursor.fetchall()
+
+# Time every function above when VAQUERO_INSTRUMENT is set (a no-op otherwise)
+instrument_module(__name__, "db")
@@ -0,0 +1,190 @@
+import functools
+import random
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import config
+
+# Path of the SQLite database file shared by every module in the app
+DB_PATH = 'vaquero_network.db'
+
+# Each thread keeps its own connection (sqlite3 connections must not be shared across threads)
+_local = threading.local()
+
+
+def _configure(conn):
+    """
+    Applies the connection-wide PRAGMAs once, right after the connection is opened.
+    """
+    # Takes effect only for a brand-new file; existing ones are converted by database.enable_incremental_vacuum()
+    conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+    conn.execute(f"PRAGMA busy_timeout = {int(config.BUSY_TIMEOUT_MS)}")  # Wait for other writers instead of failing
+    conn.execute("PRAGMA journal_mode = WAL")  # Readers no longer block the writer (persisted in the file)
+    conn.execute("PRAGMA synchronous = NORMAL")  # Safe with WAL and avoids an fsync on every commit
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute("PRAGMA cache_size = -8000")  # About 8 MB of page cache per connection
+
+
+def get_connection():
+    """
+    Returns the long-lived connection for the calling thread, opening and configuring it on first use.
+    """
+    conn = getattr(_local, 'conn', None)
+    if conn is None or _local.path != DB_PATH:
+        if conn is not None:
+            conn.close()
+            _local.conn = None
+        # isolation_level=None puts the connection in autocommit mode; writes use transaction() instead
+        conn = sqlite3.connect(DB_PATH, isolation_level=None, timeout=config.BUSY_TIMEOUT_MS / 1000)
+        try:
+            _configure(conn)
+        except Exception:
+            # e.g. "database is locked" while another process switches the file to WAL; the next call retries
+            conn.close()
+            raise
+        _local.conn = conn
+        _local.path = DB_PATH
+        _local.depth = 0
+        _local.data_version = None
+        _local.after_commit = []
+    return conn
+
+
+def read_data_version():
+    """
+    Returns this thread's connection's PRAGMA data_version, which changes whenever another connection (another
+    thread or process) commits. It only reads the WAL index, so it is cheap to call often.
+    """
+    return get_connection().execute("PRAGMA data_version").fetchone()[0]
+
+
+def data_version_changed():
+    """
+    Returns True if another connection (another thread or process) has committed changes since the last call
+    on this thread.
+    """
+    version = read_data_version()
+    changed = version != _local.data_version
+    _local.data_version = version
+    return changed
+
+
+def close_connection():
+    """
+    Closes the calling thread's connection, if one is open.
+    """
+    conn = getattr(_local, 'conn', None)
+    if conn is not None:
+        conn.close()
+        _local.conn = None
+
+
+def set_database_path(path):
+    """
+    Points the app at a different database file (used by benchmarks and tools).
+    Connections for the old path are reopened lazily the next time each thread asks for one.
+    """
+    global DB_PATH
+    DB_PATH = path
+    close_connection()
+
+
+@contextmanager
+def transaction():
+    """
+    Runs the enclosed statements in a single transaction on the thread's connection.
+    Commits on success and rolls back on any exception. Nested calls become savepoints,
+    so a helper that opens its own transaction can also run inside a larger batch.
+    """
+    conn = get_connection()
+    depth = _local.depth
+    savepoint = f"sp_{depth}"
+    pending = len(_local.after_commit)  # Callbacks registered before this (save)point survive its rollback
+
+    if depth == 0:
+        conn.execute("BEGIN IMMEDIATE")  # Take the write lock up front instead of upgrading mid-transaction
+    else:
+        conn.execute(f"SAVEPOINT {savepoint}")
+    _local.depth = depth + 1
+
+    try:
+        yield conn
+    except BaseException:
+        del _local.after_commit[pending:]
+        if depth == 0:
+            conn.execute("ROLLBACK")
+        else:
+            conn.execute(f"ROLLBACK TO {savepoint}")
+            conn.execute(f"RELEASE {savepoint}")
+        raise
+    else:
+        if depth == 0:
+            try:
+                conn.execute("COMMIT")
+            except sqlite3.Error:
+                del _local.after_commit[:]
+                conn.execute("ROLLBACK")
+                raise
+        else:
+            conn.execute(f"RELEASE {savepoint}")
+    finally:
+        _local.depth = depth
+
+    if depth == 0:
+        callbacks, _local.after_commit = _local.after_commit, []
+        for callback in callbacks:
+            callback()
+
+
+def after_commit(callback):
+    """
+    Calls callback() once the calling thread's outermost transaction() commits, or right away outside one.
+    It is dropped if the transaction (or the savepoint it was registered in) rolls back. Used to invalidate
+    cached reads only when other connections can actually see the new data.
+    """
+    if getattr(_local, 'depth', 0) == 0:
+        callback()
+    else:
+        _local.after_commit.append(callback)
+
+
+# Counts of busy retries made and writes abandoned after the last retry, across all threads
+retry_stats = {"retries": 0, "gave_up": 0}
+
+
+def is_busy_error(error):
+    """
+    Returns True for the errors SQLite raises when another connection holds the lock past the busy timeout.
+    """
+    message = str(error).lower()
+    return isinstance(error, sqlite3.OperationalError) and ("locked" in message or "busy" in message)
+
+
+def retry_on_busy(func):
+    """
+    Decorator retrying func when the database stays locked past the busy timeout, up to config.WRITE_RETRIES
+    times, sleeping a random ("full jitter") delay of up to RETRY_BASE_DELAY_MS * 2**attempt, capped at
+    RETRY_MAX_DELAY_MS, so competing instances don't retry in lockstep.
+    Calls made inside an enclosing transaction() are not retried: only the outermost transaction can be.
+    The number of attempts made is stored on the final exception as `attempts`.
+    """
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        attempt = 0
+        while True:
+            try:
+                return func(*args, **kwargs)
+            except sqlite3.OperationalError as e:
+                nested = getattr(_local, 'depth', 0) > 0
+                if not is_busy_error(e) or nested or attempt >= config.WRITE_RETRIES:
+                    if is_busy_error(e) and not nested:
+                        retry_stats["gave_up"] += 1
+                    e.attempts = attempt + 1
+                    raise
+                delay_ms = random.uniform(0, min(config.RETRY_MAX_DELAY_MS, config.RETRY_BASE_DELAY_MS * 2 ** attempt))
+                retry_stats["retries"] += 1
+                attempt += 1
+                time.sleep(delay_ms / 1000)
+    return wrapper
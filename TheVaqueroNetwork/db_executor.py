@@ -0,0 +1,39 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from failure_log import report_failure
+
+# One worker thread: SQLite serializes writes anyway, and a single worker keeps calls in submission order,
+# so a refresh queued after a write always sees that write. The worker gets its own connection (db_connection).
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vaquero-db")
+
+# How often (ms) the Tk loop checks whether a submitted call has finished
+POLL_MS = 15
+
+
+def run_async(widget, func, *args, on_success=None, on_error=None, **kwargs):
+    """
+    Runs func(*args, **kwargs) on the database worker thread so Tk callbacks never block on SQLite.
+    When it finishes, on_success(result) or on_error(exception) is called on the Tk thread via widget.after();
+    without on_error, the exception is reported through failure_log. Results for a widget that has been destroyed in the meantime are dropped. Returns the Future.
+    """
+    future = _executor.submit(func, *args, **kwargs)
+    # Poll from the root window, which outlives the panels that usually submit work
+    root = widget.nametowidget(".")
+
+    def poll():
+        if not future.done():
+            root.after(POLL_MS, poll)
+            return
+        if not widget.winfo_exists():
+            return
+        error = future.exception()
+        if error is not None:
+            if on_error is not None:
+                on_error(error)
+            else:
+                report_failure(func.__name__, error, attempts=getattr(error, "attempts", 1))
+        elif on_success is not None:
+            on_success(future.result())
+
+    root.after(POLL_MS, poll)
+    return future
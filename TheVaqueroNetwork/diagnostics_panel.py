@@ -0,0 +1,116 @@
+import tkinter as tk
+from tkinter import ttk
+from tkinter import messagebox as VaquerosMessager
+from tkinter import filedialog
+from datetime import datetime
+
+import instrumentation
+from backend import cache_stats
+from db_connection import retry_stats
+from db_executor import run_async  # Runs database calls off the Tk main thread
+from failure_log import failure_counts, recent_failures
+
+# Histogram columns shown in the table, as (column id, heading, width)
+COLUMNS = (
+    ("calls", "Calls", 70),
+    ("mean", "Mean ms", 80),
+    ("p50", "p50 ms", 70),
+    ("p95", "p95 ms", 70),
+    ("p99", "p99 ms", 70),
+    ("max", "Max ms", 80),
+    ("total", "Total ms", 90),
+)
+
+
+class DiagnosticsPanel(ttk.Frame):
+    """
+    Hidden dashboard panel (Ctrl+Shift+D) showing the instrumentation histograms, busy retries, recent
+    failures and cache counters, with a JSON export to attach to slowness reports.
+    """
+
+    def __init__(self, parent, username):
+        super().__init__(parent, padding="10 10 10 10")
+        self.username = username
+        self.pack(fill="both", expand=True)
+
+        tk.Label(self, text="Diagnostics", font=("Inter", 16, "bold"), fg="#0056b3", bg="white").pack(pady=20)
+        self.status_label = tk.Label(self, font=("Inter", 12), bg="white", fg="#555555", justify="left")
+        self.status_label.pack(pady=(0, 10), anchor="w", padx=20)
+
+        button_frame = ttk.Frame(self)
+        button_frame.pack(fill="x", padx=20)
+        ttk.Button(button_frame, text="Refresh", command=self.refresh, style='Content.TButton').pack(side="left")
+        ttk.Button(button_frame, text="Reset", command=self._reset, style='Content.TButton').pack(side="left", padx=10)
+        ttk.Button(button_frame, text="Export JSON...", command=self._export,
+                   style='Content.TButton').pack(side="left")
+
+        # One row per instrumented function or callback, slowest total first
+        self.table = ttk.Treeview(self, columns=[column for column, heading, width in COLUMNS], height=15)
+        self.table.heading("#0", text="Function")
+        self.table.column("#0", width=320)
+        for column, heading, width in COLUMNS:
+            self.table.heading(column, text=heading)
+            self.table.column(column, width=width, anchor="e")
+        self.table.pack(fill="both", expand=True, padx=20, pady=10)
+
+        self.summary_label = tk.Label(self, font=("Inter", 11), bg="white", fg="#333333", justify="left")
+        self.summary_label.pack(anchor="w", padx=20)
+        self._cache = {}
+
+        # Numbers are re-read every time the panel is shown
+        self.bind("<Map>", lambda event: self.refresh() if event.widget is self else None)
+
+    def refresh(self):
+        """
+        Redraws the histograms and statistics, and requests fresh cache counters.
+        """
+        if instrumentation.enabled():
+            self.status_label.config(text=f"Recording since {instrumentation.recording_since():%Y-%m-%d %H:%M:%S}.")
+        else:
+            self.status_label.config(text="Instrumentation is off. Start the app with --instrument "
+                                          "(or VAQUERO_INSTRUMENT=1) to record timings.")
+
+        histograms = instrumentation.snapshot()
+        self.table.delete(*self.table.get_children())
+        for name, stats in sorted(histograms.items(), key=lambda item: -item[1]["total_ms"]):
+            self.table.insert("", "end", text=name, values=(
+                stats["count"], f"{stats['mean_ms']:.2f}", stats["p50_ms"], stats["p95_ms"], stats["p99_ms"],
+                f"{stats['max_ms']:.2f}", f"{stats['total_ms']:.1f}"))
+
+        self._show_summary()
+        run_async(self, cache_stats, on_success=self._on_cache_stats, on_error=lambda error: None)
+
+    def _on_cache_stats(self, stats):
+        self._cache = stats
+        self._show_summary()
+
+    def _show_summary(self):
+        failures = failure_counts()
+        lines = [
+            f"Busy retries: {retry_stats['retries']}, writes given up: {retry_stats['gave_up']}",
+            "Failures: " + (", ".join(f"{operation} {count}" for operation, count in sorted(failures.items()))
+                            or "none"),
+        ]
+        if self._cache:
+            lines.append("Query cache: " + ", ".join(f"{key} {value:.2f}" if isinstance(value, float) else f"{key} {value}"
+                                                     for key, value in self._cache.items()))
+        self.summary_label.config(text="\n".join(lines))
+
+    def _reset(self):
+        instrumentation.reset()
+        self.refresh()
+
+    def _export(self):
+        path = filedialog.asksaveasfilename(
+            parent=self, title="Export diagnostics", defaultextension=".json",
+            initialfile=f"vaquero-diagnostics-{datetime.now():%Y%m%d-%H%M%S}.json",
+            filetypes=[("JSON files", "*.json"), ("All files", "*.*")])
+        if not path:
+            return
+        try:
+            instrumentation.export_json(path, retry_stats=dict(retry_stats), failure_counts=failure_counts(),
+                                        recent_failures=recent_failures(), cache_stats=self._cache)
+        except OSError as e:
+            VaquerosMessager.showerror("Export Failed", f"Could not write {path}: {e}")
+            return
+        VaquerosMessager.showinfo("Diagnostics Exported", f"Saved to {path}")
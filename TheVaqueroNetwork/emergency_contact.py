@@ -1,10 +1,25 @@
 import tkinter as tk
 from tkinter import ttk
 from tkinter import messagebox as VaquerosMessager
-from database import add_emergency_contact, get_emergency_contacts
+from backend import add_emergency_contact, get_emergency_contacts
+from db_executor import run_async  # Runs database calls off the Tk main thread
+from instrumentation import instrument_callbacks
+from virtual_list import VirtualList
 
 
+def format_contact(contact):
+    """
+    Formats a contact tuple (id, contact_name, contact_number) as the text of one list row.
+    """
+    contact_id, name, number = contact
+    return f"Name: {name}\nNumber: {number}"
+
+
+@instrument_callbacks("_add_emergency_contact", "_display_emergency_contacts", "_render_emergency_contacts", "_on_*")
 class EmergencyContactsPanel(ttk.Frame):
+    # Cache namespaces this panel displays; the dashboard calls refresh() on a revisit if they changed
+    data_namespaces = ("contacts",)
+
     def __init__(self, parent, username):
         """
         Initializes the EmergencyContactsPanel.
@@ -48,23 +63,9 @@ class EmergencyContactsPanel(ttk.Frame):
         # Label for the saved contacts list
         tk.Label(self.saved_contacts_display_frame, text="Saved Contacts:", font=("Inter", 14, "bold"), fg="#333333", bg="white").pack(pady=(0, 10), anchor="w")
 
-        # Text widget to display contacts, with scrollbar
-        self.contacts_text_widget = tk.Text(
-            self.saved_contacts_display_frame,
-            font=("Inter", 12),
-            bg="#f8f8f8",
-            fg="#333333",
-            relief="flat",
-            borderwidth=1,
-            height=10,
-            wrap="word"
-        )
-        self.contacts_text_widget.pack(fill="both", expand=True)
-
-        # Scrollbar for the contacts text widget
-        scrollbar = ttk.Scrollbar(self.contacts_text_widget, command=self.contacts_text_widget.yview)
-        self.contacts_text_widget.config(yscrollcommand=scrollbar.set)
-        scrollbar.pack(side="right", fill="y")
+        # Virtualized list of contacts: only the rows in view are drawn
+        self.contacts_list = VirtualList(self.saved_contacts_display_frame, formatter=format_contact, height=200)
+        self.contacts_list.pack(fill="both", expand=True)
 
         # Load and display contacts when the panel is initialized
         self._display_emergency_contacts()
@@ -72,7 +73,7 @@ class EmergencyContactsPanel(ttk.Frame):
     def _add_emergency_contact(self):
         """
         Handles adding an emergency contact.
-        Saves the contact to the database and refreshes the displayed list.
+        Saves the contact to the database on the worker thread, then adds it to the end of the displayed list.
         """
 
         name = self.emergency_contact_name_entry.get().strip()
@@ -80,30 +81,47 @@ class EmergencyContactsPanel(ttk.Frame):
 
         if name and number:
             # Call the database function to add the contact
-            if add_emergency_contact(self.username, name, number):
-                VaquerosMessager.showinfo("Contact Added", f"Contact '{name}' added successfully!")
-                self.emergency_contact_name_entry.delete(0, tk.END)  # Clear input fields
-                self.emergency_contact_number_entry.delete(0, tk.END)
-                self._display_emergency_contacts()  # Refresh the displayed list of contacts
-            else:
-                VaquerosMessager.showerror("Error", "Failed to add contact to database.")
+            run_async(self, add_emergency_contact, self.username, name, number,
+                      on_success=lambda contact: self._on_contact_added(name, contact),
+                      on_error=self._on_db_error)
         else:
             VaquerosMessager.showwarning("Input Error", "Please enter both name and number for the contact.")
 
+    def _on_contact_added(self, name, contact):
+        """
+        Handles the result of add_emergency_contact once the worker thread has finished.
+        `contact` is the new (id, contact_name, contact_number) row, or None if the insert failed.
+        """
+        if contact:
+            VaquerosMessager.showinfo("Contact Added", f"Contact '{name}' added successfully!")
+            self.emergency_contact_name_entry.delete(0, tk.END)  # Clear input fields
+            self.emergency_contact_number_entry.delete(0, tk.END)
+            self.contacts_list.insert_row(len(self.contacts_list), contact)  # Contacts are listed in insertion order
+        else:
+            VaquerosMessager.showerror("Error", "Failed to add contact to database.")
+
+    def _on_db_error(self, error):
+        VaquerosMessager.showerror("Error", f"Database error: {error}")
+
+    def refresh(self):
+        """
+        Reloads the contacts after they changed elsewhere.
+        """
+        self._display_emergency_contacts()
+
     def _display_emergency_contacts(self):
         """
-        Retrieves emergency contacts from the database and displays them in the UI.
+        Retrieves emergency contacts on the worker thread, showing a loading state until they arrive.
         """
 
-        self.contacts_text_widget.config(state="normal")  # Enable editing to clear/insert
-        self.contacts_text_widget.delete(1.0, tk.END)  # Clear existing content
+        self.contacts_list.show_message("Loading contacts...")
 
-        contacts = get_emergency_contacts(self.username)  # Fetch contacts for the current user
+        run_async(self, get_emergency_contacts, self.username,
+                  on_success=self._render_emergency_contacts, on_error=self._on_db_error)
 
-        if contacts:
-            for contact_id, name, number in contacts:
-                self.contacts_text_widget.insert(tk.END, f"Name: {name}\nNumber: {number}\n\n")
-        else:
-            self.contacts_text_widget.insert(tk.END, "No contacts added yet.")
+    def _render_emergency_contacts(self, contacts):
+        """
+        Displays the fetched emergency contacts in the UI.
+        """
 
-        self.contacts_text_widget.config(state="disabled")  # Disable editing after displaying
\ No newline at end of file
+        self.contacts_list.set_rows(contacts, empty_text="No contacts added yet.")
@@ -0,0 +1,52 @@
+import logging
+import threading
+from collections import Counter, deque
+from datetime import datetime
+
+import config
+
+# Database failures are logged here; with no logging configured, Python prints warnings and errors to stderr
+logger = logging.getLogger("vaquero.db")
+
+# The most recent failures as structured records, newest last (see report_failure)
+_failures = deque(maxlen=config.FAILURE_LOG_SIZE)
+_counts = Counter()
+_lock = threading.Lock()
+
+
+def report_failure(operation, error, attempts=1, **context):
+    """
+    Records a failed database operation and logs it. Returns the record, a dict with the time, operation
+    name, error type and message, number of attempts made, and any context passed as keyword arguments
+    (e.g. username).
+    """
+    record = {
+        "time": datetime.now().isoformat(timespec="milliseconds"),
+        "operation": operation,
+        "error": type(error).__name__,
+        "message": str(error),
+        "attempts": attempts,
+        "context": context,
+    }
+    with _lock:
+        _failures.append(record)
+        _counts[operation] += 1
+    logger.error("%s failed after %d attempt(s): %s: %s", operation, attempts, record["error"], record["message"],
+                 extra={"failure": record})
+    return record
+
+
+def recent_failures():
+    """
+    Returns the recorded failures, oldest first.
+    """
+    with _lock:
+        return list(_failures)
+
+
+def failure_counts():
+    """
+    Returns {operation: number of failures} since startup.
+    """
+    with _lock:
+        return dict(_counts)
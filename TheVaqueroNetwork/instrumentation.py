@@ -0,0 +1,182 @@
+"""
+Opt-in latency histograms for the database functions and the Tk callbacks.
+
+Instrumentation is switched on with VAQUERO_INSTRUMENT=1 (or `python SLAMain.py --instrument`) and decided
+when each module is imported: with it off, instrument_module() and instrument_callbacks() leave every
+function untouched, so there is no cost at all. With it on, each call is timed with perf_counter and counted
+into a fixed set of latency buckets. The hidden Diagnostics panel (Ctrl+Shift+D on the dashboard) shows the
+histograms and exports them as JSON.
+"""
+import fnmatch
+import functools
+import inspect
+import json
+import platform
+import sys
+import threading
+import time
+from bisect import bisect_left
+from datetime import datetime
+
+import config
+
+# Upper bounds (ms) of the latency buckets; a last, open-ended bucket holds anything slower
+BUCKET_BOUNDS_MS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+class Histogram:
+    """
+    Call count, total and maximum time, and bucketed latencies for one function.
+    Percentiles are estimated as the upper bound of the bucket they fall in.
+    """
+    __slots__ = ("buckets", "count", "total_ms", "max_ms")
+
+    def __init__(self):
+        self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, ms):
+        self.buckets[bisect_left(BUCKET_BOUNDS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        if ms > self.max_ms:
+            self.max_ms = ms
+
+    def percentile(self, fraction):
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank and count:
+                return BUCKET_BOUNDS_MS[index] if index < len(BUCKET_BOUNDS_MS) else self.max_ms
+        return 0.0
+
+    def to_dict(self):
+        labels = [f"<={bound}" for bound in BUCKET_BOUNDS_MS] + [f">{BUCKET_BOUNDS_MS[-1]}"]
+        return {
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3) if self.count else 0.0,
+            "p50_ms": self.percentile(0.50),
+            "p95_ms": self.percentile(0.95),
+            "p99_ms": self.percentile(0.99),
+            "max_ms": round(self.max_ms, 3),
+            "buckets_ms": {label: count for label, count in zip(labels, self.buckets) if count},
+        }
+
+
+_histograms = {}
+_lock = threading.Lock()  # Database calls are recorded from the worker thread, callbacks from the Tk thread
+_started = datetime.now()
+
+
+def enabled():
+    return config.INSTRUMENT
+
+
+def record(name, ms):
+    """
+    Adds one call of `ms` milliseconds to the histogram for `name`.
+    """
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = Histogram()
+        histogram.record(ms)
+
+
+def timed(name):
+    """
+    Decorator recording every call's latency under `name`, whether it returns or raises. Returns the function
+    unchanged when instrumentation is off.
+    """
+    def decorator(func):
+        if not enabled():
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            began = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(name, (time.perf_counter() - began) * 1000)
+        return wrapper
+    return decorator
+
+
+def instrument_module(module_name, prefix):
+    """
+    Wraps every public function defined in the module with timed(f"{prefix}.{name}"). Call it at the end of
+    the module (instrument_module(__name__, ...)) so importers pick up the wrapped functions.
+    """
+    if not enabled():
+        return
+    module = sys.modules[module_name]
+    for name, func in list(vars(module).items()):
+        if not name.startswith("_") and inspect.isfunction(func) and func.__module__ == module_name:
+            setattr(module, name, timed(f"{prefix}.{name}")(func))
+
+
+def instrument_callbacks(*patterns):
+    """
+    Class decorator timing the methods whose names match any of the fnmatch `patterns` (e.g. "_display_*"),
+    recorded as "tk.<Class>.<method>". Used for the Tk command, event and after() callbacks of the panels.
+    """
+    def decorator(cls):
+        if not enabled():
+            return cls
+        for name, func in list(vars(cls).items()):
+            if inspect.isfunction(func) and any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns):
+                setattr(cls, name, timed(f"tk.{cls.__name__}.{name}")(func))
+        return cls
+    return decorator
+
+
+def snapshot():
+    """
+    Returns {name: histogram dict} for everything recorded so far, sorted by name.
+    """
+    with _lock:
+        return {name: _histograms[name].to_dict() for name in sorted(_histograms)}
+
+
+def recording_since():
+    """
+    Returns when recording started: at import, or at the last reset().
+    """
+    return _started
+
+
+def reset():
+    global _started
+    with _lock:
+        _histograms.clear()
+        _started = datetime.now()
+
+
+def report(**sections):
+    """
+    Returns the histograms plus run details as a JSON-serializable dict. Keyword arguments are added as
+    extra sections (the Diagnostics panel adds retry, failure and cache statistics).
+    """
+    return {
+        "exported": datetime.now().isoformat(timespec="seconds"),
+        "recording_since": recording_since().isoformat(timespec="seconds"),
+        "instrumented": enabled(),
+        "platform": platform.platform(),
+        "python": platform.python_version(),
+        "backend": config.BACKEND,
+        "histograms": snapshot(),
+        **sections,
+    }
+
+
+def export_json(path, **sections):
+    """
+    Writes report(**sections) to `path` as indented JSON.
+    """
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report(**sections), f, indent=2)
@@ -3,19 +3,21 @@ from tkinter import ttk  # NEW: Import ttk for themed widgets
 from tkinter import messagebox as VaquerosMessager
 
 from createAccount import create_account_window
-from database import validate_user, add_user
-from dashboardWindow import DashboardWindow
+from backend import validate_user, add_user
+from db_executor import run_async
+from theme import apply_theme
 
 # Global variables for entry widgets. These are used to access the input fields
 username_entry = None
 password_entry = None
+login_button = None
 
 
 def on_login_attempt(login_window):
     """
     This function is called when the "Login" button is clicked.
-    It retrieves user credentials, validates them against the database,
-    and handles success (opening dashboard) or failure (showing error/offering account creation).
+    It retrieves user credentials and validates them against the database on a worker thread;
+    _on_credentials_checked handles the result back on the Tk thread.
 
     Args:
         login_window: The Tkinter window object of the login screen,
@@ -32,12 +34,30 @@ def on_login_attempt(login_window):
         print("Login failed: Empty fields.")
         return  # Stop function execution if fields are empty
 
-    # Call the validate_user function from database.py to check credentials
-    if validate_user(username, password):
+    # Call the validate_user function from database.py off the Tk thread, since password hashing is slow by design
+    login_button.config(state="disabled")  # Prevent double submissions while the check runs
+    run_async(
+        login_window, validate_user, username, password,
+        on_success=lambda valid: _on_credentials_checked(login_window, username, password, valid),
+        on_error=_on_background_error
+    )
+
+
+def _on_credentials_checked(login_window, username, password, valid):
+    """
+    Handles the result of the background credential check: opens the dashboard on success,
+    otherwise offers to create an account.
+    """
+    login_button.config(state="normal")
+
+    if valid:
         VaquerosMessager.showinfo("Login Successful", "Welcome to The Vaquero Network!")
         print(f"Login successful for user: {username}")
         login_window.withdraw()  # Hide the current login window
 
+        # Imported here rather than at the top so the login screen appears without loading the dashboard
+        from dashboardWindow import DashboardWindow
+
         # Create an instance of the DashboardWindow class, passing the login window as master
         dash = DashboardWindow(master=login_window, username=username)
         dash.focus_set()  # Set focus to the newly opened dashboard window
@@ -52,18 +72,36 @@ def on_login_attempt(login_window):
     else:
         # If login fails, offer to create an account
         if VaquerosMessager.askyesno("User Not Found", "User not found. Would you like to create an account?"):
-            # Attempt to add the new user to the database
-            if add_user(username, password):
-                VaquerosMessager.showinfo("Account Created", "Account created successfully! You can now log in.")
-                username_entry.delete(0, tk.END)  # Clear username field after successful registration
-                password_entry.delete(0, tk.END)  # Clear password field after successful registration
-            else:
-                VaquerosMessager.showerror("Error", "Could not create account. Username might already exist.")
+            # Attempt to add the new user to the database (hashes the password, so also off the Tk thread)
+            login_button.config(state="disabled")
+            run_async(login_window, add_user, username, password,
+                      on_success=_on_account_created, on_error=_on_background_error)
         else:
             VaquerosMessager.showerror("Login Failed", "Invalid Username or Password.")  # Show error for invalid credentials
             print(f"Login failed: Invalid credentials for {username}.")
 
 
+def _on_account_created(created):
+    """
+    Handles the result of creating an account from the login screen.
+    """
+    login_button.config(state="normal")
+    if created:
+        VaquerosMessager.showinfo("Account Created", "Account created successfully! You can now log in.")
+        username_entry.delete(0, tk.END)  # Clear username field after successful registration
+        password_entry.delete(0, tk.END)  # Clear password field after successful registration
+    else:
+        VaquerosMessager.showerror("Error", "Could not create account. Username might already exist.")
+
+
+def _on_background_error(error):
+    """
+    Re-enables the login form and reports a database error raised on the worker thread.
+    """
+    login_button.config(state="normal")
+    VaquerosMessager.showerror("Error", f"Could not reach the database: {error}")
+
+
 def create_main_window():
     """
     Creates and displays the initial Tkinter window for the login screen.
@@ -75,35 +113,8 @@ def create_main_window():
     window.geometry("400x380")  # Slightly increased height for better spacing
     window.resizable(False, False)  # Prevent resizing for a fixed, clean look
 
-    # NEW: Configure ttk styles
-    style = ttk.Style()
-    style.theme_use('clam')
-
-    # Configure global fonts and colors for ttk widgets
-    style.configure('.', font=('Inter', 10))
-    style.configure('TLabel', font=('Inter', 12), foreground='#333333', background='white')
-    style.configure('TEntry', font=('Inter', 12), fieldbackground='#f0f0f0', foreground='#333333', borderwidth=1, relief='flat')
-
-    # Configure default TButton style (for Login button - UTRGV Orange)
-    style.configure('TButton',
-                    font=('Inter', 12, 'bold'),
-                    foreground='white',
-                    background='#F26722',  # UTRGV Orange
-                    padding=10,
-                    relief='flat',
-                    borderwidth=0
-                    )
-    style.map('TButton',
-              background=[('active', '#d95d1e')],  # Darken on hover
-              foreground=[('active', 'white')]
-              )
-
-    # Specific style for the Create Account button (UTRGV Blue)
-    style.configure('Blue.TButton', background='#0056b3')  # UTRGV Blue
-    style.map('Blue.TButton',
-              background=[('active', '#003d80')],  # Darken on hover
-              foreground=[('active', 'white')]
-              )
+    # Register the app's ttk styles once; later windows reuse them (see theme.py)
+    apply_theme(window)
 
 
     # Welcome message label (still using tk.Label as it's not a themed widget type that needs ttk.Style)
@@ -128,12 +139,14 @@ def create_main_window():
     password_entry.pack(pady=(0, 20))
 
     # --- Login Button ---
-    ttk.Button(
+    global login_button
+    login_button = ttk.Button(
         window,
         text="Login",
         command=lambda: on_login_attempt(window),
         style='TButton'
-    ).pack(pady=5)
+    )
+    login_button.pack(pady=5)
 
     # --- Create Account Button ---
     ttk.Button(
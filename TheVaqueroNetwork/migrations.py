@@ -0,0 +1,252 @@
+from db_connection import get_connection, transaction
+
+
+def _v1_base_schema(cursor):
+    """
+    The original tables. Uses IF NOT EXISTS so databases created before migrations existed upgrade cleanly.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            username TEXT NOT NULL UNIQUE,
+            password TEXT NOT NULL
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS tasks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT NOT NULL,
+            title TEXT NOT NULL,
+            description TEXT,
+            due_date TEXT,
+            status TEXT DEFAULT 'pending',
+            FOREIGN KEY (username) REFERENCES users(username)
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS emergency_contacts (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT NOT NULL,
+            contact_name TEXT NOT NULL,
+            contact_number TEXT NOT NULL,
+            FOREIGN KEY (username) REFERENCES users(username)
+        )
+    ''')
+
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS announcements (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT NOT NULL,
+            title TEXT NOT NULL,
+            content TEXT NOT NULL,
+            timestamp TEXT DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (username) REFERENCES users(username)
+        )
+    ''')
+
+
+def _v2_lookup_indexes(cursor):
+    """
+    Indexes for the per-user lookups and the newest-first bulletin board ordering.
+    """
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tasks_username ON tasks (username)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_emergency_contacts_username ON emergency_contacts (username)")
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_announcements_timestamp ON announcements (timestamp, id)")
+
+
+def _v3_full_text_search(cursor):
+    """
+    FTS5 indexes over announcement and task text. They are external-content tables (the text lives only in
+    the base tables) kept in sync by triggers, and are filled from existing rows with 'rebuild'.
+    """
+    cursor.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS announcements_fts USING fts5(
+            title, content,
+            content='announcements', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='3'
+        )
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS announcements_fts_insert AFTER INSERT ON announcements BEGIN
+            INSERT INTO announcements_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS announcements_fts_delete AFTER DELETE ON announcements BEGIN
+            INSERT INTO announcements_fts (announcements_fts, rowid, title, content)
+            VALUES ('delete', old.id, old.title, old.content);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS announcements_fts_update AFTER UPDATE OF title, content ON announcements BEGIN
+            INSERT INTO announcements_fts (announcements_fts, rowid, title, content)
+            VALUES ('delete', old.id, old.title, old.content);
+            INSERT INTO announcements_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+        END
+    ''')
+
+    cursor.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS tasks_fts USING fts5(
+            title, description,
+            content='tasks', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='3'
+        )
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_insert AFTER INSERT ON tasks BEGIN
+            INSERT INTO tasks_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_delete AFTER DELETE ON tasks BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+        END
+    ''')
+    # Only fires when searchable text changes, so status updates don't touch the index
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS tasks_fts_update AFTER UPDATE OF title, description ON tasks BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+            INSERT INTO tasks_fts (rowid, title, description) VALUES (new.id, new.title, new.description);
+        END
+    ''')
+
+    # Matches in titles count five times as much as matches in the body when ranking
+    cursor.execute("INSERT INTO announcements_fts (announcements_fts, rank) VALUES ('rank', 'bm25(5.0, 1.0)')")
+    cursor.execute("INSERT INTO tasks_fts (tasks_fts, rank) VALUES ('rank', 'bm25(5.0, 1.0)')")
+    cursor.execute("INSERT INTO announcements_fts (announcements_fts) VALUES ('rebuild')")
+    cursor.execute("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')")
+
+
+def _v4_task_due_date_index(cursor):
+    """
+    Index for the calendar's per-day task lookups: one user's tasks in a due date range, already grouped by day.
+    """
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_tasks_username_due_date ON tasks (username, due_date)")
+
+
+def _v5_announcement_archive(cursor):
+    """
+    Archive table for announcements past the retention period (see database.archive_announcements). Rows keep
+    their original ids, which AUTOINCREMENT never hands out again. The archive has its own full-text index so
+    archived posts stay searchable without growing the hot one.
+    """
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS announcements_archive (
+            id INTEGER PRIMARY KEY,
+            username TEXT NOT NULL,
+            title TEXT NOT NULL,
+            content TEXT NOT NULL,
+            timestamp TEXT
+        )
+    ''')
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_announcements_archive_timestamp "
+                   "ON announcements_archive (timestamp, id)")
+
+    cursor.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS announcements_archive_fts USING fts5(
+            title, content,
+            content='announcements_archive', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='3'
+        )
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS announcements_archive_fts_insert AFTER INSERT ON announcements_archive BEGIN
+            INSERT INTO announcements_archive_fts (rowid, title, content) VALUES (new.id, new.title, new.content);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER IF NOT EXISTS announcements_archive_fts_delete AFTER DELETE ON announcements_archive BEGIN
+            INSERT INTO announcements_archive_fts (announcements_archive_fts, rowid, title, content)
+            VALUES ('delete', old.id, old.title, old.content);
+        END
+    ''')
+    cursor.execute("INSERT INTO announcements_archive_fts (announcements_archive_fts, rank) "
+                   "VALUES ('rank', 'bm25(5.0, 1.0)')")
+
+
+def _v6_task_search_by_user(cursor):
+    """
+    Rebuilds the task full-text index with the owner's username as a third column. Searches then match
+    `username:"..." AND (...)`, so FTS5 intersects with that user's rows before ranking instead of ranking every
+    user's matches and filtering afterwards. The username column has weight 0, so it doesn't affect the ranking.
+    """
+    for trigger in ("tasks_fts_insert", "tasks_fts_delete", "tasks_fts_update"):
+        cursor.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+    cursor.execute("DROP TABLE IF EXISTS tasks_fts")
+    cursor.execute('''
+        CREATE VIRTUAL TABLE tasks_fts USING fts5(
+            title, description, username,
+            content='tasks', content_rowid='id',
+            tokenize='unicode61 remove_diacritics 2', prefix='3'
+        )
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER tasks_fts_insert AFTER INSERT ON tasks BEGIN
+            INSERT INTO tasks_fts (rowid, title, description, username)
+            VALUES (new.id, new.title, new.description, new.username);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER tasks_fts_delete AFTER DELETE ON tasks BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, title, description, username)
+            VALUES ('delete', old.id, old.title, old.description, old.username);
+        END
+    ''')
+    cursor.execute('''
+        CREATE TRIGGER tasks_fts_update AFTER UPDATE OF title, description, username ON tasks BEGIN
+            INSERT INTO tasks_fts (tasks_fts, rowid, title, description, username)
+            VALUES ('delete', old.id, old.title, old.description, old.username);
+            INSERT INTO tasks_fts (rowid, title, description, username)
+            VALUES (new.id, new.title, new.description, new.username);
+        END
+    ''')
+    cursor.execute("INSERT INTO tasks_fts (tasks_fts, rank) VALUES ('rank', 'bm25(5.0, 1.0, 0.0)')")
+    cursor.execute("INSERT INTO tasks_fts (tasks_fts) VALUES ('rebuild')")
+
+
+# Ordered list of (version, migration). Append new entries; never edit or reorder released ones.
+MIGRATIONS = [
+    (1, _v1_base_schema),
+    (2, _v2_lookup_indexes),
+    (3, _v3_full_text_search),
+    (4, _v4_task_due_date_index),
+    (5, _v5_announcement_archive),
+    (6, _v6_task_search_by_user),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_schema_version():
+    """
+    Returns the schema version stored in the database header (PRAGMA user_version).
+    """
+    return get_connection().execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate():
+    """
+    Brings the database up to LATEST_VERSION, applying each pending migration in its own transaction.
+    Does nothing beyond reading user_version when the schema is already current. Returns the final version.
+    Safe when several instances start at once: each step re-reads user_version under the write lock and is
+    skipped if another instance has applied it meanwhile.
+    """
+    current = get_schema_version()
+    if current >= LATEST_VERSION:
+        return current
+
+    for version, migration in MIGRATIONS:
+        if version <= current:
+            continue
+        with transaction() as conn:
+            current = get_schema_version()
+            if version <= current:
+                continue
+            migration(conn.cursor())
+            conn.execute(f"PRAGMA user_version = {version}")
+        current = version
+
+    return current
@@ -0,0 +1,117 @@
+import time
+from collections import OrderedDict, deque
+
+import config
+from backend import data_version
+
+
+class PanelManager:
+    """
+    Keeps dashboard panels alive across navigation instead of rebuilding them on every click.
+
+    Each panel is built by its factory the first time it is shown, then hidden with pack_forget() and
+    re-packed on later visits. A panel may declare `data_namespaces` (e.g. ("tasks",)) and a `refresh()`
+    method; it is refreshed on a revisit only if that data was written since it was last on screen.
+    At most `max_resident` panels are kept; beyond that the least recently shown hidden one is destroyed.
+    """
+
+    def __init__(self, container, factories, max_resident=None):
+        """
+        Args:
+            container: The frame panels are packed into.
+            factories (dict): Panel name -> callable(container) returning the panel widget.
+            max_resident (int): How many panels to keep alive (defaults to config.MAX_RESIDENT_PANELS).
+        """
+        self.container = container
+        self.factories = factories
+        self.max_resident = max(1, max_resident if max_resident is not None else config.MAX_RESIDENT_PANELS)
+        self.current = None
+        self._panels = OrderedDict()  # name -> panel, least recently shown first
+        self._seen_versions = {}  # name -> data_version() of the panel's namespaces when it was last up to date
+        self.timings = deque(maxlen=200)  # (name, action, milliseconds) for recent switches
+
+    def show(self, name):
+        """
+        Shows the named panel, building it on first use. Returns the panel.
+        """
+        start = time.perf_counter()
+        if self.current is not None and self.current != name:
+            self._hide(self.current)
+
+        panel = self._panels.get(name)
+        if panel is None:
+            panel = self.factories[name](self.container)
+            self._panels[name] = panel
+            self._seen_versions[name] = self._version_of(panel)
+            action = "built"
+        else:
+            self._panels.move_to_end(name)
+            if name != self.current:
+                panel.pack(fill="both", expand=True)
+            action = "refreshed" if self._refresh_if_stale(name, panel) else "shown"
+        self.current = name
+        self._evict()
+
+        self.timings.append((name, action, (time.perf_counter() - start) * 1000))
+        return panel
+
+    def get(self, name):
+        """
+        Returns the panel if it is resident, otherwise None.
+        """
+        return self._panels.get(name)
+
+    def resident(self):
+        """
+        Returns the names of the resident panels, least recently shown first.
+        """
+        return list(self._panels)
+
+    def invalidate_all(self):
+        """
+        Treats every panel's data as changed, e.g. after the database was restored from a backup: the visible
+        panel is refreshed now and the hidden ones on their next visit.
+        """
+        self._seen_versions.clear()
+        panel = self._panels.get(self.current)
+        if panel is not None and hasattr(panel, "refresh"):
+            self._seen_versions[self.current] = self._version_of(panel)
+            panel.refresh()
+
+    def timing_summary(self):
+        """
+        Returns {action: (count, mean ms)} over the recorded switches.
+        """
+        totals = {}
+        for name, action, ms in self.timings:
+            count, total = totals.get(action, (0, 0.0))
+            totals[action] = (count + 1, total + ms)
+        return {action: (count, total / count) for action, (count, total) in totals.items()}
+
+    def _hide(self, name):
+        panel = self._panels.get(name)
+        if panel is not None:
+            panel.pack_forget()
+            # The visible panel patches its own rows after writes, so its data is current as it leaves the screen
+            self._seen_versions[name] = self._version_of(panel)
+
+    def _refresh_if_stale(self, name, panel):
+        version = self._version_of(panel)
+        if (name in self._seen_versions and version == self._seen_versions[name]) or not hasattr(panel, "refresh"):
+            return False
+        self._seen_versions[name] = version
+        panel.refresh()
+        return True
+
+    def _evict(self):
+        while len(self._panels) > self.max_resident:
+            name = next(iter(self._panels))
+            if name == self.current:
+                break
+            self._panels.pop(name).destroy()
+            self._seen_versions.pop(name, None)
+
+    @staticmethod
+    def _version_of(panel):
+        namespaces = getattr(panel, "data_namespaces", ())
+        return data_version(*namespaces) if namespaces else None
@@ -0,0 +1,74 @@
+import base64
+import hashlib
+import hmac
+import os
+
+import config
+
+# Prefix identifying hashed passwords; rows without it are legacy plaintext passwords
+SCHEME = "scrypt"
+
+# Hashes of a random password, one per cost setting, see dummy_hash()
+_dummy_hashes = {}
+
+
+def _scrypt(password, salt, n, r, p):
+    # OpenSSL rejects scrypt calls that need more than maxmem bytes; scrypt uses about 128 * r * n
+    return hashlib.scrypt(password.encode("utf-8"), salt=salt, n=n, r=r, p=p, maxmem=256 * r * n, dklen=32)
+
+
+def _b64(raw):
+    return base64.b64encode(raw).decode("ascii")
+
+
+def hash_password(password, n=None):
+    """
+    Hashes a password with scrypt using a random salt. Returns a string of the form
+    scrypt$N$r$p$salt$hash, so the parameters travel with the hash.
+    """
+    n = n or config.SCRYPT_N
+    r, p = config.SCRYPT_R, config.SCRYPT_P
+    salt = os.urandom(16)
+    digest = _scrypt(password, salt, n, r, p)
+    return f"{SCHEME}${n}${r}${p}${_b64(salt)}${_b64(digest)}"
+
+
+def verify_password(password, stored):
+    """
+    Checks a password against a stored value. Stored values from before hashing was introduced
+    are plaintext and are compared in constant time. Returns True on a match.
+    """
+    if not stored.startswith(SCHEME + "$"):
+        return hmac.compare_digest(password.encode("utf-8"), stored.encode("utf-8"))
+
+    try:
+        _, n, r, p, salt, digest = stored.split("$")
+        expected = base64.b64decode(digest)
+        actual = _scrypt(password, base64.b64decode(salt), int(n), int(r), int(p))
+    except ValueError:
+        return False  # Malformed hash
+    return hmac.compare_digest(actual, expected)
+
+
+def dummy_hash():
+    """
+    Returns a hash of a random password made with the current cost settings. Checking a login for an unknown
+    user against it costs as much as a wrong password does, so response times don't reveal which accounts exist.
+    """
+    settings = (config.SCRYPT_N, config.SCRYPT_R, config.SCRYPT_P)
+    if settings not in _dummy_hashes:
+        _dummy_hashes[settings] = hash_password(_b64(os.urandom(16)))
+    return _dummy_hashes[settings]
+
+
+def needs_rehash(stored):
+    """
+    Returns True if a stored password is plaintext or was hashed with different cost settings than the current config.
+    """
+    if not stored.startswith(SCHEME + "$"):
+        return True
+    try:
+        _, n, r, p, _, _ = stored.split("$")
+    except ValueError:
+        return True
+    return (int(n), int(r), int(p)) != (config.SCRYPT_N, config.SCRYPT_R, config.SCRYPT_P)
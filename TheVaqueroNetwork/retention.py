@@ -0,0 +1,120 @@
+import argparse
+import time
+
+import config
+import db_connection
+from backend import LOCAL_DATABASE, archive_announcements, enable_incremental_vacuum, incremental_vacuum
+from db_executor import run_async
+from failure_log import report_failure
+
+
+class RetentionScheduler:
+    """
+    Applies the announcement retention policy in small steps while the user is idle.
+
+    A pass moves announcements older than ANNOUNCEMENT_RETENTION_DAYS to the archive one batch (one short
+    transaction) at a time, then hands the freed pages back to the file system with PRAGMA incremental_vacuum,
+    VACUUM_STEP_PAGES at a time. Every step runs on the database worker thread, and the next one is only
+    started once there has been no keyboard or mouse input for MAINTENANCE_IDLE_MS, so a step never sits in
+    front of a query the user is waiting for. Passes repeat every MAINTENANCE_INTERVAL_MINUTES.
+
+    Databases created before incremental vacuum existed are not converted here, since that takes one full
+    VACUUM that would hold up every query for as long as it rewrites the file. Until they are converted once
+    with `python retention.py enable-incremental-vacuum`, passes only archive.
+    """
+
+    def __init__(self, root):
+        self.root = root
+        self.archived = 0  # Announcements moved to the archive since startup
+        self._last_input = time.monotonic()
+        self._free_pages = None
+        self._after_id = None
+        root.bind_all("<KeyPress>", self._on_input, add="+")
+        root.bind_all("<ButtonPress>", self._on_input, add="+")
+
+    def start(self):
+        """
+        Schedules the first pass, unless retention is disabled or a pass is already scheduled.
+        """
+        if config.ANNOUNCEMENT_RETENTION_DAYS > 0 and self._after_id is None:
+            self._schedule(self._archive_step, config.MAINTENANCE_IDLE_MS)
+
+    def _on_input(self, event):
+        self._last_input = time.monotonic()
+
+    def _schedule(self, step, delay_ms):
+        self._after_id = self.root.after(int(delay_ms), lambda: self._run_when_idle(step))
+
+    def _run_when_idle(self, step):
+        idle_ms = (time.monotonic() - self._last_input) * 1000
+        if idle_ms < config.MAINTENANCE_IDLE_MS:
+            self._schedule(step, config.MAINTENANCE_IDLE_MS - idle_ms)  # Check again once the user could be idle
+            return
+        self._after_id = None
+        step()
+
+    def _archive_step(self):
+        run_async(self.root, archive_announcements, max_batches=1,
+                  on_success=self._on_archived, on_error=self._on_error)
+
+    def _on_archived(self, moved):
+        self.archived += moved
+        if moved >= config.ARCHIVE_BATCH_SIZE:
+            self._schedule(self._archive_step, 0)  # There may be more to move
+        else:
+            self._schedule(self._vacuum_step, 0)
+
+    def _vacuum_step(self):
+        run_async(self.root, incremental_vacuum, on_success=self._on_vacuumed, on_error=self._on_error)
+
+    def _on_vacuumed(self, free_pages):
+        # Stop once nothing is left, or if a step freed nothing (e.g. another instance holds the pages)
+        if free_pages and (self._free_pages is None or free_pages < self._free_pages):
+            self._free_pages = free_pages
+            self._schedule(self._vacuum_step, 0)
+        else:
+            self._free_pages = None
+            self._schedule_next_pass()
+
+    def _on_error(self, error):
+        report_failure("announcement_retention", error, attempts=getattr(error, "attempts", 1))
+        self._free_pages = None
+        self._schedule_next_pass()
+
+    def _schedule_next_pass(self):
+        self._schedule(self._archive_step, config.MAINTENANCE_INTERVAL_MINUTES * 60 * 1000)
+
+
+def start_retention(widget):
+    """
+    Starts the retention scheduler for the widget's Tk root (once per root; later calls reuse it).
+    """
+    root = widget.nametowidget(".")
+    scheduler = getattr(root, "_vaquero_retention", None)
+    if scheduler is None:
+        scheduler = root._vaquero_retention = RetentionScheduler(root)
+    scheduler.start()
+    return scheduler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="One-off database maintenance for announcement retention.")
+    parser.add_argument("command", choices=["enable-incremental-vacuum"],
+                        help="convert an existing database so idle maintenance can shrink it (one full VACUUM; "
+                             "best run while nobody is using the app)")
+    parser.add_argument("--db", help="database file (defaults to the app's database)")
+    args = parser.parse_args()
+
+    if args.db:
+        if not LOCAL_DATABASE:
+            parser.error("--db can't be used with VAQUERO_BACKEND=service; the service converts the file it serves")
+        db_connection.set_database_path(args.db)
+    began = time.perf_counter()
+    if enable_incremental_vacuum():
+        print(f"Converted to incremental vacuum in {time.perf_counter() - began:.1f}s")
+    else:
+        print("Already using incremental vacuum; nothing to do")
+
+
+if __name__ == "__main__":
+    main()
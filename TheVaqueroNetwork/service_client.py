@@ -0,0 +1,132 @@
+"""
+Client for the local data service (data_service.py). Provides the same functions as database.py, each
+forwarded to the service as one HTTP/JSON request, so the panels can use either through backend.py.
+"""
+import http.client
+import json
+import threading
+from itertools import islice
+
+import config
+from instrumentation import instrument_module
+
+# Reads, served concurrently on the service's request threads and safe to retry
+READ_FUNCTIONS = (
+    "commit_version", "validate_user", "get_tasks", "get_task", "get_task_days", "get_emergency_contacts",
+    "get_announcements", "get_announcements_page", "get_announcements_since", "search_announcements",
+    "search_tasks", "cache_stats",
+)
+
+# Writes that also bypass the group-commit writer: add_user spends most of its time hashing a password,
+# which must not hold the shared write transaction open, init_db and the retention calls run their own
+# short transactions (or, for the vacuum calls, must run outside any transaction)
+UNBATCHED_WRITE_FUNCTIONS = ("init_db", "add_user", "archive_announcements", "enable_incremental_vacuum",
+                             "incremental_vacuum")
+
+# Writes, batched and group-committed by the service, with the cache namespaces each one changes
+WRITE_FUNCTIONS = {
+    "add_task": ("tasks",),
+    "add_tasks_bulk": ("tasks",),
+    "update_task": ("tasks",),
+    "update_task_status_many": ("tasks",),
+    "delete_task": ("tasks",),
+    "delete_tasks": ("tasks",),
+    "add_emergency_contact": ("contacts",),
+    "add_announcement": ("announcements",),
+}
+
+
+class ServiceError(Exception):
+    """
+    Raised when the service reports an error, or can't be reached.
+    """
+
+
+# One keep-alive connection per thread (the Tk thread and the db_executor worker each get their own)
+_local = threading.local()
+
+# Bumped per namespace on every write made through this client; see data_version()
+_versions = {}
+_versions_lock = threading.Lock()
+
+
+def _connection():
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = _local.conn = http.client.HTTPConnection(config.SERVICE_HOST, config.SERVICE_PORT,
+                                                        timeout=config.SERVICE_TIMEOUT_SECONDS)
+    return conn
+
+
+def call(function, *args, **kwargs):
+    """
+    Calls `function` on the service and returns its result. Rows come back as lists rather than tuples.
+    """
+    # Bytes, so http.client sends headers and body in one packet instead of waiting on a delayed ACK
+    body = json.dumps({"function": function, "args": args, "kwargs": kwargs}).encode()
+    # A read is retried once on a fresh connection, since the service may have closed an idle keep-alive
+    # connection. Writes are not: the service may already have committed one whose reply was lost.
+    attempts = 2 if function in READ_FUNCTIONS else 1
+    for attempt in range(1, attempts + 1):
+        conn = _connection()
+        try:
+            conn.request("POST", "/call", body, {"Content-Type": "application/json"})
+            reply = json.loads(conn.getresponse().read())
+            break
+        except (http.client.HTTPException, OSError) as e:
+            conn.close()
+            _local.conn = None
+            if attempt == attempts:
+                raise ServiceError(f"Data service unavailable: {e}") from e
+
+    if "error" in reply:
+        raise ServiceError(reply["error"])
+    if function in WRITE_FUNCTIONS:
+        with _versions_lock:
+            for namespace in WRITE_FUNCTIONS[function]:
+                _versions[namespace] = _versions.get(namespace, 0) + 1
+    return reply["result"]
+
+
+def _forward(function):
+    def forwarded(*args, **kwargs):
+        return call(function, *args, **kwargs)
+    forwarded.__name__ = function
+    return forwarded
+
+
+for _name in READ_FUNCTIONS + UNBATCHED_WRITE_FUNCTIONS + tuple(WRITE_FUNCTIONS):
+    globals()[_name] = _forward(_name)
+
+
+def add_tasks_bulk(rows, chunk_size=1000):
+    """
+    Sends `rows` to the service in chunks of `chunk_size`, so large imports are streamed rather than held
+    in memory or sent as one huge request. Returns the number of tasks inserted.
+    """
+    rows = iter(rows)
+    inserted = 0
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return inserted
+        inserted += call("add_tasks_bulk", chunk, chunk_size)
+
+
+def data_version(*namespaces):
+    """
+    Returns a number that changes whenever this process writes to the given namespaces through the service
+    (the equivalent of database.data_version() for the service backend).
+    """
+    with _versions_lock:
+        return sum(_versions.get(namespace, 0) for namespace in namespaces)
+
+
+def clear_cache():
+    """
+    No-op: the query cache lives in the service process.
+    """
+
+
+# Time every round trip when VAQUERO_INSTRUMENT is set (a no-op otherwise)
+instrument_module(__name__, "service")
@@ -0,0 +1,189 @@
+"""
+Bulk task import from CSV and iCalendar (.ics) files.
+
+Command line usage, from the TheVaqueroNetwork directory:
+    python task_import.py deadlines.csv
+    python task_import.py course.ics --user jdoe
+
+CSV files need a header row with the columns username, title, description and due_date
+(description and due_date may be empty; username may be omitted when --user is given).
+"""
+import argparse
+import csv
+import os
+import time
+from datetime import date
+
+from backend import add_tasks_bulk, init_db
+
+
+class ImportReport:
+    """
+    Summary of a bulk import: rows written, rows rejected (with line numbers and reasons) and throughput.
+    """
+
+    def __init__(self):
+        self.imported = 0
+        self.errors = []  # List of (line_number, message) for rejected rows
+        self.seconds = 0.0
+
+    @property
+    def skipped(self):
+        return len(self.errors)
+
+    @property
+    def rows_per_sec(self):
+        return self.imported / self.seconds if self.seconds > 0 else 0.0
+
+    def __str__(self):
+        return (f"Imported {self.imported} tasks, skipped {self.skipped} "
+                f"in {self.seconds:.2f}s ({self.rows_per_sec:,.0f} rows/sec)")
+
+
+def normalize_due_date(value):
+    """
+    Validates a due date and returns it as YYYY-MM-DD, or None when empty.
+    Accepts YYYY-MM-DD as well as iCalendar dates (YYYYMMDD, optionally followed by a THHMMSS time).
+    Raises ValueError for anything else.
+    """
+    value = (value or "").strip()
+    if not value:
+        return None
+    if len(value) >= 8 and value[:8].isdigit():
+        value = f"{value[0:4]}-{value[4:6]}-{value[6:8]}"
+    return date.fromisoformat(value[:10]).isoformat()
+
+
+def iter_csv_tasks(path, report, default_username=None, force_username=None):
+    """
+    Streams (username, title, description, due_date) tuples from a CSV file.
+    With `force_username`, every task belongs to that user and rows naming anyone else are rejected.
+    Invalid rows are recorded in `report.errors` and skipped.
+    """
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            line = reader.line_num
+            username = (row.get("username") or default_username or "").strip()
+            if force_username is not None:
+                if username and username != force_username:
+                    report.errors.append((line, f"row belongs to another user ({username})"))
+                    continue
+                username = force_username
+            title = (row.get("title") or "").strip()
+            if not username or not title:
+                report.errors.append((line, "missing username or title"))
+                continue
+            try:
+                due_date = normalize_due_date(row.get("due_date"))
+            except ValueError:
+                report.errors.append((line, f"invalid due_date {row.get('due_date')!r}"))
+                continue
+            description = (row.get("description") or "").strip() or None
+            yield username, title, description, due_date
+
+
+def _unescape_ics(value):
+    return (value.replace("\\n", "\n").replace("\\N", "\n")
+            .replace("\\,", ",").replace("\\;", ";").replace("\\\\", "\\"))
+
+
+def _unfolded_lines(f):
+    """
+    Yields (line_number, logical_line) pairs, joining RFC 5545 folded continuation lines.
+    """
+    pending, pending_line = None, 0
+    for number, raw in enumerate(f, start=1):
+        raw = raw.rstrip("\r\n")
+        if raw[:1] in (" ", "\t") and pending is not None:
+            pending += raw[1:]
+            continue
+        if pending is not None:
+            yield pending_line, pending
+        pending, pending_line = raw, number
+    if pending is not None:
+        yield pending_line, pending
+
+
+def iter_ics_tasks(path, report, username):
+    """
+    Streams (username, title, description, due_date) tuples from the VTODO and VEVENT entries of an .ics file.
+    The due date comes from DUE, falling back to DTSTART. Invalid entries are recorded in `report.errors` and skipped.
+    """
+    with open(path, encoding="utf-8") as f:
+        entry, entry_line = None, 0
+        for number, line in _unfolded_lines(f):
+            if line in ("BEGIN:VTODO", "BEGIN:VEVENT"):
+                entry, entry_line = {}, number
+                continue
+            if entry is None:
+                continue
+            if line in ("END:VTODO", "END:VEVENT"):
+                title = entry.get("SUMMARY", "").strip()
+                if not title:
+                    report.errors.append((entry_line, "missing SUMMARY"))
+                else:
+                    raw_due = entry.get("DUE", entry.get("DTSTART"))
+                    try:
+                        due_date = normalize_due_date(raw_due)
+                    except ValueError:
+                        report.errors.append((entry_line, f"invalid due date {raw_due!r}"))
+                    else:
+                        yield username, title, entry.get("DESCRIPTION") or None, due_date
+                entry = None
+                continue
+
+            name, sep, value = line.partition(":")
+            if not sep:
+                continue
+            name = name.split(";", 1)[0].upper()  # Drop parameters such as DTSTART;VALUE=DATE
+            if name in ("SUMMARY", "DESCRIPTION", "DUE", "DTSTART"):
+                entry[name] = _unescape_ics(value)
+
+
+def import_tasks(path, username=None, chunk_size=1000, force_username=False):
+    """
+    Imports every task in a .csv or .ics file using batched transactions.
+    For .ics files `username` is required; for CSV files it is used when a row has no username column.
+    With force_username=True every task goes to `username` and CSV rows naming another user are rejected
+    (the dashboard import does this; only the command line may import for several users).
+    Returns an ImportReport.
+    """
+    report = ImportReport()
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".ics":
+        if not username:
+            raise ValueError("A username is required to import an .ics file.")
+        rows = iter_ics_tasks(path, report, username)
+    elif extension == ".csv":
+        if force_username and not username:
+            raise ValueError("force_username needs a username.")
+        rows = iter_csv_tasks(path, report, default_username=username,
+                              force_username=username if force_username else None)
+    else:
+        raise ValueError(f"Unsupported file type: {extension or path}")
+
+    start = time.perf_counter()
+    report.imported = add_tasks_bulk(rows, chunk_size=chunk_size)
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import tasks from a CSV or .ics file.")
+    parser.add_argument("path", help="CSV or .ics file to import")
+    parser.add_argument("--user", help="username for .ics files, or for CSV rows without a username column")
+    parser.add_argument("--chunk-size", type=int, default=1000, help="rows per transaction (default 1000)")
+    args = parser.parse_args()
+
+    init_db()
+    report = import_tasks(args.path, username=args.user, chunk_size=args.chunk_size)
+    for line, message in report.errors[:20]:
+        print(f"line {line}: {message}")
+    if report.skipped > 20:
+        print(f"... and {report.skipped - 20} more rejected rows")
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+from tkinter import ttk
+
+# The ttk theme every window uses
+THEME = 'clam'
+
+# Every ttk style the app uses, by style name: (configure options, map options).
+# Windows and panels only reference these names; apply_theme() registers them once per Tk interpreter.
+STYLES = {
+    # Global fonts and colors for ttk widgets
+    '.': ({'font': ('Inter', 10)}, {}),
+    'TLabel': ({'font': ('Inter', 12), 'foreground': '#333333', 'background': 'white'}, {}),
+    'TEntry': ({'font': ('Inter', 12), 'fieldbackground': '#f0f0f0', 'foreground': '#333333', 'borderwidth': 1,
+                'relief': 'flat'}, {}),
+
+    # Default button, used by the Login button (UTRGV Orange)
+    'TButton': (
+        {'font': ('Inter', 12, 'bold'), 'foreground': 'white', 'background': '#F26722', 'padding': 10,
+         'relief': 'flat', 'borderwidth': 0},
+        {'background': [('active', '#d95d1e')], 'foreground': [('active', 'white')]},  # Darken on hover
+    ),
+    # Create Account button on the login screen (UTRGV Blue)
+    'Blue.TButton': (
+        {'background': '#0056b3'},
+        {'background': [('active', '#003d80')], 'foreground': [('active', 'white')]},
+    ),
+    # Create Account window's submit button
+    'Purple.TButton': (
+        {'font': ('Inter', 12, 'bold'), 'foreground': 'white', 'background': '#6202C2', 'padding': 10,
+         'relief': 'flat', 'borderwidth': 0},
+        {'background': [('active', '#4a0196')], 'foreground': [('active', 'white')]},
+    ),
+
+    # Dashboard sidebar buttons (UTRGV Blue)
+    'Sidebar.TButton': (
+        {'font': ('Inter', 12, 'bold'), 'foreground': 'white', 'background': '#0056b3', 'padding': 10,
+         'relief': 'flat', 'borderwidth': 0},
+        {'background': [('active', '#003d80')], 'foreground': [('active', 'white')]},
+    ),
+    # Content area buttons (UTRGV Orange for primary actions)
+    'Content.TButton': (
+        {'font': ('Inter', 12, 'bold'), 'foreground': 'white', 'background': '#F26722', 'padding': 10,
+         'relief': 'flat', 'borderwidth': 0},
+        {'background': [('active', '#d95d1e')], 'foreground': [('active', 'white')]},
+    ),
+    # Emergency Contact Add button (keeping red for emergency)
+    'Emergency.TButton': (
+        {'font': ('Inter', 12, 'bold'), 'foreground': 'white', 'background': '#e74c3c', 'padding': 10,
+         'relief': 'flat', 'borderwidth': 0},
+        {'background': [('active', '#c0392b')], 'foreground': [('active', 'white')]},
+    ),
+    # Bulletin Board Post button (UTRGV Blue)
+    'Post.TButton': (
+        {'font': ('Inter', 12, 'bold'), 'foreground': 'white', 'background': '#0056b3', 'padding': 10,
+         'relief': 'flat', 'borderwidth': 0},
+        {'background': [('active', '#003d80')], 'foreground': [('active', 'white')]},
+    ),
+
+    # Calendar panel
+    'Calendar.TFrame': ({'background': 'white'}, {}),
+    'Calendar.TLabel': ({'background': 'white', 'foreground': '#333333', 'font': ('Inter', 12)}, {}),
+    'Calendar.Weekday.TLabel': ({'background': '#f0f0f0', 'foreground': '#0056b3', 'font': ('Inter', 12, 'bold'),
+                                 'borderwidth': 1, 'relief': 'solid'}, {}),
+    'Calendar.Day.TLabel': ({'background': 'white', 'foreground': '#333333', 'font': ('Inter', 12),
+                             'borderwidth': 1, 'relief': 'solid'}, {}),
+    'Calendar.Today.TLabel': ({'background': '#F26722', 'foreground': 'white', 'font': ('Inter', 12, 'bold'),
+                               'borderwidth': 1, 'relief': 'solid'}, {}),
+    'Calendar.Busy.TLabel': ({'background': '#e6f0fa', 'foreground': '#0056b3', 'font': ('Inter', 10),
+                              'borderwidth': 1, 'relief': 'solid'}, {}),  # Days with tasks due
+    'Calendar.OtherMonth.TLabel': ({'background': 'white', 'foreground': '#aaaaaa', 'font': ('Inter', 12, 'italic'),
+                                    'borderwidth': 1, 'relief': 'solid'}, {}),
+    'Calendar.Nav.TButton': (
+        {'font': ('Inter', 10), 'foreground': 'white', 'background': '#0056b3', 'padding': [5, 2],
+         'relief': 'flat', 'borderwidth': 0},
+        {'background': [('active', '#003d80')], 'foreground': [('active', 'white')]},
+    ),
+}
+
+# The Tk interpreter the styles were last applied to (each tk.Tk() root has its own style database)
+_themed_interpreter = None
+
+
+def apply_theme(widget, force=False):
+    """
+    Selects the theme and registers every style in STYLES for the Tk interpreter `widget` belongs to.
+    Only the first call per interpreter does any work; later calls return immediately, so windows and
+    panels can call it unconditionally without making Tk re-layout existing widgets.
+    Pass force=True to re-apply anyway (used by benchmarks to reproduce per-window theming).
+    """
+    global _themed_interpreter
+    if widget.tk is _themed_interpreter and not force:
+        return
+
+    style = ttk.Style(widget)
+    if force or style.theme_use() != THEME:
+        style.theme_use(THEME)
+    for name, (options, state_map) in STYLES.items():
+        style.configure(name, **options)
+        if state_map:
+            style.map(name, **state_map)
+    _themed_interpreter = widget.tk
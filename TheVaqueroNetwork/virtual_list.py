@@ -0,0 +1,276 @@
+import tkinter as tk
+from tkinter import ttk
+from tkinter import font as tkfont
+
+
+class VirtualList(tk.Frame):
+    """
+    A scrollable list that only draws the rows currently inside the viewport.
+
+    Rows come from `source`, any sequence supporting len() and indexing; source[i] is only read when row i
+    is about to be drawn. Each row is turned into (possibly multi-line) text by `formatter` and drawn on a
+    canvas, so rows can have different heights. Scrolling is tracked as (top row index, pixel offset into
+    that row), which keeps scrolling and inserting independent of the number of rows.
+
+    If `on_near_end` is given it is called when the view comes within `near_end_rows` of the last row,
+    so callers can fetch the next page and add it with append_rows().
+    """
+
+    PADDING = 6
+
+    def __init__(self, parent, formatter=str, source=None, empty_text="", on_near_end=None, near_end_rows=10,
+                 height=300, font=("Inter", 12), bg="#f8f8f8", fg="#333333", separator="#dddddd"):
+        super().__init__(parent, bg=bg)
+        self.formatter = formatter
+        self.on_near_end = on_near_end
+        self.near_end_rows = near_end_rows
+        self._source = source if source is not None else []
+        self._empty_text = empty_text
+        self._font = tkfont.Font(font=font)
+        self._fg = fg
+        self._separator = separator
+
+        self._top = 0  # Index of the first visible row
+        self._top_offset = 0  # Pixels of the top row scrolled out of view
+        self._visible_end = 0  # One past the last row drawn
+        self._drawn = []  # (top y, bottom y, index) of each row currently on the canvas
+        self._heights = {}  # Measured row heights by index, for the current width
+        self._redraw_pending = False
+
+        self.canvas = tk.Canvas(self, bg=bg, height=height, highlightthickness=0, borderwidth=0)
+        self.scrollbar = ttk.Scrollbar(self, command=self._on_scrollbar)
+        self.scrollbar.pack(side="right", fill="y")
+        self.canvas.pack(side="left", fill="both", expand=True)
+
+        self.canvas.bind("<Configure>", self._on_resize)
+        self.canvas.bind("<MouseWheel>", self._on_mousewheel)  # Windows and macOS
+        self.canvas.bind("<Button-4>", lambda event: self.scroll_pixels(-3 * self._line_height()))  # X11
+        self.canvas.bind("<Button-5>", lambda event: self.scroll_pixels(3 * self._line_height()))
+
+    # --- Data -------------------------------------------------------------------------------------------
+
+    def set_rows(self, source, empty_text=None):
+        """
+        Replaces the displayed rows and scrolls back to the top.
+        """
+        self._source = source
+        if empty_text is not None:
+            self._empty_text = empty_text
+        self._top = 0
+        self._top_offset = 0
+        self._heights.clear()
+        self.schedule_redraw()
+
+    def show_message(self, text):
+        """
+        Clears the list and shows a single status message such as a loading indicator.
+        """
+        self.set_rows([], empty_text=text)
+
+    def append_rows(self, rows):
+        """
+        Adds rows to the end of a list-backed source. Only redraws if the new rows could be visible.
+        """
+        first_new = len(self._source)
+        self._source.extend(rows)
+        if first_new <= self._visible_end or first_new == 0:
+            self.schedule_redraw()
+        else:
+            self._update_scrollbar()
+
+    def insert_row(self, index, row):
+        """
+        Inserts one row into a list-backed source. Only the visible rows are redrawn, and rows inserted
+        above the viewport shift the scroll position so the rows on screen stay put.
+        """
+        self._source.insert(index, row)
+        self._heights.clear()  # Indices shifted; visible rows are re-measured when drawn
+        if index < self._top or (index == self._top and self._top_offset > 0):
+            self._top += 1
+            self._update_scrollbar()
+        elif index <= self._visible_end:
+            self.schedule_redraw()
+        else:
+            self._update_scrollbar()
+
+    def update_row(self, index, row):
+        """
+        Replaces the row at `index`, redrawing only if it is on screen.
+        """
+        self._source[index] = row
+        self._heights.pop(index, None)
+        if self._top <= index < self._visible_end:
+            self.schedule_redraw()
+
+    def remove_row(self, index):
+        """
+        Removes the row at `index`, keeping the rows on screen in place when it was above the viewport.
+        """
+        del self._source[index]
+        self._heights.clear()
+        if index < self._top:
+            self._top -= 1
+            self._update_scrollbar()
+        elif index < self._visible_end or not self._source:
+            self.schedule_redraw()
+        else:
+            self._update_scrollbar()
+
+    def find_index(self, predicate):
+        """
+        Returns the index of the first row for which predicate(row) is true, or None.
+        """
+        for index, row in enumerate(self._source):
+            if predicate(row):
+                return index
+        return None
+
+    def row_at(self, y):
+        """
+        Returns the index of the row drawn at canvas y coordinate `y`, or None if there is no row there.
+        """
+        for top, bottom, index in self._drawn:
+            if top <= y < bottom:
+                return index
+        return None
+
+    def __len__(self):
+        return len(self._source)
+
+    def __getitem__(self, index):
+        return self._source[index]
+
+    # --- Scrolling --------------------------------------------------------------------------------------
+
+    def scroll_pixels(self, delta):
+        """
+        Scrolls the view by `delta` pixels (positive scrolls down).
+        """
+        count = len(self._source)
+        if not count:
+            return
+        offset = self._top_offset + delta
+        while offset < 0 and self._top > 0:
+            self._top -= 1
+            offset += self._row_height(self._top)
+        if offset < 0:
+            offset = 0
+        while self._top < count - 1 and offset >= self._row_height(self._top):
+            offset -= self._row_height(self._top)
+            self._top += 1
+        self._top_offset = offset
+        self.schedule_redraw()
+
+    def scroll_to(self, fraction):
+        """
+        Scrolls so that the row at `fraction` of the list (0.0 to 1.0) is at the top.
+        """
+        count = len(self._source)
+        self._top = min(max(int(fraction * count), 0), max(count - 1, 0))
+        self._top_offset = 0
+        self.schedule_redraw()
+
+    def _on_scrollbar(self, action, amount, unit=None):
+        if action == "moveto":
+            self.scroll_to(float(amount))
+        elif unit == "pages":
+            self.scroll_pixels(int(amount) * int(self.canvas.winfo_height() * 0.9))
+        else:
+            self.scroll_pixels(int(amount) * 3 * self._line_height())
+
+    def _on_mousewheel(self, event):
+        steps = -event.delta // 120 if abs(event.delta) >= 120 else -event.delta  # Windows vs macOS deltas
+        self.scroll_pixels(steps * 3 * self._line_height())
+
+    def _on_resize(self, event):
+        self._heights.clear()  # Wrapping depends on the width
+        self.schedule_redraw()
+
+    # --- Drawing ----------------------------------------------------------------------------------------
+
+    def _line_height(self):
+        return self._font.metrics("linespace")
+
+    def _text_width(self):
+        return max(self.canvas.winfo_width() - 2 * self.PADDING, 50)
+
+    def _row_height(self, index):
+        """
+        Returns the height of row `index`, measuring it with a temporary canvas item if it hasn't been drawn.
+        """
+        height = self._heights.get(index)
+        if height is None:
+            item = self.canvas.create_text(0, 0, text=self.formatter(self._source[index]), anchor="nw",
+                                           width=self._text_width(), font=self._font)
+            x1, y1, x2, y2 = self.canvas.bbox(item)
+            self.canvas.delete(item)
+            height = self._heights[index] = (y2 - y1) + 2 * self.PADDING
+        return height
+
+    def schedule_redraw(self):
+        """
+        Coalesces redraw requests into one redraw when Tk is next idle.
+        """
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.after_idle(self._redraw)
+
+    def _redraw(self):
+        self._redraw_pending = False
+        canvas = self.canvas
+        canvas.delete("row")
+        count = len(self._source)
+        view_height = canvas.winfo_height()
+
+        self._drawn = []
+        if not count:
+            self._visible_end = 0
+            canvas.create_text(self.PADDING, self.PADDING, text=self._empty_text, anchor="nw",
+                               width=self._text_width(), font=self._font, fill=self._fg, tags="row")
+            self._update_scrollbar()
+            return
+
+        # Don't leave empty space below the last row when the list is scrolled to the end
+        self._top = min(self._top, count - 1)
+        space = view_height + self._top_offset
+        index = self._top
+        while index < count and space > 0:
+            space -= self._row_height(index)
+            index += 1
+        while space > 0 and (self._top > 0 or self._top_offset > 0):
+            if self._top_offset > 0:
+                taken = min(self._top_offset, space)
+                self._top_offset -= taken
+                space -= taken
+            else:
+                self._top -= 1
+                self._top_offset = self._row_height(self._top)
+
+        y = -self._top_offset
+        index = self._top
+        width = canvas.winfo_width()
+        while index < count and y < view_height:
+            item = canvas.create_text(self.PADDING, y + self.PADDING, text=self.formatter(self._source[index]),
+                                      anchor="nw", width=self._text_width(), font=self._font, fill=self._fg,
+                                      tags="row")
+            x1, y1, x2, y2 = canvas.bbox(item)
+            height = self._heights[index] = (y2 - y1) + 2 * self.PADDING
+            canvas.create_line(self.PADDING, y + height - 1, width - self.PADDING, y + height - 1,
+                               fill=self._separator, tags="row")
+            self._drawn.append((y, y + height, index))
+            y += height
+            index += 1
+        self._visible_end = index
+
+        self._update_scrollbar()
+        if self.on_near_end is not None and self._visible_end >= count - self.near_end_rows:
+            self.on_near_end()
+
+    def _update_scrollbar(self):
+        count = len(self._source)
+        if not count:
+            self.scrollbar.set(0.0, 1.0)
+            return
+        top_height = self._heights.get(self._top) or 1
+        first = (self._top + self._top_offset / top_height) / count
+        self.scrollbar.set(first, max(self._visible_end / count, first))